@@ -1,5 +1,4 @@
 import streamlit as st
-import json
 import os
 import re
 import time
@@ -24,12 +23,21 @@ from tamil_influencer_collector import (
     is_tamil_content,
     extract_contact_info
 )
+from language_scoring import TAMIL_SCORE_THRESHOLD
+from influencer_store import InfluencerStore
+from influencer_index import DEFAULT_SCORE_WEIGHTS, DEFAULT_TAMIL_SCORE
+from category_index import POSTING_ORDERS, group_by_category
+from category_matcher import extract_categories
+from llm_cache import cache_analysis, cache_stats, get_cached_analysis
 
 from social_media_trend_analyzer import SocialMediaTrendAnalyzer
 
 # Load environment variables
 load_dotenv()
 
+# JSON export the recommendations are served from
+INFLUENCER_DATA_FILE = os.getenv("INFLUENCER_DATA_FILE", "tamil_influencers.json")
+
 # Set page configuration
 st.set_page_config(
     page_title="Influencer Marketing Assistant",
@@ -86,6 +94,9 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Model used for the website analysis
+GEMINI_MODEL = "gemini-2.5-pro-exp-03-25"
+
 # Initialize Gemini LLM
 def get_gemini_llm():
     api_key = os.getenv("GEMINI_API_KEY")
@@ -94,27 +105,61 @@ def get_gemini_llm():
         return None
     
     return ChatGoogleGenerativeAI(
-        model='gemini-2.5-pro-exp-03-25',
+        model=GEMINI_MODEL,
         api_key=SecretStr(api_key)
     )
 
-# Load influencer data from JSON file
-def load_influencer_data():
-    try:
-        with open("tamil_influencers.json", "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return []
-    except json.JSONDecodeError:
-        return []
+# Influencer store shared by all sessions; it re-parses the JSON file only when it changes
+@st.cache_resource
+def get_influencer_store():
+    return InfluencerStore(INFLUENCER_DATA_FILE)
 
-# Function to analyze website and generate marketing strategy
-def analyze_website(url, llm):
-    if not llm:
-        return "Error: Gemini API not initialized. Please check your API key."
+# Find the top influencers with the indexes of the current data
+def search_influencers(categories, min_subscribers, min_tamil_score, rank_by, weights=None, limit=50):
+    # Category queries in a presorted order are answered from the posting lists
+    if categories and rank_by in POSTING_ORDERS and (weights is None or weights == DEFAULT_SCORE_WEIGHTS):
+        return get_influencer_store().category_index().top(
+            categories,
+            min_subscribers=min_subscribers,
+            min_tamil_score=min_tamil_score,
+            sort_by=rank_by,
+            limit=limit
+        )
     
-    try:
-        prompt = f"""
+    return get_influencer_store().index().search(
+        categories=categories,
+        min_subscribers=min_subscribers,
+        min_tamil_score=min_tamil_score,
+        sort_by=rank_by,
+        limit=limit,
+        weights=weights
+    )
+
+# Number of best text matches checked against the sidebar filters
+TEXT_MATCH_CANDIDATES = 200
+
+# Rank influencers by how well their title and description match a text
+# (e.g. the website analysis), with the BM25 index of the current data
+def match_influencers_to_text(text, min_subscribers, min_tamil_score, limit=10):
+    store = get_influencer_store()
+    documents = store.documents_by_id()
+    
+    matches = []
+    for channel_id, _ in store.text_index().search(text, limit=TEXT_MATCH_CANDIDATES):
+        # The file may have been reloaded between the two lookups
+        influencer = documents.get(channel_id)
+        if influencer is None:
+            continue
+        if (influencer.get("subscriberCount") or 0) >= min_subscribers and \
+           influencer.get("tamilScore", DEFAULT_TAMIL_SCORE) >= min_tamil_score:
+            matches.append(influencer)
+            if len(matches) >= limit:
+                break
+    return matches
+
+# Prompt of the website analysis; part of the cache key, so editing it
+# invalidates the cached analyses
+WEBSITE_ANALYSIS_PROMPT = """
         Analyze this website: {url}
         
         Please provide a comprehensive marketing strategy report with the following sections:
@@ -139,11 +184,56 @@ def analyze_website(url, llm):
         
         Format the response in markdown with clear sections and bullet points.
         """
-        
-        response = llm.invoke(prompt)
-        return response.content
+
+# Function to analyze website and generate marketing strategy
+def analyze_website(url, llm, use_cache=True):
+    # Analyses of the same site with the same prompt and model are reused
+    # from the persistent cache, across sessions and processes
+    if use_cache:
+        cached = get_cached_analysis(url, WEBSITE_ANALYSIS_PROMPT, GEMINI_MODEL)
+        if cached is not None:
+            return cached
+    
+    if not llm:
+        return "Error: Gemini API not initialized. Please check your API key."
+    
+    try:
+        response = llm.invoke(WEBSITE_ANALYSIS_PROMPT.format(url=url))
     except Exception as e:
         return f"Error analyzing website: {str(e)}"
+    
+    # Only successful analyses are cached
+    cache_analysis(url, WEBSITE_ANALYSIS_PROMPT, GEMINI_MODEL, response.content)
+    return response.content
+
+# Whether an analysis is one of the error messages above (a streamed one
+# ends with the error) rather than a report
+def is_analysis_error(analysis):
+    return analysis.startswith("Error") or "\n\nError analyzing website: " in analysis
+
+# Stream the website analysis as Gemini generates it (a cached analysis
+# arrives as a single chunk); the full text is cached once it completes
+def stream_website_analysis(url, llm, use_cache=True):
+    if use_cache:
+        cached = get_cached_analysis(url, WEBSITE_ANALYSIS_PROMPT, GEMINI_MODEL)
+        if cached is not None:
+            yield cached
+            return
+    
+    if not llm:
+        yield "Error: Gemini API not initialized. Please check your API key."
+        return
+    
+    chunks = []
+    try:
+        for chunk in llm.stream(WEBSITE_ANALYSIS_PROMPT.format(url=url)):
+            chunks.append(chunk.content)
+            yield chunk.content
+    except Exception as e:
+        yield f"\n\nError analyzing website: {str(e)}"
+        return
+    
+    cache_analysis(url, WEBSITE_ANALYSIS_PROMPT, GEMINI_MODEL, "".join(chunks))
 
 # Function to get trending hashtags and keywords
 def get_trending_data():
@@ -158,6 +248,36 @@ def get_trending_data():
         "keywords": analyzer.youtube_trends.get("trending_keywords", {})
     }
 
+# Fields influencers can be ranked by (growth rates are precomputed by the collector,
+# the weighted score combines the factors below with the sidebar weights)
+RANKING_OPTIONS = {
+    "Weighted score": "score",
+    "Subscribers": "subscriberCount",
+    "Subscriber growth (7 days)": "subscriberGrowth7d",
+    "Subscriber growth (30 days)": "subscriberGrowth30d",
+    "View growth (7 days)": "viewGrowth7d",
+    "View growth (30 days)": "viewGrowth30d"
+}
+SCORE_FACTOR_LABELS = {
+    "subscribers": "Subscribers",
+    "engagement": "Engagement rate",
+    "avgViews": "Average views",
+    "contact": "Contact availability"
+}
+
+# Display influencers grouped by category (top `limit` per category) in one pass
+def display_category_groups(influencers, categories, limit=5):
+    groups = group_by_category(influencers, categories, limit=limit)
+    for category, category_influencers in groups.items():
+        if category_influencers:
+            st.markdown(f"<h3 class='sub-header'>{category}</h3>", unsafe_allow_html=True)
+            
+            for influencer in category_influencers:
+                with st.container():
+                    st.markdown("<div class='influencer-card'>", unsafe_allow_html=True)
+                    display_influencer_card(influencer)
+                    st.markdown("</div>", unsafe_allow_html=True)
+
 # Function to display influencer card
 def display_influencer_card(influencer):
     col1, col2 = st.columns([1, 3])
@@ -173,6 +293,8 @@ def display_influencer_card(influencer):
         st.markdown(f"**Subscribers:** {influencer.get('subscriberCount', 0):,}")
         st.markdown(f"**Engagement Rate:** {influencer.get('engagementRate', 0)}%")
         st.markdown(f"**Avg. Views:** {influencer.get('avgViewsPerVideo', 0):,}")
+        if influencer.get("subscriberGrowth30d") is not None:
+            st.markdown(f"**Subscriber Growth (30 days):** {influencer['subscriberGrowth30d'] * 100:+.1f}%")
         
         # Contact info
         contact_info = []
@@ -205,6 +327,10 @@ def main():
         st.session_state.influencers = []
     if 'trending_data' not in st.session_state:
         st.session_state.trending_data = None
+    if 'influencer_query' not in st.session_state:
+        st.session_state.influencer_query = None
+    if 'text_matches' not in st.session_state:
+        st.session_state.text_matches = []
     
     # Sidebar
     with st.sidebar:
@@ -213,7 +339,24 @@ def main():
         # Website analysis
         st.markdown("#### Website Analysis")
         website_url = st.text_input("Enter website URL to analyze", "https://www.rajalakshmi.org")
+        reuse_analysis = st.checkbox(
+            "Reuse cached analysis",
+            value=True,
+            help="Show the stored analysis if this site was analyzed recently instead of calling Gemini again"
+        )
+        stream_analysis = st.checkbox(
+            "Stream analysis",
+            value=True,
+            help="Show the report as it is generated and recommend influencers as soon as it names categories"
+        )
         analyze_button = st.button("Analyze Website")
+        analysis_cache_stats = cache_stats()
+        if analysis_cache_stats is not None:
+            st.caption(
+                f"Analysis cache: {analysis_cache_stats['entries']} stored, "
+                f"{analysis_cache_stats['hits']} hits / {analysis_cache_stats['misses']} misses "
+                f"({analysis_cache_stats['hitRate']:.0%})"
+            )
         
         st.markdown("---")
         
@@ -234,6 +377,30 @@ def main():
             format="%d"
         )
         
+        min_tamil_score = st.slider(
+            "Minimum Tamil Score",
+            min_value=0.0,
+            max_value=1.0,
+            value=TAMIL_SCORE_THRESHOLD,
+            step=0.05,
+            help="Share of Tamil-script text plus Tamil keyword hits in the channel's title and description"
+        )
+        
+        rank_by = RANKING_OPTIONS[st.selectbox(
+            "Rank by",
+            options=list(RANKING_OPTIONS),
+            help="Growth ranks fast-rising creators above large but flat ones"
+        )]
+        
+        weights = None
+        if rank_by == "score":
+            with st.expander("Score weights", expanded=True):
+                weights = {
+                    factor: st.slider(label, min_value=0.0, max_value=1.0,
+                                      value=DEFAULT_SCORE_WEIGHTS[factor], step=0.05)
+                    for factor, label in SCORE_FACTOR_LABELS.items()
+                }
+        
         find_influencers_button = st.button("Find Influencers")
         
         st.markdown("---")
@@ -248,53 +415,74 @@ def main():
     # Initialize Gemini LLM
     llm = get_gemini_llm()
     
-    # In the main function, modify the website analysis handler
+    # Placeholders the streamed report and the early recommendations are drawn in
+    strategy_placeholder = tab1.empty()
+    preview_placeholder = tab2.empty()
+    
     # Handle website analysis
     if analyze_button:
-        with st.spinner("Analyzing website and generating marketing strategy..."):
-            st.session_state.marketing_strategy = analyze_website(website_url, llm)
-            
-            # Extract recommended categories from the marketing strategy
-            if st.session_state.marketing_strategy:
-                recommended_categories = extract_recommended_categories(st.session_state.marketing_strategy)
-                st.session_state.selected_categories = recommended_categories
+        if stream_analysis:
+            strategy = ""
+            preview_categories = []
+            strategy_placeholder.info("Analyzing website and generating marketing strategy...")
+            for chunk in stream_website_analysis(website_url, llm, use_cache=reuse_analysis):
+                strategy += chunk
+                strategy_placeholder.markdown(strategy + " ▌")
                 
-                # Automatically find influencers based on the recommended categories
-                with st.spinner("Finding relevant influencers based on website analysis..."):
-                    all_influencers = load_influencer_data()
-                    
-                    filtered_influencers = []
-                    for influencer in all_influencers:
-                        if any(category in influencer.get("categories", []) for category in recommended_categories) and \
-                           influencer.get("subscriberCount", 0) >= min_subscribers:
-                            filtered_influencers.append(influencer)
-                    
-                    # Sort by subscriber count
-                    filtered_influencers.sort(key=lambda x: x.get("subscriberCount", 0), reverse=True)
-                    
-                    st.session_state.influencers = filtered_influencers[:50]  # Limit to top 50
+                # Recommend influencers as soon as the report names categories,
+                # matching only complete lines so a half-streamed word is not matched
+                if "\n" in chunk:
+                    categories = extract_recommended_categories(strategy[:strategy.rfind("\n")])
+                    if categories and set(categories) != set(preview_categories):
+                        preview_categories = categories
+                        preview_influencers = search_influencers(
+                            categories, min_subscribers, min_tamil_score, rank_by, weights=weights
+                        )
+                        with preview_placeholder.container():
+                            st.caption("Early recommendations, updated while the analysis is generated")
+                            display_category_groups(preview_influencers, categories)
+            
+            st.session_state.marketing_strategy = strategy
+            preview_placeholder.empty()
+        else:
+            with st.spinner("Analyzing website and generating marketing strategy..."):
+                st.session_state.marketing_strategy = analyze_website(website_url, llm, use_cache=reuse_analysis)
+        
+        # Extract recommended categories from the complete marketing strategy
+        if st.session_state.marketing_strategy:
+            recommended_categories = extract_recommended_categories(st.session_state.marketing_strategy)
+            st.session_state.selected_categories = recommended_categories
+            
+            # Automatically find influencers based on the recommended categories
+            # (none recommended means no matches)
+            st.session_state.influencer_query = {
+                "categories": recommended_categories,
+                "min_subscribers": min_subscribers,
+                "min_tamil_score": min_tamil_score
+            } if recommended_categories else None
+            st.session_state.influencers = []
+            
+            # Influencers whose own words match the analysis, whatever their category
+            st.session_state.text_matches = [] if is_analysis_error(st.session_state.marketing_strategy) else \
+                match_influencers_to_text(st.session_state.marketing_strategy, min_subscribers, min_tamil_score)
     
     # Handle influencer search
     if find_influencers_button:
         st.session_state.selected_categories = selected_categories
-        with st.spinner("Finding relevant influencers..."):
-            # Load influencers from JSON file
-            all_influencers = load_influencer_data()
-            
-            # Filter by selected categories and minimum subscribers
-            if selected_categories:
-                filtered_influencers = []
-                for influencer in all_influencers:
-                    if any(category in influencer.get("categories", []) for category in selected_categories) and \
-                       influencer.get("subscriberCount", 0) >= min_subscribers:
-                        filtered_influencers.append(influencer)
-            else:
-                filtered_influencers = [inf for inf in all_influencers if inf.get("subscriberCount", 0) >= min_subscribers]
-            
-            # Sort by subscriber count
-            filtered_influencers.sort(key=lambda x: x.get("subscriberCount", 0), reverse=True)
-            
-            st.session_state.influencers = filtered_influencers[:50]  # Limit to top 50
+        # Selected categories (all if none selected)
+        st.session_state.influencer_query = {
+            "categories": selected_categories,
+            "min_subscribers": min_subscribers,
+            "min_tamil_score": min_tamil_score
+        }
+    
+    # Rank the last query's matches on every run, so changing the ranking
+    # or a weight re-ranks instantly without clicking again
+    if st.session_state.influencer_query:
+        # Top 50 by the selected ranking field
+        st.session_state.influencers = search_influencers(
+            **st.session_state.influencer_query, rank_by=rank_by, weights=weights
+        )
     
     # Handle trend analysis
     if analyze_trends_button:
@@ -304,29 +492,18 @@ def main():
     # Tab 1: Marketing Strategy
     with tab1:
         if st.session_state.marketing_strategy:
-            st.markdown(st.session_state.marketing_strategy)
+            strategy_placeholder.markdown(st.session_state.marketing_strategy)
         else:
-            st.info("Enter a website URL and click 'Analyze Website' to generate a marketing strategy.")
+            strategy_placeholder.info("Enter a website URL and click 'Analyze Website' to generate a marketing strategy.")
     
     # Tab 2: Influencer Recommendations
     with tab2:
         if st.session_state.influencers:
             st.markdown(f"### Found {len(st.session_state.influencers)} Influencers")
             
-            # Group influencers by category
+            # Group influencers by category (top 5 per category)
             if st.session_state.selected_categories:
-                for category in st.session_state.selected_categories:
-                    category_influencers = [inf for inf in st.session_state.influencers 
-                                          if category in inf.get("categories", [])]
-                    
-                    if category_influencers:
-                        st.markdown(f"<h3 class='sub-header'>{category}</h3>", unsafe_allow_html=True)
-                        
-                        for influencer in category_influencers[:5]:  # Show top 5 per category
-                            with st.container():
-                                st.markdown("<div class='influencer-card'>", unsafe_allow_html=True)
-                                display_influencer_card(influencer)
-                                st.markdown("</div>", unsafe_allow_html=True)
+                display_category_groups(st.session_state.influencers, st.session_state.selected_categories)
             else:
                 # Show all influencers if no category selected
                 for influencer in st.session_state.influencers[:10]:  # Show top 10
@@ -334,8 +511,17 @@ def main():
                         st.markdown("<div class='influencer-card'>", unsafe_allow_html=True)
                         display_influencer_card(influencer)
                         st.markdown("</div>", unsafe_allow_html=True)
-        else:
+        elif not st.session_state.text_matches:
             st.info("Select categories and click 'Find Influencers' to see recommendations.")
+        
+        # Best text matches for the analyzed website
+        if st.session_state.text_matches:
+            st.markdown("<h3 class='sub-header'>Best Matches for the Website</h3>", unsafe_allow_html=True)
+            for influencer in st.session_state.text_matches:
+                with st.container():
+                    st.markdown("<div class='influencer-card'>", unsafe_allow_html=True)
+                    display_influencer_card(influencer)
+                    st.markdown("</div>", unsafe_allow_html=True)
     
     # Tab 3: Trend Analysis
     with tab3:
@@ -388,57 +574,8 @@ def main():
 
 # Add this function after the analyze_website function
 def extract_recommended_categories(marketing_strategy):
-    """Extract recommended influencer categories from the marketing strategy"""
-    if not marketing_strategy:
-        return []
-    
-    # Look for influencer categories in the marketing strategy text
-    categories = []
-    for category in CATEGORIES:
-        # Remove "Tamil " prefix for matching
-        category_keyword = category.replace("Tamil ", "").lower()
-        if category_keyword in marketing_strategy.lower():
-            categories.append(category)
-    
-    # If no categories found, try to match broader terms
-    if not categories:
-        category_mapping = {
-            "tech": "Tamil tech",
-            "education": "Tamil education",
-            "movie": "Tamil movies",
-            "film": "Tamil movies",
-            "cinema": "Tamil movies",
-            "beauty": "Tamil beauty",
-            "fashion": "Tamil fashion",
-            "style": "Tamil fashion",
-            "gaming": "Tamil gaming",
-            "game": "Tamil gaming",
-            "music": "Tamil music",
-            "song": "Tamil music",
-            "cook": "Tamil cooking",
-            "food": "Tamil cooking",
-            "recipe": "Tamil cooking",
-            "comedy": "Tamil comedy",
-            "funny": "Tamil comedy",
-            "humor": "Tamil comedy",
-            "vlog": "Tamil vlogs",
-            "lifestyle": "Tamil lifestyle",
-            "fitness": "Tamil fitness",
-            "workout": "Tamil fitness",
-            "exercise": "Tamil fitness",
-            "travel": "Tamil travel",
-            "tourism": "Tamil travel",
-            "business": "Tamil business",
-            "entrepreneur": "Tamil business",
-            "motivation": "Tamil motivation",
-            "inspire": "Tamil motivation"
-        }
-        
-        for keyword, category in category_mapping.items():
-            if keyword in marketing_strategy.lower() and category in CATEGORIES:
-                categories.append(category)
-    
-    return list(set(categories))  # Remove duplicates
+    """Extract recommended influencer categories from the marketing strategy, most mentioned first"""
+    return extract_categories(marketing_strategy)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
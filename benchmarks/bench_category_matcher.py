@@ -0,0 +1,108 @@
+"""
+Benchmark category extraction with the Aho-Corasick matcher against the
+original one-substring-search-per-keyword implementation on synthetic
+marketing strategies.
+
+Usage:
+    python benchmarks/bench_category_matcher.py --size 5000 --words 1500
+"""
+import os
+import sys
+import time
+import random
+import argparse
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from category_matcher import CATEGORY_KEYWORDS, DEFAULT_MATCHER, extract_categories_batch
+from tamil_influencer_collector import CATEGORIES
+
+FILLER_WORDS = [
+    "the", "brand", "should", "partner", "with", "creators", "who", "reach", "young", "audiences",
+    "in", "Chennai", "Madurai", "Coimbatore", "through", "short", "videos", "and", "reels",
+    "engagement", "campaign", "budget", "launch", "festival", "Pongal", "Diwali", "offers",
+    "தமிழ்", "வாடிக்கையாளர்கள்", "விளம்பரம்"
+]
+
+SIGNAL_WORDS = [
+    "cooking", "Recipes", "food", "technology", "Tech", "gadgets", "beauty", "skincare",
+    "fashion", "styles", "lifestyle", "gaming", "music", "songs", "movies", "cinema",
+    "travel", "tourism", "fitness", "workout", "business", "entrepreneurs", "motivation",
+    "comedy", "funny", "vlogs", "education"
+]
+
+def legacy_extract_recommended_categories(marketing_strategy: str) -> List[str]:
+    """
+    The original extract_recommended_categories: one substring search per
+    category and per fallback keyword.
+    """
+    if not marketing_strategy:
+        return []
+    
+    categories = []
+    for category in CATEGORIES:
+        category_keyword = category.replace("Tamil ", "").lower()
+        if category_keyword in marketing_strategy.lower():
+            categories.append(category)
+    
+    if not categories:
+        for keyword, category in CATEGORY_KEYWORDS.items():
+            if keyword in marketing_strategy.lower() and category in CATEGORIES:
+                categories.append(category)
+    
+    return list(set(categories))
+
+def synthetic_strategy(rng: random.Random, words: int) -> str:
+    """
+    Build a marketing strategy of filler text with a few category signals.
+    """
+    signals = rng.sample(SIGNAL_WORDS, rng.randint(0, 4))
+    text = rng.choices(FILLER_WORDS, k=words)
+    for signal in signals:
+        for _ in range(rng.randint(1, 5)):
+            text[rng.randrange(words)] = signal
+    return " ".join(text)
+
+def run_benchmark(size: int, words: int, seed: int):
+    rng = random.Random(seed)
+    corpus = [synthetic_strategy(rng, words) for _ in range(size)]
+    total_mb = sum(len(text.encode("utf-8")) for text in corpus) / 1024 / 1024
+    print(f"Corpus: {size} strategies, {total_mb:.1f} MB")
+    
+    start = time.perf_counter()
+    legacy = [legacy_extract_recommended_categories(text) for text in corpus]
+    legacy_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    single = [DEFAULT_MATCHER.extract(text) for text in corpus]
+    single_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    bulk = extract_categories_batch(corpus)
+    bulk_seconds = time.perf_counter() - start
+    
+    results = [
+        ("legacy extract_recommended_categories", legacy_seconds),
+        ("CategoryMatcher.extract (one at a time)", single_seconds),
+        ("extract_categories_batch", bulk_seconds)
+    ]
+    
+    print(f"\n{'Implementation':<45}{'Seconds':>10}{'Docs/s':>12}{'Speedup':>10}")
+    for name, seconds in results:
+        print(f"{name:<45}{seconds:>10.2f}{size / seconds:>12.0f}{legacy_seconds / seconds:>9.1f}x")
+    
+    # The matcher orders categories by mentions; the legacy set has no order
+    print("\nAgreement with the legacy implementation:")
+    for name, extracted in (("extract", single), ("extract_categories_batch", bulk)):
+        matches = sum(1 for old, new in zip(legacy, extracted) if sorted(old) == sorted(new))
+        print(f"  {name}: {matches / size * 100:.2f}%")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Category extraction benchmark")
+    parser.add_argument("--size", type=int, default=5000, help="Number of synthetic strategies")
+    parser.add_argument("--words", type=int, default=1500, help="Words per strategy")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the corpus")
+    
+    args = parser.parse_args()
+    run_benchmark(args.size, args.words, args.seed)
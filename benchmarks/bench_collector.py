@@ -0,0 +1,127 @@
+"""
+Benchmark the collector and the trend analyzer against the offline YouTube
+API stand-in, without spending real quota.
+
+Collection writes to a separate MongoDB database (MONGO_URI must point to a
+running server), which is dropped afterwards unless --keep is given. The
+response cache is disabled so every call is a round trip to the stand-in.
+
+Usage:
+    python benchmarks/bench_collector.py --channels-per-category 200 --pages 4 --latency 0.05
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def configure_environment(args: argparse.Namespace, work_dir: str):
+    # Must run before the repo modules are imported: they read these at import time
+    os.environ["YOUTUBE_API_KEY"] = "offline"
+    os.environ["YOUTUBE_CACHE_FILE"] = os.path.join(work_dir, "cache.sqlite") if args.cache else ""
+    os.environ["YOUTUBE_QUOTA_USAGE_FILE"] = os.path.join(work_dir, "quota_usage.sqlite")
+    os.environ["YOUTUBE_DAILY_QUOTA"] = str(10 ** 9)
+    os.environ["YOUTUBE_REQUESTS_PER_SECOND"] = str(args.requests_per_second)
+    os.environ["YOUTUBE_REQUEST_BURST"] = str(max(1, int(args.requests_per_second)))
+    os.environ["COLLECTOR_CHECKPOINT_FILE"] = os.path.join(work_dir, "checkpoint.json")
+    os.environ["MONGO_DATABASE"] = args.mongo_database
+
+def print_report(name: str, seconds: float, items: int, item_name: str, stats: dict):
+    print(f"\n{name}")
+    print(f"  {'Seconds':<28}{seconds:>12.2f}")
+    print(f"  {item_name + '/s':<28}{items / seconds if seconds else 0:>12.1f}")
+    print(f"  {'Round trips':<28}{stats['roundTrips']:>12}")
+    print(f"  {'Quota units':<28}{stats['units']:>12}")
+    print(f"  {'Quota units per ' + item_name[:-1]:<28}{stats['units'] / items if items else 0:>12.2f}")
+    for method, round_trips in sorted(stats["roundTripsByMethod"].items()):
+        errors = stats["errorsByMethod"].get(method, 0)
+        print(f"    {method:<34}{round_trips:>6} calls{errors:>6} errors")
+
+def bench_collection(args: argparse.Namespace, api):
+    import tamil_influencer_collector as collector
+    
+    collection = collector.get_influencers_collection()
+    collection.drop()
+    collector.ensure_indexes()
+    
+    api.reset_stats()
+    start = time.perf_counter()
+    collector.collect_influencer_data(max_workers=args.workers, max_pages=args.pages)
+    seconds = time.perf_counter() - start
+    
+    channels = collection.count_documents({})
+    print_report("collect_influencer_data", seconds, channels, "channels", api.stats())
+    
+    if not args.keep:
+        collection.database.client.drop_database(args.mongo_database)
+
+def bench_trends(api):
+    from social_media_trend_analyzer import SocialMediaTrendAnalyzer
+    
+    analyzer = SocialMediaTrendAnalyzer()
+    
+    api.reset_stats()
+    start = time.perf_counter()
+    analyzer.analyze_youtube_trends()
+    seconds = time.perf_counter() - start
+    
+    videos = len(analyzer.youtube_trends.get("trending_videos", [])) + len(analyzer.youtube_trends.get("trending_music", []))
+    print_report("SocialMediaTrendAnalyzer.analyze_youtube_trends", seconds, videos, "videos", api.stats())
+
+def main():
+    parser = argparse.ArgumentParser(description="Collector throughput benchmark against the offline YouTube API")
+    parser.add_argument("--channels-per-category", type=int, default=200, help="Channels returned by each category search")
+    parser.add_argument("--videos-per-channel", type=int, default=15, help="Uploads per synthetic channel")
+    parser.add_argument("--pages", type=int, default=4, help="Search pages per category")
+    parser.add_argument("--workers", type=int, default=8, help="Collector worker threads")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds every API call takes")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Maximum random seconds added to the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of calls failing with rateLimitExceeded")
+    parser.add_argument("--quota-limit", type=int, help="Units after which every call fails with quotaExceeded")
+    parser.add_argument("--requests-per-second", type=float, default=1000, help="Client-side rate limit")
+    parser.add_argument("--fixtures", help="JSON fixture file to serve instead of synthetic fixtures")
+    parser.add_argument("--save-fixtures", help="Save the served fixtures to this JSON file")
+    parser.add_argument("--cache", action="store_true", help="Enable the response cache (in a temporary file)")
+    parser.add_argument("--mongo-database", default="tamil_influencers_benchmark", help="MongoDB database used for collection")
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark database")
+    parser.add_argument("--skip-collect", action="store_true", help="Skip the collection benchmark")
+    parser.add_argument("--skip-trends", action="store_true", help="Skip the trend analysis benchmark")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as work_dir:
+        configure_environment(args, work_dir)
+        
+        import youtube_api
+        from offline_youtube import OfflineYouTube, synthetic_fixtures
+        from tamil_influencer_collector import CATEGORIES
+        
+        options = {"latency": args.latency, "jitter": args.jitter, "error_rate": args.error_rate,
+                   "quota_limit": args.quota_limit, "seed": args.seed}
+        if args.fixtures:
+            api = OfflineYouTube.from_file(args.fixtures, **options)
+        else:
+            api = OfflineYouTube(synthetic_fixtures(
+                CATEGORIES,
+                channels_per_query=args.channels_per_category,
+                videos_per_channel=args.videos_per_channel,
+                seed=args.seed
+            ), **options)
+        if args.save_fixtures:
+            api.save_fixtures(args.save_fixtures)
+        
+        youtube_api.set_youtube(api)
+        print(f"Serving {len(api.fixtures['channels'])} channels and {len(api.fixtures['videos'])} videos "
+              f"(latency {args.latency}s + up to {args.jitter}s, error rate {args.error_rate})")
+        
+        if not args.skip_collect:
+            bench_collection(args, api)
+        if not args.skip_trends:
+            bench_trends(api)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark the prefiltered contact extraction engine against the original
+per-description implementation on a synthetic corpus.
+
+Usage:
+    python benchmarks/bench_contact_extraction.py --size 100000 --processes 4
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contact_extractor import CONTACT_INFO_FIELDS, extract_contacts_batch
+
+FILLER_WORDS = [
+    "welcome", "to", "our", "channel", "subscribe", "for", "more", "videos", "daily",
+    "uploads", "tamil", "cooking", "comedy", "tech", "reviews", "vlogs", "chennai",
+    "தமிழ்", "சமையல்", "நகைச்சுவை", "வணக்கம்", "நண்பர்களே"
+]
+
+def legacy_extract_contact_info(description: str) -> Dict[str, Optional[str]]:
+    """
+    The original extract_contact_info: one regex scan per contact field.
+    """
+    contact_info = {
+        "email": None,
+        "phone": None,
+        "instagram": None,
+        "twitter": None,
+        "facebook": None,
+        "business_email": None
+    }
+    
+    emails = re.findall(r'[\w.-]+@[\w.-]+\.\w+', description)
+    
+    if emails:
+        contact_info["email"] = emails[0]
+        
+        business_email_patterns = [
+            r'business\s*email\s*[:-]?\s*([\w.-]+@[\w.-]+\.\w+)',
+            r'for\s*business\s*[:-]?\s*([\w.-]+@[\w.-]+\.\w+)',
+            r'business\s*inquiries\s*[:-]?\s*([\w.-]+@[\w.-]+\.\w+)'
+        ]
+        
+        for pattern in business_email_patterns:
+            business_match = re.search(pattern, description, re.IGNORECASE)
+            if business_match:
+                contact_info["business_email"] = business_match.group(1)
+                break
+    
+    phones = re.findall(r'(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', description)
+    if phones:
+        contact_info["phone"] = phones[0]
+    
+    for network in ("instagram", "twitter", "facebook"):
+        match = re.search(rf'{network}\.com/([A-Za-z0-9_.-]+)', description, re.IGNORECASE)
+        if match:
+            contact_info[network] = match.group(1)
+    
+    return contact_info
+
+def synthetic_description(rng: random.Random) -> str:
+    """
+    Build a channel description with a random mix of filler text and contacts.
+    """
+    parts = [" ".join(rng.choices(FILLER_WORDS, k=rng.randint(20, 120)))]
+    handle = f"creator{rng.randint(1, 10**6)}"
+    
+    if rng.random() < 0.4:
+        parts.append(f"Contact: {handle}@gmail.com")
+    if rng.random() < 0.2:
+        prefix = rng.choice(["Business email:", "For business -", "Business inquiries:", "BUSINESS EMAIL"])
+        parts.append(f"{prefix} {handle}.collab@studio.in")
+    if rng.random() < 0.2:
+        parts.append(f"Call +91 {rng.randint(100, 999)} {rng.randint(100, 999)} {rng.randint(1000, 9999)}")
+    for network in ("instagram", "twitter", "facebook"):
+        if rng.random() < 0.3:
+            parts.append(f"https://www.{network}.com/{handle}")
+    
+    rng.shuffle(parts)
+    return "\n".join(parts)
+
+def run_benchmark(size: int, processes: int, seed: int):
+    rng = random.Random(seed)
+    corpus: List[str] = [synthetic_description(rng) for _ in range(size)]
+    total_mb = sum(len(text.encode("utf-8")) for text in corpus) / 1024 / 1024
+    print(f"Corpus: {size} descriptions, {total_mb:.1f} MB")
+    
+    start = time.perf_counter()
+    legacy = [legacy_extract_contact_info(text) for text in corpus]
+    legacy_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    columns = extract_contacts_batch(corpus)
+    batch_seconds = time.perf_counter() - start
+    
+    results = [("legacy extract_contact_info", legacy_seconds), ("extract_contacts_batch", batch_seconds)]
+    
+    if processes > 1:
+        start = time.perf_counter()
+        extract_contacts_batch(corpus, processes=processes)
+        results.append((f"extract_contacts_batch ({processes} processes)", time.perf_counter() - start))
+    
+    print(f"\n{'Implementation':<45}{'Seconds':>10}{'Docs/s':>12}{'Speedup':>10}")
+    for name, seconds in results:
+        print(f"{name:<45}{seconds:>10.2f}{size / seconds:>12.0f}{legacy_seconds / seconds:>9.1f}x")
+    
+    # Check that both implementations agree field by field
+    print("\nAgreement with the legacy implementation:")
+    for field in CONTACT_INFO_FIELDS:
+        matches = sum(1 for index, info in enumerate(legacy) if info[field] == columns[field][index])
+        print(f"  {field}: {matches / size * 100:.2f}%")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Contact extraction benchmark")
+    parser.add_argument("--size", type=int, default=50000, help="Number of synthetic descriptions")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes for the parallel run")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the corpus")
+    
+    args = parser.parse_args()
+    run_benchmark(args.size, args.processes, args.seed)
@@ -0,0 +1,132 @@
+"""
+Check the inverted category index against brute-force queries on synthetic
+influencers: a freshly built index, one changed by upserts and removals,
+and one refreshed with a new load of the data must all return exactly the
+influencers (in the same order) of a stable sort of the matching documents,
+like InfluencerIndex.
+
+Usage:
+    python benchmarks/check_category_index.py --size 5000 --queries 300
+"""
+import os
+import sys
+import random
+import argparse
+from typing import Any, List, Mapping, Sequence
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from category_index import POSTING_ORDERS, CategoryIndex
+from influencer_index import DEFAULT_TAMIL_SCORE, InfluencerIndex
+from synthetic_influencers import synthetic_influencer
+from tamil_influencer_collector import CATEGORIES
+
+# Numeric fields the weighted score reads besides the subscriber count
+SCORED_FIELDS = ["engagementRate", "avgViewsPerVideo"]
+
+def brute_force_top(
+    index: CategoryIndex,
+    influencers: Sequence[Mapping[str, Any]],
+    categories: List[str],
+    min_subscribers: float,
+    min_tamil_score: float,
+    sort_by: str,
+    limit: int
+) -> List[str]:
+    """
+    Filter every document and stable-sort the matches by the ranking value
+    the index computed (documents in load order).
+    """
+    matches = [
+        influencer for influencer in influencers
+        if any(category in influencer.get("categories", ()) for category in categories)
+        and (influencer.get("subscriberCount") or 0) >= min_subscribers
+        and influencer.get("tamilScore", DEFAULT_TAMIL_SCORE) >= min_tamil_score
+    ]
+    matches.sort(key=lambda influencer: index.keys[influencer["channelId"]][sort_by][0])
+    return [influencer["channelId"] for influencer in matches[:limit or None]]
+
+def count_mismatches(index: CategoryIndex, influencers: Sequence[Mapping[str, Any]], queries: int, rng: random.Random) -> int:
+    """
+    Run random queries against the index, the brute force and InfluencerIndex
+    and count the queries whose results differ.
+    """
+    reference = InfluencerIndex(influencers, CATEGORIES)
+    mismatches = 0
+    for _ in range(queries):
+        categories = rng.sample(CATEGORIES, rng.randint(1, 4))
+        min_subscribers = rng.choice([0, 10000, 1500000])
+        min_tamil_score = rng.choice([0.0, 0.6])
+        sort_by = rng.choice(POSTING_ORDERS)
+        limit = rng.choice([0, 5, 50])
+        
+        expected = brute_force_top(index, influencers, categories, min_subscribers, min_tamil_score, sort_by, limit)
+        found = [influencer["channelId"] for influencer in index.top(categories, min_subscribers, min_tamil_score, sort_by, limit)]
+        columnar = [influencer["channelId"] for influencer in reference.search(categories, min_subscribers, min_tamil_score, sort_by, limit)]
+        by_category = index.top_by_category(categories, min_subscribers, min_tamil_score, sort_by, 5)
+        
+        if found != expected or found != columnar or any(
+            [influencer["channelId"] for influencer in by_category[category]] !=
+            brute_force_top(index, influencers, [category], min_subscribers, min_tamil_score, sort_by, 5)
+            for category in categories
+        ):
+            mismatches += 1
+    return mismatches
+
+def run_check(size: int, queries: int, seed: int):
+    rng = random.Random(seed)
+    influencers = [synthetic_influencer(rng, str(number), SCORED_FIELDS) for number in range(size)]
+    index = CategoryIndex(influencers, CATEGORIES)
+    print(f"Built index: {count_mismatches(index, influencers, queries, rng)} of {queries} queries differ")
+    
+    # Upserts keep the load position of changed channels and append new ones
+    documents = {influencer["channelId"]: influencer for influencer in influencers}
+    for number in range(size // 2):
+        action = rng.random()
+        if action < 0.5:
+            channel_id = rng.choice(list(documents))
+        elif action < 0.8:
+            channel_id = f"new-{number}"
+        else:
+            channel_id = rng.choice(list(documents))
+            index.remove(channel_id)
+            del documents[channel_id]
+            continue
+        documents[channel_id] = synthetic_influencer(rng, channel_id, SCORED_FIELDS)
+        index.upsert(documents[channel_id])
+    # Upserted scores keep the scales of the built data (InfluencerIndex would
+    # recompute them), so only the brute force is the reference here
+    loaded = sorted(documents.values(), key=lambda influencer: index.positions[influencer["channelId"]])
+    mismatches = 0
+    for _ in range(queries):
+        categories = rng.sample(CATEGORIES, rng.randint(1, 4))
+        min_subscribers = rng.choice([0, 10000, 1500000])
+        for sort_by in POSTING_ORDERS:
+            expected = brute_force_top(index, loaded, categories, min_subscribers, 0.0, sort_by, 50)
+            found = [influencer["channelId"] for influencer in index.top(categories, min_subscribers, 0.0, sort_by, 50)]
+            mismatches += found != expected
+    print(f"After {size // 2} upserts and removals: {mismatches} of {queries * len(POSTING_ORDERS)} queries differ")
+    
+    # New loads: many records changed, added, removed and reordered (lists
+    # sorted again), then a few changed and added (moved in place)
+    for changed, removed_share in ((size // 2, 0.01), (size // 100, 0.0)):
+        reloaded = [dict(influencer) for influencer in loaded if rng.random() >= removed_share]
+        for position in rng.sample(range(len(reloaded)), changed):
+            reloaded[position] = synthetic_influencer(rng, reloaded[position]["channelId"], SCORED_FIELDS)
+        reloaded += [synthetic_influencer(rng, f"reload-{changed}-{number}", SCORED_FIELDS) for number in range(changed)]
+        if removed_share:
+            first, second = rng.sample(range(len(reloaded)), 2)
+            reloaded[first], reloaded[second] = reloaded[second], reloaded[first]
+        
+        applied = index.refresh(reloaded)
+        print(f"Refreshed {applied} records: {count_mismatches(index, reloaded, queries, rng)} of {queries} queries differ")
+        loaded = reloaded
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Category index equivalence check")
+    parser.add_argument("--size", type=int, default=5000, help="Number of synthetic influencers")
+    parser.add_argument("--queries", type=int, default=300, help="Random queries per check")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    
+    args = parser.parse_args()
+    run_check(args.size, args.queries, args.seed)
@@ -0,0 +1,79 @@
+"""
+Check the Aho-Corasick category matcher against brute-force substring
+searches on random texts: every occurrence found by find() and counted by
+the vectorized pattern_counts(), and the categories extracted one at a time
+and in bulk, must match the original extract_recommended_categories.
+
+Usage:
+    python benchmarks/check_category_matcher.py --size 5000
+"""
+import os
+import sys
+import random
+import argparse
+from typing import List, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_category_matcher import FILLER_WORDS, SIGNAL_WORDS, legacy_extract_recommended_categories
+from category_matcher import DEFAULT_MATCHER, CategoryMatcher, extract_categories_batch
+
+# Words that overlap or contain the patterns, in mixed case
+TRICKY_WORDS = ["COOK", "Cooking", "cookbook", "styles", "lifestyle", "games", "film", "song", "vlogger",
+                "inspired", "Entrepreneurship", "ab", "the strategy", "செய்"]
+
+def random_text(rng: random.Random) -> str:
+    """
+    Build a short text; every third one has its spaces removed, so patterns
+    also match across word boundaries.
+    """
+    text = " ".join(rng.choices(FILLER_WORDS + SIGNAL_WORDS + TRICKY_WORDS, k=rng.randint(0, 30)))
+    return text.replace(" ", "") if rng.random() < 1 / 3 else text
+
+def brute_force_find(matcher: CategoryMatcher, text: str) -> List[Tuple[int, int]]:
+    """
+    Every (start, pattern index) occurrence, overlapping ones included.
+    """
+    lowered = text.lower()
+    return sorted(
+        (start, pattern_id)
+        for pattern_id, (keyword, _, _) in enumerate(matcher.patterns)
+        for start in range(len(lowered)) if lowered.startswith(keyword, start)
+    )
+
+def run_check(size: int, seed: int):
+    rng = random.Random(seed)
+    texts = [random_text(rng) for _ in range(size)] + [None, ""]
+    matcher = DEFAULT_MATCHER
+    
+    find_mismatches = 0
+    count_mismatches = 0
+    extract_mismatches = 0
+    counts = matcher.pattern_counts(texts)
+    for row, text in enumerate(texts):
+        occurrences = brute_force_find(matcher, text or "")
+        find_mismatches += sorted(matcher.find(text or "")) != occurrences
+        expected_counts = np.bincount([pattern_id for _, pattern_id in occurrences], minlength=len(matcher))
+        count_mismatches += not np.array_equal(counts[row], expected_counts)
+        # The matcher orders categories by mentions; the legacy set has no order
+        extract_mismatches += sorted(matcher.extract(text)) != sorted(legacy_extract_recommended_categories(text))
+    
+    bulk_mismatches = sum(
+        bulk != matcher.extract(text) for text, bulk in zip(texts, extract_categories_batch(texts))
+    )
+    
+    print(f"Checked {len(texts)} texts against brute-force substring searches:")
+    print(f"  find: {find_mismatches} differ")
+    print(f"  pattern_counts: {count_mismatches} differ")
+    print(f"  extract vs. legacy extract_recommended_categories: {extract_mismatches} differ")
+    print(f"  extract_categories_batch vs. extract: {bulk_mismatches} differ")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Category matcher equivalence check")
+    parser.add_argument("--size", type=int, default=5000, help="Number of random texts")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    
+    args = parser.parse_args()
+    run_check(args.size, args.seed)
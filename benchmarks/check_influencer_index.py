@@ -0,0 +1,113 @@
+"""
+Check the columnar influencer index against the original filter-and-sort
+search on synthetic influencers. Random queries run through both the
+np.argpartition selection and the rank order walk, and every result must
+match the brute force exactly, in order.
+
+Usage:
+    python benchmarks/check_influencer_index.py --size 20000 --queries 600
+"""
+import os
+import sys
+import random
+import argparse
+from typing import Any, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import influencer_index
+from influencer_index import (
+    DEFAULT_TAMIL_SCORE,
+    RANKING_FIELDS,
+    InfluencerIndex,
+    contact_counts,
+    numeric_columns,
+    score_factors,
+    score_scales,
+    weighted_score
+)
+from synthetic_influencers import synthetic_influencer
+from tamil_influencer_collector import CATEGORIES
+
+def brute_force_search(
+    influencers: Sequence[Mapping[str, Any]],
+    scores: np.ndarray,
+    categories: List[str],
+    min_subscribers: float,
+    min_tamil_score: float,
+    sort_by: str,
+    limit: int
+) -> List[str]:
+    """
+    The original search: filter every document, then stable-sort the matches
+    descending (missing values last).
+    """
+    matches = [
+        (row, influencer) for row, influencer in enumerate(influencers)
+        if (not categories or any(category in influencer.get("categories", ()) for category in categories))
+        and (influencer.get("subscriberCount") or 0) >= min_subscribers
+        and influencer.get("tamilScore", DEFAULT_TAMIL_SCORE) >= min_tamil_score
+    ]
+    if sort_by == "score":
+        matches.sort(key=lambda match: scores[match[0]], reverse=True)
+    else:
+        matches.sort(key=lambda match: (match[1].get(sort_by) is not None, match[1].get(sort_by) or 0), reverse=True)
+    return [influencer["channelId"] for _, influencer in matches[:limit or None]]
+
+def count_mismatches(
+    index: InfluencerIndex,
+    influencers: Sequence[Mapping[str, Any]],
+    queries: int,
+    rng: random.Random,
+    weights: Optional[Mapping[str, float]] = None
+) -> int:
+    """
+    Run random queries against the index and the brute force and count the
+    queries whose results differ.
+    """
+    columns = numeric_columns(influencers)
+    factors = score_factors(columns, contact_counts(influencers), score_scales(columns))
+    scores = weighted_score(factors, weights)
+    
+    mismatches = 0
+    for _ in range(queries):
+        categories = rng.sample(CATEGORIES, rng.randint(0, 3))
+        min_subscribers = rng.choice([0, 1000, 10000, 50000, 1500000])
+        min_tamil_score = rng.choice([0.0, 0.2, 0.6])
+        sort_by = rng.choice(["subscriberCount", "score"] + RANKING_FIELDS)
+        limit = rng.choice([0, 5, 50, 500])
+        
+        expected = brute_force_search(influencers, scores, categories, min_subscribers, min_tamil_score, sort_by, limit)
+        found = index.search(categories, min_subscribers, min_tamil_score, sort_by, limit, weights=weights)
+        mismatches += [influencer["channelId"] for influencer in found] != expected
+    return mismatches
+
+def run_check(size: int, queries: int, seed: int):
+    rng = random.Random(seed)
+    influencers = [synthetic_influencer(rng, str(number), RANKING_FIELDS) for number in range(size)]
+    index = InfluencerIndex(influencers, CATEGORIES)
+    
+    half = queries // 2
+    print(f"Partition selection: {count_mismatches(index, influencers, half, rng)} of {half} queries differ")
+    
+    # Force the rank order walk for every ranking field
+    partition_max_rows = influencer_index.PARTITION_MAX_ROWS
+    influencer_index.PARTITION_MAX_ROWS = 0
+    try:
+        print(f"Rank order walk: {count_mismatches(index, influencers, queries - half, rng)} of {queries - half} queries differ")
+    finally:
+        influencer_index.PARTITION_MAX_ROWS = partition_max_rows
+    
+    weights = {"subscribers": 0.1, "engagement": 0.6, "avgViews": 0.1, "contact": 0.2}
+    print(f"Custom score weights: {count_mismatches(index, influencers, half, rng, weights)} of {half} queries differ")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Influencer index equivalence check")
+    parser.add_argument("--size", type=int, default=20000, help="Number of synthetic influencers")
+    parser.add_argument("--queries", type=int, default=600, help="Random queries (split between the search paths)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    
+    args = parser.parse_args()
+    run_check(args.size, args.queries, args.seed)
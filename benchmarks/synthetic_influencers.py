@@ -0,0 +1,29 @@
+"""
+Synthetic influencer documents shared by the index equivalence checks.
+"""
+import random
+from typing import Any, Dict, Iterable
+
+from tamil_influencer_collector import CATEGORIES
+
+def synthetic_influencer(rng: random.Random, channel_id: str, ranking_fields: Iterable[str]) -> Dict[str, Any]:
+    """
+    Build an influencer document with frequent ties and missing fields.
+    
+    Args:
+        rng: Random generator
+        channel_id: ID of the channel
+        ranking_fields: Numeric fields to fill in (each present 60% of the time)
+    
+    Returns:
+        Influencer document
+    """
+    influencer = {"channelId": channel_id, "categories": rng.sample(CATEGORIES, rng.randint(0, 3))}
+    if rng.random() < 0.95:
+        influencer["subscriberCount"] = rng.choice([rng.randint(0, 2000000), 10000, 50000])
+    if rng.random() < 0.8:
+        influencer["tamilScore"] = rng.choice([0.1, 0.5, 1.0, rng.random()])
+    for field in ranking_fields:
+        if rng.random() < 0.6:
+            influencer[field] = rng.choice([0.0, 0.1, round(rng.random(), 2)])
+    return influencer
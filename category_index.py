@@ -0,0 +1,368 @@
+import heapq
+import threading
+from bisect import bisect_left, insort
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from influencer_index import (
+    DEFAULT_TAMIL_SCORE,
+    contact_counts,
+    numeric_columns,
+    score_factors,
+    score_scales,
+    weighted_score
+)
+
+# Orders the posting lists are kept in: by subscriber count and by the
+# weighted score with the default weights
+POSTING_ORDERS = ("subscriberCount", "score")
+
+# Sort key of a posting: the negated ranking value (so ascending lists rank
+# best first; missing values sort last), the load position of the document
+# to break ties like a stable sort (and InfluencerIndex) does, and the channel ID
+PostingKey = Tuple[float, int, str]
+
+# Share of changed records above which refresh() sorts the posting lists
+# again instead of moving the records one by one
+REFRESH_REBUILD_SHARE = 0.25
+
+class CategoryIndex:
+    """
+    Inverted index from each category to the influencers in it.
+    
+    Every category has a posting list per entry of POSTING_ORDERS, kept
+    sorted best first. A single-category query reads the head of one list.
+    A multi-category query k-way merges the lists with heapq.merge and
+    skips influencers already seen in another category. Either way only
+    the influencers up to the k-th match are touched.
+    
+    The index is updated in place. refresh() brings it up to date with a
+    new load of the data (InfluencerStore calls it when the JSON export
+    changes), touching only the records that changed. upsert() moves a
+    record between posting lists with binary search, and sync() applies
+    every record a MongoDB collection updated since the last sync. Between
+    refreshes, the score is normalized with the scales of the data the
+    index was built from, so scores of later records are comparable
+    (factors above a scale are capped at 1).
+    """
+    
+    def __init__(self, influencers: Sequence[Mapping[str, Any]] = (), categories: Iterable[str] = ()):
+        """
+        Build the index.
+        
+        Args:
+            influencers: Influencer documents (from the JSON export or MongoDB)
+            categories: Categories to create (possibly empty) posting lists for
+        """
+        self.documents: Dict[str, Mapping[str, Any]] = {}
+        self.keys: Dict[str, Dict[str, PostingKey]] = {}
+        # Load position of each channel; upserted channels are appended after the loaded ones
+        self.positions: Dict[str, int] = {}
+        self.postings: Dict[str, Dict[str, List[PostingKey]]] = {order: {} for order in POSTING_ORDERS}
+        for category in categories:
+            for lists in self.postings.values():
+                lists[category] = []
+        self.synced_at: Optional[datetime] = None
+        self.lock = threading.Lock()
+        
+        columns = numeric_columns(influencers)
+        self.scales = score_scales(columns)
+        scores = self._scores(influencers, columns)
+        
+        for position, (influencer, score) in enumerate(zip(influencers, scores)):
+            channel_id = influencer["channelId"]
+            self.documents[channel_id] = influencer
+            self.positions[channel_id] = position
+            self.keys[channel_id] = self._posting_keys(influencer, score, position)
+        self.next_position = len(influencers)
+        
+        for order in POSTING_ORDERS:
+            self._rebuild(order)
+    
+    def __len__(self) -> int:
+        return len(self.documents)
+    
+    def _scores(
+        self,
+        influencers: Sequence[Mapping[str, Any]],
+        columns: Optional[Dict[str, Any]] = None,
+        scales: Optional[Dict[str, float]] = None
+    ) -> List[float]:
+        columns = numeric_columns(influencers) if columns is None else columns
+        factors = score_factors(columns, contact_counts(influencers), self.scales if scales is None else scales)
+        return weighted_score(factors).tolist()
+    
+    @staticmethod
+    def _posting_keys(influencer: Mapping[str, Any], score: float, position: int) -> Dict[str, PostingKey]:
+        channel_id = influencer["channelId"]
+        subscribers = influencer.get("subscriberCount")
+        return {
+            "subscriberCount": (-subscribers if subscribers is not None else float("inf"), position, channel_id),
+            "score": (-score, position, channel_id)
+        }
+    
+    def _rebuild(self, order: str):
+        # Bulk build: append everything, then sort each list once
+        lists = self.postings[order]
+        for posting_list in lists.values():
+            posting_list.clear()
+        for channel_id, keys in self.keys.items():
+            for category in self.documents[channel_id].get("categories", ()):
+                lists.setdefault(category, []).append(keys[order])
+        for posting_list in lists.values():
+            posting_list.sort()
+    
+    def _unlink(self, channel_id: str, orders: Iterable[str] = POSTING_ORDERS):
+        for category in self.documents[channel_id].get("categories", ()):
+            for order in orders:
+                key = self.keys[channel_id][order]
+                posting_list = self.postings[order][category]
+                position = bisect_left(posting_list, key)
+                if position < len(posting_list) and posting_list[position] == key:
+                    del posting_list[position]
+    
+    def _link(self, channel_id: str, orders: Iterable[str] = POSTING_ORDERS):
+        for category in self.documents[channel_id].get("categories", ()):
+            for order in orders:
+                insort(self.postings[order].setdefault(category, []), self.keys[channel_id][order])
+    
+    def upsert(self, influencer: Mapping[str, Any]):
+        """
+        Add an influencer, or move a changed one to its new positions.
+        
+        Args:
+            influencer: Full influencer document
+        """
+        channel_id = influencer["channelId"]
+        score = self._scores([influencer])[0]
+        
+        with self.lock:
+            if channel_id in self.documents:
+                self._unlink(channel_id)
+                position = self.positions[channel_id]
+            else:
+                position = self.next_position
+                self.next_position += 1
+            self.documents[channel_id] = influencer
+            self.positions[channel_id] = position
+            self.keys[channel_id] = self._posting_keys(influencer, score, position)
+            self._link(channel_id)
+    
+    def remove(self, channel_id: str):
+        """
+        Remove an influencer from the index.
+        
+        Args:
+            channel_id: The ID of the channel
+        """
+        with self.lock:
+            if channel_id in self.documents:
+                self._unlink(channel_id)
+                del self.documents[channel_id]
+                del self.keys[channel_id]
+                del self.positions[channel_id]
+    
+    def refresh(self, influencers: Sequence[Mapping[str, Any]]) -> int:
+        """
+        Bring the index up to date with a new load of the data, as if it was
+        rebuilt from it. Records that changed or moved in the load order are
+        moved between posting lists, new ones are added and missing ones are
+        removed; unchanged records are not touched. The lists are sorted
+        again instead when more than REFRESH_REBUILD_SHARE of the records
+        changed, and the score lists whenever the score scales of the new
+        data differ (every score changes then).
+        
+        Args:
+            influencers: Every influencer document of the new load
+        
+        Returns:
+            Number of records added, changed or removed
+        """
+        columns = numeric_columns(influencers)
+        scales = score_scales(columns)
+        scores = self._scores(influencers, columns, scales)
+        
+        with self.lock:
+            rescored = scales != self.scales
+            self.scales = scales
+            
+            updates = []
+            loaded = set()
+            for position, (influencer, score) in enumerate(zip(influencers, scores)):
+                channel_id = influencer["channelId"]
+                loaded.add(channel_id)
+                keys = self._posting_keys(influencer, score, position)
+                if self.documents.get(channel_id) != influencer or self.keys[channel_id] != keys:
+                    updates.append((channel_id, influencer, position, keys))
+            removed = [channel_id for channel_id in self.documents if channel_id not in loaded]
+            
+            if len(updates) + len(removed) > len(influencers) * REFRESH_REBUILD_SHARE:
+                rebuilt = list(POSTING_ORDERS)
+            else:
+                rebuilt = ["score"] if rescored else []
+            orders = [order for order in POSTING_ORDERS if order not in rebuilt]
+            
+            for channel_id in removed:
+                self._unlink(channel_id, orders)
+                del self.documents[channel_id]
+                del self.keys[channel_id]
+                del self.positions[channel_id]
+            for channel_id, influencer, position, keys in updates:
+                if channel_id in self.documents:
+                    self._unlink(channel_id, orders)
+                self.documents[channel_id] = influencer
+                self.positions[channel_id] = position
+                self.keys[channel_id] = keys
+                self._link(channel_id, orders)
+            
+            self.next_position = len(influencers)
+            for order in rebuilt:
+                self._rebuild(order)
+        
+        return len(updates) + len(removed)
+    
+    def _ranked(self, categories: Iterable[str], order: str) -> Iterator[str]:
+        # Channel IDs of the categories best first, each channel once
+        posting_lists = [self.postings[order][category] for category in categories if category in self.postings[order]]
+        if len(posting_lists) == 1:
+            for _, _, channel_id in posting_lists[0]:
+                yield channel_id
+            return
+        
+        seen = set()
+        for _, _, channel_id in heapq.merge(*posting_lists):
+            if channel_id not in seen:
+                seen.add(channel_id)
+                yield channel_id
+    
+    def _matches(self, channel_ids: Iterator[str], min_subscribers: float, min_tamil_score: float) -> Iterator[Mapping[str, Any]]:
+        for channel_id in channel_ids:
+            influencer = self.documents[channel_id]
+            if (influencer.get("subscriberCount") or 0) >= min_subscribers and \
+               influencer.get("tamilScore", DEFAULT_TAMIL_SCORE) >= min_tamil_score:
+                yield influencer
+    
+    def top(
+        self,
+        categories: Iterable[str],
+        min_subscribers: float = 0,
+        min_tamil_score: float = 0.0,
+        sort_by: str = "subscriberCount",
+        limit: int = 50
+    ) -> List[Mapping[str, Any]]:
+        """
+        Find the top influencers in any of the given categories.
+        
+        Args:
+            categories: Categories to search
+            min_subscribers: Minimum subscriber count
+            min_tamil_score: Minimum Tamil score
+            sort_by: One of POSTING_ORDERS
+            limit: Maximum number of influencers (0 for all)
+        
+        Returns:
+            List of influencer documents, best first
+        """
+        with self.lock:
+            matches = self._matches(self._ranked(categories, sort_by), min_subscribers, min_tamil_score)
+            return list(islice(matches, limit or None))
+    
+    def top_by_category(
+        self,
+        categories: Iterable[str],
+        min_subscribers: float = 0,
+        min_tamil_score: float = 0.0,
+        sort_by: str = "subscriberCount",
+        limit: int = 5
+    ) -> Dict[str, List[Mapping[str, Any]]]:
+        """
+        Find the top influencers of each category, reading each posting
+        list only up to its k-th match.
+        
+        Args:
+            categories: Categories to search
+            min_subscribers: Minimum subscriber count
+            min_tamil_score: Minimum Tamil score
+            sort_by: One of POSTING_ORDERS
+            limit: Maximum number of influencers per category
+        
+        Returns:
+            Dictionary mapping each category to its influencer documents, best first
+        """
+        with self.lock:
+            return {
+                category: list(islice(
+                    self._matches(self._ranked([category], sort_by), min_subscribers, min_tamil_score),
+                    limit or None
+                ))
+                for category in categories
+            }
+    
+    def sync(self, collection, projection: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Apply the records a MongoDB collection updated since the last sync,
+        found by lastUpdated (set by collection and refresh runs; the
+        maintenance commands leave it alone, so rebuild the index after them).
+        
+        Args:
+            collection: MongoDB influencers collection
+            projection: Fields to keep in the indexed documents (default:
+                everything except the description and _id)
+        
+        Returns:
+            Number of records applied
+        """
+        query = {"lastUpdated": {"$gte": self.synced_at}} if self.synced_at else {}
+        synced_at = datetime.now()
+        
+        count = 0
+        for influencer in collection.find(query, projection or {"_id": 0, "description": 0}):
+            self.upsert(influencer)
+            count += 1
+        
+        self.synced_at = synced_at
+        return count
+    
+    @classmethod
+    def from_collection(cls, collection, categories: Iterable[str] = (), projection: Optional[Dict[str, Any]] = None) -> "CategoryIndex":
+        """
+        Build the index from a MongoDB collection; later changes are applied with sync().
+        
+        Args:
+            collection: MongoDB influencers collection
+            categories: Categories to create posting lists for
+            projection: Fields to keep in the indexed documents (default:
+                everything except the description and _id)
+        
+        Returns:
+            The index
+        """
+        synced_at = datetime.now()
+        index = cls(list(collection.find({}, projection or {"_id": 0, "description": 0})), categories)
+        index.synced_at = synced_at
+        return index
+
+def group_by_category(
+    influencers: Iterable[Mapping[str, Any]],
+    categories: Iterable[str],
+    limit: int = 5
+) -> Dict[str, List[Mapping[str, Any]]]:
+    """
+    Group ranked influencers by category in a single pass.
+    
+    Args:
+        influencers: Influencer documents, best first
+        categories: Categories to group by (in display order)
+        limit: Maximum number of influencers per category
+    
+    Returns:
+        Dictionary mapping each category to its influencers, in input order
+    """
+    groups = {category: [] for category in categories}
+    for influencer in influencers:
+        for category in influencer.get("categories", ()):
+            group = groups.get(category)
+            if group is not None and len(group) < limit:
+                group.append(influencer)
+    return groups
@@ -0,0 +1,346 @@
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from tamil_influencer_collector import CATEGORIES
+
+# Broader terms that point to a category, used when the text names no
+# category directly
+CATEGORY_KEYWORDS = {
+    "tech": "Tamil tech",
+    "education": "Tamil education",
+    "movie": "Tamil movies",
+    "film": "Tamil movies",
+    "cinema": "Tamil movies",
+    "beauty": "Tamil beauty",
+    "fashion": "Tamil fashion",
+    "style": "Tamil fashion",
+    "gaming": "Tamil gaming",
+    "game": "Tamil gaming",
+    "music": "Tamil music",
+    "song": "Tamil music",
+    "cook": "Tamil cooking",
+    "food": "Tamil cooking",
+    "recipe": "Tamil cooking",
+    "comedy": "Tamil comedy",
+    "funny": "Tamil comedy",
+    "humor": "Tamil comedy",
+    "vlog": "Tamil vlogs",
+    "lifestyle": "Tamil lifestyle",
+    "fitness": "Tamil fitness",
+    "workout": "Tamil fitness",
+    "exercise": "Tamil fitness",
+    "travel": "Tamil travel",
+    "tourism": "Tamil travel",
+    "business": "Tamil business",
+    "entrepreneur": "Tamil business",
+    "motivation": "Tamil motivation",
+    "inspire": "Tamil motivation"
+}
+
+# Texts scanned together by the vectorized bulk scan
+BULK_CHUNK_SIZE = 1024
+
+# A pattern: the lowercase keyword, the category it signals, and whether it
+# is a fallback keyword (only used when no category name matched)
+Pattern = Tuple[str, str, bool]
+
+def category_name_keyword(category: str) -> str:
+    """
+    Get the keyword a category is recognized by in text.
+    
+    Args:
+        category: Category name (e.g. "Tamil cooking")
+    
+    Returns:
+        The category without the "Tamil " prefix, lowercased (e.g. "cooking")
+    """
+    return category.replace("Tamil ", "").lower()
+
+class CategoryMatcher:
+    """
+    Aho-Corasick automaton over the category names and fallback keywords.
+    
+    All patterns are found in one left-to-right pass over the lowercased
+    text, instead of one substring search per pattern. The automaton is
+    compiled to a transition table (the failure links are resolved at build
+    time), so the scan does a single dictionary lookup per character.
+    Matches are substring matches, overlapping ones included, like the
+    "keyword in text" checks they replace.
+    
+    For bulk scans the same automaton is also kept as a dense NumPy table,
+    and pattern_counts() steps a chunk of texts through it together: one
+    table lookup per character position for the whole chunk.
+    """
+    
+    def __init__(self, categories: Sequence[str] = CATEGORIES, keywords: Mapping[str, str] = CATEGORY_KEYWORDS):
+        """
+        Compile the automaton.
+        
+        Args:
+            categories: Categories, matched by their name without the "Tamil " prefix
+            keywords: Fallback keywords mapped to their category (keywords of
+                categories not in categories are ignored)
+        """
+        self.categories = list(categories)
+        self.patterns: List[Pattern] = [
+            (category_name_keyword(category), category, False) for category in self.categories
+        ]
+        self.patterns += [
+            (keyword.lower(), category, True) for keyword, category in keywords.items()
+            if category in self.categories
+        ]
+        
+        # Trie of the patterns
+        transitions: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for pattern_id, (keyword, _, _) in enumerate(self.patterns):
+            state = 0
+            for char in keyword:
+                if char not in transitions[state]:
+                    transitions.append({})
+                    outputs.append([])
+                    transitions[state][char] = len(transitions) - 1
+                state = transitions[state][char]
+            outputs[state].append(pattern_id)
+        
+        # Breadth-first: each state's failure target is complete before its
+        # children are visited, so missing transitions and outputs can be
+        # copied from it
+        failure = [0] * len(transitions)
+        queue = deque(transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in list(transitions[state].items()):
+                queue.append(child)
+                fallback = failure[state]
+                while fallback and char not in transitions[fallback]:
+                    fallback = failure[fallback]
+                failure[child] = transitions[fallback].get(char, 0) if state else 0
+                outputs[child] += outputs[failure[child]]
+        
+        # Complete the transition table: a state inherits every transition
+        # of its failure target that it does not define itself
+        queue = deque([0])
+        order = []
+        while queue:
+            state = queue.popleft()
+            order.append(state)
+            queue.extend(transitions[state].values())
+        self.transitions = [dict(transitions[0])] + [None] * (len(transitions) - 1)
+        for state in order[1:]:
+            self.transitions[state] = {**self.transitions[failure[state]], **transitions[state]}
+        
+        self.outputs: List[Tuple[int, ...]] = [tuple(output) for output in outputs]
+        self.lengths = [len(keyword) for keyword, _, _ in self.patterns]
+        
+        # Dense table for the bulk scan. Column 0 is every character outside
+        # the patterns' alphabet, which always leads back to the root. The
+        # table is flattened and a state is stored as the offset of its row,
+        # so a step is one addition and one lookup.
+        alphabet = sorted({char for keyword, _, _ in self.patterns for char in keyword})
+        self.char_columns = np.zeros(max(map(ord, alphabet), default=0) + 2, dtype=np.uint8)
+        for column, char in enumerate(alphabet, 1):
+            self.char_columns[ord(char)] = column
+        self.width = len(alphabet) + 1
+        table = np.zeros((len(self.transitions), self.width), dtype=np.int32)
+        for state, state_transitions in enumerate(self.transitions):
+            for char, target in state_transitions.items():
+                table[state, self.char_columns[ord(char)]] = target * self.width
+        self.flat_table = table.ravel()
+        self.has_output = np.array([bool(output) for output in self.outputs])
+        self.state_outputs = np.zeros((len(self.transitions), len(self.patterns)), dtype=np.int32)
+        for state, output in enumerate(self.outputs):
+            for pattern_id in output:
+                self.state_outputs[state, pattern_id] += 1
+        
+        # Pattern hits -> category hits, for the names and the fallback keywords
+        self.name_matrix = np.zeros((len(self.patterns), len(self.categories)), dtype=np.int32)
+        self.keyword_matrix = np.zeros_like(self.name_matrix)
+        for pattern_id, (_, category, fallback) in enumerate(self.patterns):
+            (self.keyword_matrix if fallback else self.name_matrix)[pattern_id, self.categories.index(category)] = 1
+    
+    def __len__(self) -> int:
+        return len(self.patterns)
+    
+    def find(self, text: str) -> List[Tuple[int, int]]:
+        """
+        Find every occurrence of every pattern.
+        
+        Args:
+            text: Text to scan (matched case-insensitively)
+        
+        Returns:
+            List of (start position in the lowercased text, pattern index into
+            patterns), in order of their end position
+        """
+        transitions, outputs, lengths = self.transitions, self.outputs, self.lengths
+        matches = []
+        state = 0
+        for end, char in enumerate(text.lower(), 1):
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                for pattern_id in outputs[state]:
+                    matches.append((end - lengths[pattern_id], pattern_id))
+        return matches
+    
+    def hits(self, text: str) -> Dict[str, Dict[str, List[int]]]:
+        """
+        Find where each category is mentioned.
+        
+        Args:
+            text: Text to scan
+        
+        Returns:
+            Dictionary with "categories" (hits of the category names) and
+            "keywords" (hits of the fallback keywords), each mapping a
+            category to the start positions of its hits, in text order
+        """
+        hits: Dict[str, Dict[str, List[int]]] = {"categories": {}, "keywords": {}}
+        for start, pattern_id in sorted(self.find(text)):
+            _, category, fallback = self.patterns[pattern_id]
+            hits["keywords" if fallback else "categories"].setdefault(category, []).append(start)
+        return hits
+    
+    def pattern_counts(self, texts: Sequence[Optional[str]]) -> np.ndarray:
+        """
+        Count the hits of every pattern in many texts with the vectorized scan.
+        
+        Args:
+            texts: Texts to scan (None counts as empty)
+        
+        Returns:
+            Array of shape (number of texts, number of patterns)
+        """
+        counts = np.zeros((len(texts), len(self.patterns)), dtype=np.int32)
+        lowered = [(text or "").lower() for text in texts]
+        # Similar lengths in a chunk keep the padding small
+        order = sorted(range(len(lowered)), key=lambda index: len(lowered[index]))
+        
+        for chunk_start in range(0, len(order), BULK_CHUNK_SIZE):
+            rows = order[chunk_start:chunk_start + BULK_CHUNK_SIZE]
+            width = len(lowered[rows[-1]])
+            if width == 0:
+                continue
+            
+            # Table column of every character, one text per row (0 pads the shorter texts)
+            codes = np.zeros((len(rows), width), dtype=np.uint32)
+            for position, row in enumerate(rows):
+                text = lowered[row]
+                codes[position, :len(text)] = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+            np.minimum(codes, len(self.char_columns) - 1, out=codes)
+            columns = np.ascontiguousarray(self.char_columns[codes].T, dtype=np.int32)
+            
+            # Step every text of the chunk through the automaton at once
+            states = np.empty((width, len(rows)), dtype=np.int32)
+            state = np.zeros(len(rows), dtype=np.int32)
+            for step in range(width):
+                np.take(self.flat_table, state + columns[step], out=states[step])
+                state = states[step]
+            
+            # Add up the outputs of the states reached
+            state_ids = states // self.width
+            steps, positions = np.nonzero(self.has_output[state_ids])
+            visits = np.bincount(
+                positions * len(self.transitions) + state_ids[steps, positions],
+                minlength=len(rows) * len(self.transitions)
+            ).reshape(len(rows), len(self.transitions))
+            counts[rows] = visits @ self.state_outputs
+        
+        return counts
+    
+    def category_counts(self, pattern_counts: np.ndarray) -> np.ndarray:
+        """
+        Turn pattern hits into the hits of the recommended categories: hits
+        of the category names, or of the fallback keywords for texts that
+        name no category at all.
+        
+        Args:
+            pattern_counts: Array of shape (number of texts, number of patterns)
+        
+        Returns:
+            Array of shape (number of texts, number of categories), columns in
+            categories order
+        """
+        name_counts = pattern_counts @ self.name_matrix
+        keyword_counts = pattern_counts @ self.keyword_matrix
+        return np.where(name_counts.any(axis=1, keepdims=True), name_counts, keyword_counts)
+    
+    def _ranked(self, counts: np.ndarray) -> Dict[str, int]:
+        # Most mentioned first, ties in category order
+        return {
+            self.categories[column]: int(counts[column])
+            for column in np.argsort(-counts, kind="stable") if counts[column]
+        }
+    
+    def counts(self, text: str) -> Dict[str, int]:
+        """
+        Count how often each recommended category is mentioned: by name, or
+        by fallback keywords if no category is named at all.
+        
+        Args:
+            text: Text to scan
+        
+        Returns:
+            Dictionary mapping each recommended category to its number of
+            hits, most mentioned first (ties in category order)
+        """
+        pattern_ids = [pattern_id for _, pattern_id in self.find(text)]
+        pattern_counts = np.bincount(pattern_ids, minlength=len(self.patterns)).reshape(1, -1)
+        return self._ranked(self.category_counts(pattern_counts)[0])
+    
+    def extract(self, text: Optional[str]) -> List[str]:
+        """
+        Extract the recommended categories from a text.
+        
+        Args:
+            text: Text to scan (e.g. a marketing strategy)
+        
+        Returns:
+            Categories named in the text or, if none is, categories of the
+            fallback keywords in it; most mentioned first
+        """
+        if not text:
+            return []
+        return list(self.counts(text))
+    
+    def extract_many(self, texts: Iterable[Optional[str]]) -> List[List[str]]:
+        """
+        Extract the recommended categories of many texts with the vectorized scan.
+        
+        Args:
+            texts: Texts to scan (e.g. stored marketing strategies)
+        
+        Returns:
+            Recommended categories of each text (as extract() returns them), in input order
+        """
+        counts = self.category_counts(self.pattern_counts(list(texts)))
+        return [list(self._ranked(row)) for row in counts]
+
+# Shared matcher, compiled once at import
+DEFAULT_MATCHER = CategoryMatcher()
+
+def extract_categories(text: Optional[str]) -> List[str]:
+    """
+    Extract the recommended categories from a text with the default matcher.
+    
+    Args:
+        text: Text to scan (e.g. a marketing strategy)
+    
+    Returns:
+        Recommended categories, most mentioned first
+    """
+    return DEFAULT_MATCHER.extract(text)
+
+def extract_categories_batch(texts: Iterable[Optional[str]]) -> List[List[str]]:
+    """
+    Extract the recommended categories of many texts with the default matcher.
+    
+    Args:
+        texts: Texts to scan (e.g. stored marketing strategies)
+    
+    Returns:
+        Recommended categories of each text, in input order
+    """
+    return DEFAULT_MATCHER.extract_many(texts)
@@ -0,0 +1,137 @@
+import re
+from multiprocessing import Pool
+from typing import Dict, Iterable, List, Optional
+
+# Contact fields extracted from channel descriptions
+CONTACT_INFO_FIELDS = ["email", "phone", "instagram", "twitter", "facebook", "business_email"]
+
+EMAIL_PATTERN = r"[\w.-]+@[\w.-]+\.\w+"
+PHONE_PATTERN = r"(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}"
+
+# Business email prefixes, in order of preference
+BUSINESS_EMAIL_PREFIXES = [
+    r"business\s*email",
+    r"for\s*business",
+    r"business\s*inquiries"
+]
+
+SOCIAL_NETWORKS = ["instagram", "twitter", "facebook"]
+
+# Patterns are compiled once at import instead of on every call
+EMAIL_REGEX = re.compile(EMAIL_PATTERN)
+PHONE_REGEX = re.compile(PHONE_PATTERN)
+BUSINESS_EMAIL_REGEXES = [
+    re.compile(rf"{prefix}\s*[:-]?\s*({EMAIL_PATTERN})", re.IGNORECASE)
+    for prefix in BUSINESS_EMAIL_PREFIXES
+]
+SOCIAL_REGEXES = {
+    network: re.compile(rf"{network}\.com/([A-Za-z0-9_.-]+)", re.IGNORECASE)
+    for network in SOCIAL_NETWORKS
+}
+
+# Cheap prefilters. Each one matches wherever the full pattern could match,
+# so descriptions without a hit skip the expensive pattern entirely.
+PHONE_PREFILTER = re.compile(r"[+(\d][-+().\s\d]{9,}")
+BUSINESS_PREFILTER = re.compile(r"business", re.IGNORECASE)
+SOCIAL_PREFILTER = re.compile(r"\.com/", re.IGNORECASE)
+
+def _is_local_part_char(char: str) -> bool:
+    # Same character set as [\w.-] in EMAIL_PATTERN
+    return char.isalnum() or char in "_.-"
+
+def _first_email(text: str) -> Optional[str]:
+    """
+    Find the first match of EMAIL_PATTERN, starting from the "@" signs
+    instead of trying the pattern at every position of the text.
+    """
+    at = text.find("@")
+    while at != -1:
+        # The leftmost match containing this "@" starts where the run of
+        # local-part characters before it starts
+        start = at
+        while start > 0 and _is_local_part_char(text[start - 1]):
+            start -= 1
+        if start < at:
+            match = EMAIL_REGEX.match(text, start)
+            if match:
+                return match.group()
+        at = text.find("@", at + 1)
+    return None
+
+def extract_contacts(description: str) -> Dict[str, Optional[str]]:
+    """
+    Extract contact information from a channel description.
+    
+    Args:
+        description: Channel description text
+    
+    Returns:
+        Dictionary with the first email, phone number, social media handles
+        and business email found (None for fields that were not found)
+    """
+    contact_info = dict.fromkeys(CONTACT_INFO_FIELDS)
+    text = description or ""
+    
+    contact_info["email"] = _first_email(text)
+    
+    if contact_info["email"] and BUSINESS_PREFILTER.search(text):
+        for pattern in BUSINESS_EMAIL_REGEXES:
+            business_match = pattern.search(text)
+            if business_match:
+                contact_info["business_email"] = business_match.group(1)
+                break
+    
+    candidate = PHONE_PREFILTER.search(text)
+    if candidate:
+        phone_match = PHONE_REGEX.search(text, candidate.start())
+        if phone_match:
+            contact_info["phone"] = phone_match.group()
+    
+    if SOCIAL_PREFILTER.search(text):
+        for network, pattern in SOCIAL_REGEXES.items():
+            match = pattern.search(text)
+            if match:
+                contact_info[network] = match.group(1)
+    
+    return contact_info
+
+def _extract_columns(descriptions: List[str]) -> Dict[str, List[Optional[str]]]:
+    columns = {field: [] for field in CONTACT_INFO_FIELDS}
+    for description in descriptions:
+        contact_info = extract_contacts(description)
+        for field in CONTACT_INFO_FIELDS:
+            columns[field].append(contact_info[field])
+    return columns
+
+def extract_contacts_batch(
+    descriptions: Iterable[str],
+    processes: int = 1,
+    chunk_size: int = 20000
+) -> Dict[str, List[Optional[str]]]:
+    """
+    Extract contact information from many channel descriptions.
+    
+    Args:
+        descriptions: Iterable of channel description texts
+        processes: Number of worker processes (1 extracts in this process)
+        chunk_size: Number of descriptions sent to a worker at a time
+    
+    Returns:
+        Columnar results: a dictionary mapping each contact field to a list
+        of values aligned with the input descriptions
+    """
+    descriptions = list(descriptions)
+    
+    # Starting worker processes only pays off when there are several chunks
+    if processes <= 1 or len(descriptions) <= chunk_size:
+        return _extract_columns(descriptions)
+    
+    chunks = [descriptions[start:start + chunk_size] for start in range(0, len(descriptions), chunk_size)]
+    columns = {field: [] for field in CONTACT_INFO_FIELDS}
+    
+    with Pool(processes) as pool:
+        for chunk_columns in pool.imap(_extract_columns, chunks):
+            for field in CONTACT_INFO_FIELDS:
+                columns[field].extend(chunk_columns[field])
+    
+    return columns
@@ -0,0 +1,413 @@
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from tamil_influencer_collector import CONTACT_FIELDS
+
+# Numeric fields kept as columns; missing values are NaN
+NUMERIC_FIELDS = [
+    "subscriberCount",
+    "engagementRate",
+    "avgViewsPerVideo",
+    "tamilScore",
+    "subscriberGrowth7d",
+    "subscriberGrowth30d",
+    "viewGrowth7d",
+    "viewGrowth30d"
+]
+
+# Tamil score assumed for records collected before scoring (they passed the old Tamil check)
+DEFAULT_TAMIL_SCORE = 1.0
+
+# Fields with a precomputed rank order (subscriberCount is the row order itself)
+RANKING_FIELDS = [field for field in NUMERIC_FIELDS if field not in ("subscriberCount", "tamilScore")]
+
+# Number of rows checked at a time when walking a rank order, and the number
+# of rows meeting the subscriber minimum up to which a top k is selected
+# with np.argpartition instead
+SCAN_CHUNK_SIZE = 4096
+PARTITION_MAX_ROWS = 65536
+
+# Category bitmasks are 64-bit
+MAX_CATEGORIES = 64
+
+# Factors of the weighted score (sort_by="score"), each normalized to 0-1
+# over the whole index, and their default weights
+SCORE_FACTORS = ["subscribers", "engagement", "avgViews", "contact"]
+DEFAULT_SCORE_WEIGHTS = {"subscribers": 0.4, "engagement": 0.3, "avgViews": 0.2, "contact": 0.1}
+# Engagement rates are scaled by this percentile, so a few tiny channels
+# with extreme rates do not squash everyone else's engagement factor
+ENGAGEMENT_SCALE_PERCENTILE = 99
+
+# Contact fields as key paths (documents may be dicts or read-only mappings)
+CONTACT_PATHS = [path.split(".") for path in CONTACT_FIELDS.values()]
+
+def _present(influencers: Sequence[Mapping[str, Any]], keys: List[str]) -> np.ndarray:
+    # Whether each document has a non-empty value at the key path
+    values = [influencer.get(keys[0]) for influencer in influencers]
+    for key in keys[1:]:
+        values = [value.get(key) if value else None for value in values]
+    return np.fromiter(map(bool, values), dtype=bool, count=len(values))
+
+def numeric_columns(influencers: Sequence[Mapping[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Extract the NUMERIC_FIELDS of influencer documents as columns.
+    
+    Args:
+        influencers: Influencer documents
+    
+    Returns:
+        Dictionary mapping each field to an array (NaN where missing)
+    """
+    # Columns are extracted a field at a time (None becomes NaN)
+    return {
+        field: np.array([influencer.get(field) for influencer in influencers], dtype=np.float64).reshape(len(influencers))
+        for field in NUMERIC_FIELDS
+    }
+
+def contact_counts(influencers: Sequence[Mapping[str, Any]]) -> np.ndarray:
+    """
+    Count the contact fields (see CONTACT_FIELDS) present in each influencer document.
+    
+    Args:
+        influencers: Influencer documents
+    
+    Returns:
+        Array of counts
+    """
+    return sum(_present(influencers, keys).astype(np.float64) for keys in CONTACT_PATHS)
+
+def _factor_values(columns: Dict[str, np.ndarray]) -> List[np.ndarray]:
+    # Raw factor values; counts are heavy-tailed, so their logarithm is used
+    return [
+        np.log1p(np.maximum(np.nan_to_num(columns["subscriberCount"]), 0)),
+        np.maximum(np.nan_to_num(columns["engagementRate"]), 0),
+        np.log1p(np.maximum(np.nan_to_num(columns["avgViewsPerVideo"]), 0))
+    ]
+
+def score_scales(columns: Dict[str, np.ndarray]) -> Dict[str, float]:
+    """
+    Compute the scales normalizing the score factors of a data set to 0-1.
+    
+    Args:
+        columns: Numeric columns of the data set (see numeric_columns)
+    
+    Returns:
+        Dictionary with the subscribers, engagement and avgViews scales
+    """
+    subscribers, engagement, avg_views = _factor_values(columns)
+    return {
+        "subscribers": float(subscribers.max(initial=0)),
+        "engagement": float(np.percentile(engagement, ENGAGEMENT_SCALE_PERCENTILE)) if len(engagement) else 0.0,
+        "avgViews": float(avg_views.max(initial=0))
+    }
+
+def score_factors(columns: Dict[str, np.ndarray], contacts: np.ndarray, scales: Dict[str, float]) -> np.ndarray:
+    """
+    Compute the normalized score factors of influencers.
+    
+    Args:
+        columns: Numeric columns (see numeric_columns)
+        contacts: Contact field counts (see contact_counts)
+        scales: Factor scales (see score_scales); values above a scale are capped at 1
+    
+    Returns:
+        float32 array with one row per entry of SCORE_FACTORS
+    """
+    def scaled(values, scale):
+        return np.minimum(values / scale, 1) if scale > 0 else np.zeros(len(values))
+    
+    values = _factor_values(columns)
+    return np.vstack([
+        *(scaled(factor_values, scales[factor]) for factor, factor_values in zip(SCORE_FACTORS, values)),
+        contacts / len(CONTACT_PATHS)
+    ]).astype(np.float32)
+
+def weight_vector(weights: Optional[Mapping[str, float]] = None) -> np.ndarray:
+    """
+    Convert score weights to a vector aligned with SCORE_FACTORS.
+    
+    Args:
+        weights: Weight of each factor (default: DEFAULT_SCORE_WEIGHTS;
+            missing factors weigh 0)
+    
+    Returns:
+        float32 array of weights normalized to sum to 1 (all 0 if no weight is positive)
+    """
+    weights = DEFAULT_SCORE_WEIGHTS if weights is None else weights
+    vector = np.array([max(weights.get(factor, 0), 0) for factor in SCORE_FACTORS], dtype=np.float32)
+    total = vector.sum()
+    return vector / total if total > 0 else vector
+
+def weighted_score(factors: np.ndarray, weights: Optional[Mapping[str, float]] = None) -> np.ndarray:
+    """
+    Combine score factors into the weighted score. The factors are added
+    one at a time in SCORE_FACTORS order, so every index computes the same
+    float32 scores and ranks ties the same way.
+    
+    Args:
+        factors: Score factors (see score_factors), one column per influencer
+        weights: Factor weights (see weight_vector)
+    
+    Returns:
+        Array of scores between 0 and 1
+    """
+    vector = weight_vector(weights)
+    
+    # Without any weight every score is 0
+    scores = factors[0] * vector[0]
+    for factor, weight in zip(factors[1:], vector[1:]):
+        if weight > 0:
+            scores += weight * factor
+    return scores
+
+class InfluencerIndex:
+    """
+    Columnar in-memory index of influencer documents.
+    
+    Numeric fields are stored as NumPy columns and the categories of each
+    influencer as a 64-bit mask, so a query is a few vectorized comparisons
+    instead of a Python loop over the documents. Rows are ordered by
+    subscriber count (descending) when the index is built: the minimum
+    subscriber filter is a binary search for a prefix of the rows, and
+    ranking by subscribers only walks that prefix until enough matches are
+    found. Other rankings select their top k with np.argpartition instead
+    of sorting every match when few rows are left, and otherwise walk a
+    rank order precomputed for each field.
+    
+    Results are ordered exactly like a stable sort of the original
+    documents: influencers without a value for the ranking field go last,
+    and ties keep their original order.
+    """
+    
+    def __init__(self, influencers: Sequence[Mapping[str, Any]], categories: Iterable[str] = ()):
+        """
+        Build the index.
+        
+        Args:
+            influencers: Influencer documents (from the JSON export or MongoDB)
+            categories: Categories to assign the first bits to (others get
+                bits in order of appearance)
+        """
+        self.category_bits: Dict[str, int] = {}
+        for category in categories:
+            self._category_bit(category)
+        
+        num_rows = len(influencers)
+        columns = numeric_columns(influencers)
+        masks = np.array([
+            sum(1 << self._category_bit(category) for category in influencer.get("categories", ()))
+            for influencer in influencers
+        ], dtype=np.uint64).reshape(num_rows)
+        contacts = contact_counts(influencers)
+        
+        # Rows with the most subscribers first, influencers without a count last
+        subscribers = columns["subscriberCount"]
+        order = np.lexsort((np.arange(num_rows), np.isnan(subscribers), -np.nan_to_num(subscribers)))
+        
+        self.documents = [influencers[position] for position in order]
+        self.positions = order
+        self.columns = {field: values[order] for field, values in columns.items()}
+        self.category_masks = masks[order]
+        
+        # Filter values: a missing subscriber count counts as 0, a missing Tamil score as the default
+        self.min_subscriber_keys = -np.nan_to_num(self.columns["subscriberCount"])
+        self.tamil_scores = np.where(
+            np.isnan(self.columns["tamilScore"]), DEFAULT_TAMIL_SCORE, self.columns["tamilScore"]
+        )
+        
+        # Ranking keys (missing values rank below every value) and the rows
+        # in rank order of each ranking field, ties in original order
+        self.row_numbers = np.arange(num_rows)
+        self.rank_keys = {
+            field: np.where(np.isnan(values), -np.inf, values)
+            for field, values in self.columns.items()
+            if field in RANKING_FIELDS
+        }
+        self.rank_orders = {
+            field: np.lexsort((self.positions, -keys))
+            for field, keys in self.rank_keys.items()
+        }
+        
+        # Normalized score factors, one row per entry of SCORE_FACTORS, so
+        # factors with no weight are skipped without touching their memory
+        self.scales = score_scales(self.columns)
+        self.factors = score_factors(self.columns, contacts[order], self.scales)
+    
+    def __len__(self) -> int:
+        return len(self.documents)
+    
+    def _category_bit(self, category: str) -> int:
+        if category not in self.category_bits:
+            if len(self.category_bits) >= MAX_CATEGORIES:
+                raise ValueError(f"The index supports at most {MAX_CATEGORIES} categories")
+            self.category_bits[category] = len(self.category_bits)
+        return self.category_bits[category]
+    
+    def category_mask(self, categories: Iterable[str]) -> np.uint64:
+        """
+        Get the bitmask matching any of the given categories.
+        
+        Args:
+            categories: Category names (unknown ones match nothing)
+        
+        Returns:
+            Bitmask of the categories
+        """
+        mask = 0
+        for category in categories:
+            if category in self.category_bits:
+                mask |= 1 << self.category_bits[category]
+        return np.uint64(mask)
+    
+    def _subscriber_prefix(self, min_subscribers: float) -> int:
+        # Rows meeting the minimum subscriber count form a prefix of the row order
+        return int(np.searchsorted(self.min_subscriber_keys, -min_subscribers, side="right"))
+    
+    def _match(self, rows: Any, category_mask: Optional[np.uint64], min_tamil_score: float) -> np.ndarray:
+        matches = self.tamil_scores[rows] >= min_tamil_score
+        if category_mask is not None:
+            matches &= (self.category_masks[rows] & category_mask) != 0
+        return matches
+    
+    def filter(
+        self,
+        categories: Optional[Iterable[str]] = None,
+        min_subscribers: float = 0,
+        min_tamil_score: float = 0.0
+    ) -> np.ndarray:
+        """
+        Find the rows matching a query.
+        
+        Args:
+            categories: Keep influencers in any of these categories (default: all)
+            min_subscribers: Minimum subscriber count
+            min_tamil_score: Minimum Tamil score
+        
+        Returns:
+            Array of matching row numbers, in subscriber order
+        """
+        category_mask = self.category_mask(categories) if categories else None
+        stop = self._subscriber_prefix(min_subscribers)
+        return np.flatnonzero(self._match(slice(0, stop), category_mask, min_tamil_score))
+    
+    def _walk(
+        self,
+        ranked_rows: np.ndarray,
+        category_mask: Optional[np.uint64],
+        min_tamil_score: float,
+        limit: int,
+        min_subscribers: Optional[float] = None
+    ) -> np.ndarray:
+        # The rows are already ranked: check them a chunk at a time until enough match
+        found = []
+        num_found = 0
+        for start in range(0, len(ranked_rows), SCAN_CHUNK_SIZE):
+            rows = ranked_rows[start:start + SCAN_CHUNK_SIZE]
+            matches = self._match(rows, category_mask, min_tamil_score)
+            if min_subscribers is not None:
+                matches &= self.min_subscriber_keys[rows] <= -min_subscribers
+            found.append(rows[matches])
+            num_found += len(found[-1])
+            if limit and num_found >= limit:
+                break
+        rows = np.concatenate(found) if found else np.zeros(0, dtype=np.int64)
+        return rows[:limit] if limit else rows
+    
+    def score(self, rows: Any, weights: Optional[Mapping[str, float]] = None) -> np.ndarray:
+        """
+        Compute the weighted score of rows in one vectorized pass.
+        
+        Args:
+            rows: Row numbers (or a slice) to score
+            weights: Weight of each factor in SCORE_FACTORS (default:
+                DEFAULT_SCORE_WEIGHTS; missing factors weigh 0). They are
+                normalized to sum to 1
+        
+        Returns:
+            Array of scores between 0 and 1
+        """
+        return weighted_score(self.factors[:, rows], weights)
+    
+    def _partition(self, rows: np.ndarray, keys: np.ndarray, limit: int) -> np.ndarray:
+        if limit and len(rows) > limit:
+            kth = np.argpartition(-keys, limit - 1)[limit - 1]
+            threshold = keys[kth]
+            # Everything above the k-th value, plus the earliest ties at it
+            above = np.flatnonzero(keys > threshold)
+            ties = np.flatnonzero(keys == threshold)
+            ties = ties[np.argsort(self.positions[rows[ties]], kind="stable")][:limit - len(above)]
+            selected = np.concatenate((above, ties))
+            rows, keys = rows[selected], keys[selected]
+        
+        order = np.lexsort((self.positions[rows], -keys))
+        return rows[order]
+    
+    def top(
+        self,
+        categories: Optional[Iterable[str]] = None,
+        min_subscribers: float = 0,
+        min_tamil_score: float = 0.0,
+        sort_by: str = "subscriberCount",
+        limit: int = 50,
+        weights: Optional[Mapping[str, float]] = None
+    ) -> np.ndarray:
+        """
+        Find the top rows matching a query.
+        
+        Ranking by subscribers walks the row order. Other rankings walk the
+        field's rank order when many rows meet the minimum subscriber count,
+        and select from those rows with np.argpartition when few do. The
+        weighted score is computed for the matching rows only, and its top k
+        selected with np.argpartition.
+        
+        Args:
+            categories: Keep influencers in any of these categories (default: all)
+            min_subscribers: Minimum subscriber count
+            min_tamil_score: Minimum Tamil score
+            sort_by: Field to rank by, descending (subscriberCount, one of
+                RANKING_FIELDS, or "score" for the weighted score)
+            limit: Maximum number of rows (0 for all)
+            weights: Factor weights of the weighted score (see score)
+        
+        Returns:
+            Array of row numbers, best first
+        """
+        category_mask = self.category_mask(categories) if categories else None
+        stop = self._subscriber_prefix(min_subscribers)
+        
+        if sort_by == "subscriberCount":
+            return self._walk(self.row_numbers[:stop], category_mask, min_tamil_score, limit)
+        
+        if sort_by != "score" and limit and stop > PARTITION_MAX_ROWS:
+            return self._walk(self.rank_orders[sort_by], category_mask, min_tamil_score, limit, min_subscribers)
+        
+        rows = np.flatnonzero(self._match(slice(0, stop), category_mask, min_tamil_score))
+        keys = self.score(rows, weights) if sort_by == "score" else self.rank_keys[sort_by][rows]
+        return self._partition(rows, keys, limit)
+    
+    def search(self, *args: Any, **kwargs: Any) -> List[Mapping[str, Any]]:
+        """
+        Find the top influencers matching a query (same arguments as top).
+        
+        Returns:
+            List of influencer documents, best first
+        """
+        return [self.documents[row] for row in self.top(*args, **kwargs)]
+    
+    @classmethod
+    def from_collection(cls, collection, categories: Iterable[str] = (), projection: Optional[Dict[str, Any]] = None) -> "InfluencerIndex":
+        """
+        Build the index from a MongoDB collection.
+        
+        Args:
+            collection: MongoDB influencers collection
+            categories: Categories to assign the first bits to
+            projection: Fields to keep in the indexed documents (default:
+                everything except the description and _id)
+        
+        Returns:
+            The index
+        """
+        projection = projection or {"_id": 0, "description": 0}
+        return cls(list(collection.find({}, projection)), categories)
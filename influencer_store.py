@@ -0,0 +1,175 @@
+import os
+import json
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from category_index import CategoryIndex
+from influencer_index import InfluencerIndex
+from text_index import TEXT_INDEX_FILE, TextIndex
+from tamil_influencer_collector import CATEGORIES, load_influencers_from_json
+
+def freeze(value: Any) -> Any:
+    """
+    Make a parsed JSON value read-only: dictionaries become MappingProxyType
+    views and lists become tuples, recursively.
+    
+    Args:
+        value: Parsed JSON value
+    
+    Returns:
+        Read-only copy of the value
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+class InfluencerStore:
+    """
+    Process-wide cache of the influencer JSON export.
+    
+    The file is parsed once and only parsed again when its modification time
+    or size changes, so the sessions of the app share one copy instead of
+    each click re-reading the file. Influencers are handed out as read-only
+    views, since the same objects are shared by every session. The indexes
+    used for queries are built on first use after each load.
+    """
+    
+    def __init__(self, filename: str = "tamil_influencers.json", text_index_file: Optional[str] = TEXT_INDEX_FILE):
+        """
+        Initialize the store. The file is read on first access.
+        
+        Args:
+            filename: JSON export to serve (NDJSON and gzip exports are supported too)
+            text_index_file: File the text index is persisted to (None to keep it in memory only)
+        """
+        self.filename = filename
+        self.loads = 0
+        self._signature = None
+        self._influencers: Tuple[Mapping[str, Any], ...] = ()
+        self.text_index_file = text_index_file
+        # Structures built from the influencers: name -> (source, structure)
+        self._derived: Dict[str, Tuple[Tuple[Mapping[str, Any], ...], Any]] = {}
+        self._lock = threading.Lock()
+    
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def influencers(self) -> Tuple[Mapping[str, Any], ...]:
+        """
+        Get all influencers, reloading the file if it changed since the last load.
+        
+        Returns:
+            Tuple of read-only influencer documents (empty if the file does not exist)
+        """
+        signature = self._file_signature()
+        if signature == self._signature:
+            return self._influencers
+        
+        with self._lock:
+            # Another session may have reloaded the file while this one waited
+            signature = self._file_signature()
+            if signature == self._signature:
+                return self._influencers
+            
+            if signature is None:
+                influencers = ()
+            else:
+                try:
+                    influencers = freeze(load_influencers_from_json(self.filename))
+                except (OSError, json.JSONDecodeError, EOFError) as e:
+                    # Likely caught mid-export: keep serving the previous data and retry next time
+                    print(f"Could not load {self.filename}: {e}")
+                    return self._influencers
+            
+            self._influencers = influencers
+            self._signature = signature
+            self.loads += 1
+        
+        return self._influencers
+    
+    def _get_derived(
+        self,
+        name: str,
+        build: Callable[[Tuple[Mapping[str, Any], ...], Any], Any],
+        update: Optional[Callable[[Any, Tuple[Mapping[str, Any], ...]], Any]] = None
+    ) -> Any:
+        # Reload first if the file changed
+        self.influencers()
+        
+        with self._lock:
+            influencers, signature = self._influencers, self._signature
+            # Rebuild (or update in place, if the structure supports it) when
+            # the data was reloaded since the structure was built
+            source, structure = self._derived.get(name, (None, None))
+            if source is not influencers:
+                if structure is not None and update is not None:
+                    update(structure, influencers)
+                else:
+                    structure = build(influencers, signature)
+                self._derived[name] = (influencers, structure)
+            return structure
+    
+    def documents_by_id(self) -> Dict[str, Mapping[str, Any]]:
+        """
+        Get the current influencers keyed by channel ID, reloading the file
+        first if it changed.
+        
+        Returns:
+            Dictionary mapping channel ID to influencer document
+        """
+        return self._get_derived("documents_by_id", lambda influencers, signature: {
+            influencer["channelId"]: influencer for influencer in influencers
+        })
+    
+    def index(self) -> InfluencerIndex:
+        """
+        Get the columnar index of the current influencers, reloading the
+        file first if it changed.
+        
+        Returns:
+            Index of the influencers served by influencers()
+        """
+        return self._get_derived("index", lambda influencers, signature: InfluencerIndex(influencers, CATEGORIES))
+    
+    def category_index(self) -> CategoryIndex:
+        """
+        Get the inverted category index of the current influencers,
+        reloading the file first if it changed. After a reload the index is
+        refreshed in place, so only the records that changed are moved.
+        
+        Returns:
+            Index of the influencers served by influencers()
+        """
+        return self._get_derived(
+            "category_index",
+            lambda influencers, signature: CategoryIndex(influencers, CATEGORIES),
+            lambda index, influencers: index.refresh(influencers)
+        )
+    
+    def text_index(self) -> TextIndex:
+        """
+        Get the BM25 text index of the current influencers, reloading the
+        file first if it changed. The index is loaded from text_index_file
+        if it was saved for the same file version, and built and saved otherwise.
+        
+        Returns:
+            Index of the influencers served by influencers()
+        """
+        return self._get_derived("text_index", lambda influencers, signature: TextIndex.load_or_build(
+            influencers, f"{os.path.abspath(self.filename)}:{signature}", self.text_index_file
+        ))
+    
+    @property
+    def version(self) -> Optional[Tuple[int, int]]:
+        """
+        Signature (modification time, size) of the data currently served,
+        for caches derived from the influencers.
+        """
+        return self._signature
@@ -0,0 +1,127 @@
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Tamil Unicode block
+TAMIL_BLOCK_START = 0x0B80
+TAMIL_BLOCK_END = 0x0BFF
+
+# Keywords counted in the title and description
+TAMIL_KEYWORDS = ["tamil", "தமிழ"]
+# Keywords only counted for channels from India
+REGIONAL_KEYWORDS = ["chennai", "tamil nadu"]
+
+# Score contributed by each keyword hit, on top of the Tamil-script share
+KEYWORD_HIT_WEIGHT = 0.25
+# Channels scoring at least this much are treated as Tamil channels
+TAMIL_SCORE_THRESHOLD = 0.2
+
+TAMIL_KEYWORD_REGEX = re.compile("|".join(re.escape(keyword) for keyword in TAMIL_KEYWORDS))
+REGIONAL_KEYWORD_REGEX = re.compile("|".join(re.escape(keyword) for keyword in REGIONAL_KEYWORDS))
+
+# Separates the texts in the joined corpus
+_SEPARATOR = "\x00"
+
+def _letter_mask(codes: np.ndarray) -> np.ndarray:
+    """
+    Mask of the code points counted as letters: ASCII letters and non-ASCII
+    characters outside the punctuation/symbol and emoji ranges.
+    """
+    ascii_letters = ((codes >= 0x41) & (codes <= 0x5A)) | ((codes >= 0x61) & (codes <= 0x7A))
+    other_letters = (codes >= 0x80) & ~((codes >= 0x2000) & (codes <= 0x2BFF)) & (codes < 0x1F000)
+    return ascii_letters | other_letters
+
+def _hits_per_text(pattern: "re.Pattern", corpus: str, starts: np.ndarray) -> np.ndarray:
+    positions = np.fromiter((match.start() for match in pattern.finditer(corpus)), dtype=np.int64)
+    owners = np.searchsorted(starts, positions, side="right") - 1
+    return np.bincount(owners, minlength=len(starts))
+
+def combine_tamil_score(script_share: Any, keyword_hits: Any) -> np.ndarray:
+    """
+    Combine the Tamil-script share and keyword hits into a score.
+    Works on stored components, so tuning the weights does not need the text.
+    
+    Args:
+        script_share: Share(s) of Tamil-script letters (0 to 1)
+        keyword_hits: Number(s) of keyword hits
+    
+    Returns:
+        Array of scores between 0 and 1
+    """
+    script_share = np.asarray(script_share, dtype=np.float64)
+    keyword_hits = np.asarray(keyword_hits, dtype=np.float64)
+    return np.minimum(1.0, script_share + KEYWORD_HIT_WEIGHT * keyword_hits)
+
+def score_tamil_texts(texts: Sequence[str], countries: Optional[Sequence[Optional[str]]] = None) -> Dict[str, np.ndarray]:
+    """
+    Score many texts for Tamil content in one vectorized call.
+    
+    The texts are joined into one string, which is lowercased and decoded
+    to code points once. Per-text counts come from cumulative sums over the
+    code point array, and keyword hits from one regex pass over the corpus.
+    
+    Args:
+        texts: Texts to score (e.g. title and description of each channel)
+        countries: Country code of each text's channel (regional keywords
+            are only counted for "IN")
+    
+    Returns:
+        Dictionary with the scriptShare, keywordHits and score arrays
+    """
+    num_texts = len(texts)
+    if num_texts == 0:
+        return {
+            "scriptShare": np.zeros(0),
+            "keywordHits": np.zeros(0, dtype=np.int64),
+            "score": np.zeros(0)
+        }
+    
+    corpus = _SEPARATOR.join(texts)
+    if corpus.count(_SEPARATOR) != num_texts - 1:
+        corpus = _SEPARATOR.join(text.replace(_SEPARATOR, " ") for text in texts)
+    corpus = corpus.lower()
+    
+    codes = np.frombuffer(corpus.encode("utf-32-le"), dtype=np.uint32)
+    separators = np.flatnonzero(codes == ord(_SEPARATOR))
+    starts = np.concatenate(([0], separators + 1))
+    ends = np.concatenate((separators, [len(codes)]))
+    
+    def count_per_text(mask: np.ndarray) -> np.ndarray:
+        cumulative = np.concatenate(([0], np.cumsum(mask, dtype=np.int64)))
+        return cumulative[ends] - cumulative[starts]
+    
+    tamil_letters = count_per_text((codes >= TAMIL_BLOCK_START) & (codes <= TAMIL_BLOCK_END))
+    letters = count_per_text(_letter_mask(codes))
+    script_share = np.divide(tamil_letters, letters, out=np.zeros(num_texts), where=letters > 0)
+    
+    keyword_hits = _hits_per_text(TAMIL_KEYWORD_REGEX, corpus, starts)
+    if countries is not None:
+        from_india = np.array([country == "IN" for country in countries], dtype=bool)
+        keyword_hits = keyword_hits + _hits_per_text(REGIONAL_KEYWORD_REGEX, corpus, starts) * from_india
+    
+    return {
+        "scriptShare": script_share,
+        "keywordHits": keyword_hits,
+        "score": combine_tamil_score(script_share, keyword_hits)
+    }
+
+def score_tamil_channels(channels: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Score YouTube channels for Tamil content from their title and description.
+    
+    Args:
+        channels: Channel details from the YouTube API
+    
+    Returns:
+        Dictionary with the scriptShare, keywordHits and score arrays,
+        aligned with channels
+    """
+    texts = []
+    countries = []
+    for channel in channels:
+        snippet = channel.get("snippet", {})
+        texts.append(f"{snippet.get('title', '')}\n{snippet.get('description', '')}")
+        countries.append(channel.get("brandingSettings", {}).get("channel", {}).get("country"))
+    
+    return score_tamil_texts(texts, countries)
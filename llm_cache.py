@@ -0,0 +1,156 @@
+import os
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from response_cache import ResponseCache
+
+# Persistent cache of LLM responses, shared by every session and process of
+# the app: file, size cap and how long a generated analysis is reused
+LLM_CACHE_FILE = os.getenv("LLM_CACHE_FILE", os.path.join(".cache", "llm_responses.sqlite"))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_MB", "50")) * 1024 * 1024
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL_HOURS", "168")) * 3600
+
+# Query parameters that only track where a visitor came from
+TRACKING_PARAM_PREFIXES = ("utm_",)
+TRACKING_PARAMS = {"fbclid", "gclid", "ref"}
+
+# Ports implied by the scheme
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Cache opened on first use by get_llm_cache(), so importing this module creates no files
+_llm_cache = None
+_llm_cache_opened = False
+_llm_cache_lock = threading.Lock()
+
+def get_llm_cache() -> Optional[ResponseCache]:
+    """
+    Get the shared LLM response cache, opening its file on first use. If
+    the file can't be opened (e.g. on a read-only filesystem), caching is
+    disabled for the rest of the process.
+    
+    Returns:
+        The cache, or None if caching is disabled
+    """
+    global _llm_cache, _llm_cache_opened
+    
+    if not _llm_cache_opened:
+        with _llm_cache_lock:
+            if not _llm_cache_opened:
+                if LLM_CACHE_FILE:
+                    try:
+                        _llm_cache = ResponseCache(LLM_CACHE_FILE, max_bytes=LLM_CACHE_MAX_BYTES, default_ttl=LLM_CACHE_TTL)
+                    except (OSError, sqlite3.Error) as e:
+                        print(f"LLM response cache disabled: could not open {LLM_CACHE_FILE}: {e}")
+                _llm_cache_opened = True
+    
+    return _llm_cache
+
+def cache_stats() -> Optional[Dict[str, Any]]:
+    """
+    Get the stats of the LLM response cache without creating its file.
+    
+    Returns:
+        Stats (see ResponseCache.stats), or None if caching is disabled or
+        nothing was cached yet
+    """
+    if not _llm_cache_opened and not (LLM_CACHE_FILE and os.path.exists(LLM_CACHE_FILE)):
+        return None
+    llm_cache = get_llm_cache()
+    return llm_cache.stats() if llm_cache is not None else None
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a website URL so different spellings of the same page share a
+    cache entry: https is assumed when the scheme is missing, the scheme and
+    host are lowercased, default ports, fragments, tracking parameters and
+    trailing slashes are dropped, and the query parameters are sorted.
+    URLs that can't be parsed (e.g. a non-numeric port) are only stripped.
+    
+    Args:
+        url: URL as entered by the user
+    
+    Returns:
+        Normalized URL
+    """
+    url = url.strip()
+    if "://" not in url:
+        url = f"https://{url}"
+    
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        # Mistyped URLs still go to the LLM as entered, cached under their raw spelling
+        return url
+    
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").rstrip(".")
+    if port and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    
+    query = urlencode(sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name.lower() not in TRACKING_PARAMS and not name.lower().startswith(TRACKING_PARAM_PREFIXES)
+    ))
+    return urlunsplit((scheme, host, parts.path.rstrip("/"), query, ""))
+
+def template_hash(template: str) -> str:
+    """
+    Hash a prompt template, so editing the prompt invalidates the responses
+    generated from the old one.
+    
+    Args:
+        template: Prompt template
+    
+    Returns:
+        Short hex digest of the template
+    """
+    return hashlib.sha256(template.encode("utf-8")).hexdigest()[:16]
+
+def website_analysis_key(url: str, template: str, model: str) -> str:
+    """
+    Build the cache key of a website analysis.
+    
+    Args:
+        url: Analyzed URL (normalized here)
+        template: Prompt template the analysis is generated from
+        model: Name of the LLM
+    
+    Returns:
+        Cache key
+    """
+    return ResponseCache.make_key("website_analysis", normalize_url(url), template_hash(template), model)
+
+def get_cached_analysis(url: str, template: str, model: str) -> Optional[str]:
+    """
+    Get a cached website analysis.
+    
+    Args:
+        url: Analyzed URL
+        template: Prompt template
+        model: Name of the LLM
+    
+    Returns:
+        The analysis, or None if it is not cached, expired or caching is disabled
+    """
+    llm_cache = get_llm_cache()
+    if llm_cache is None:
+        return None
+    return llm_cache.get(website_analysis_key(url, template, model))
+
+def cache_analysis(url: str, template: str, model: str, analysis: str):
+    """
+    Store a website analysis (a no-op if caching is disabled).
+    
+    Args:
+        url: Analyzed URL
+        template: Prompt template
+        model: Name of the LLM
+        analysis: Generated analysis
+    """
+    llm_cache = get_llm_cache()
+    if llm_cache is not None:
+        llm_cache.set(website_analysis_key(url, template, model), analysis)
@@ -0,0 +1,355 @@
+import json
+import time
+import random
+import string
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode
+
+import httplib2
+import googleapiclient.errors
+
+from youtube_api import QUOTA_COSTS
+
+API_ROOT = "https://youtube.googleapis.com/youtube/v3"
+
+# Maximum page size of list calls, as enforced by the real API
+MAX_PAGE_SIZE = 50
+
+# Text used to build synthetic channel descriptions and video titles
+SYNTHETIC_WORDS = [
+    "tamil", "cooking", "comedy", "tech", "reviews", "vlogs", "chennai", "madurai", "recipes",
+    "shorts", "trending", "music", "cinema", "தமிழ்", "சமையல்", "நகைச்சுவை", "வணக்கம்", "நண்பர்களே"
+]
+
+class OfflineRequest:
+    """
+    Stand-in for the request objects built by the API client. Exposes the
+    methodId and uri used by youtube_api.execute_request.
+    """
+    
+    def __init__(self, api: "OfflineYouTube", method_id: str, params: Dict[str, Any], handler):
+        self.api = api
+        self.methodId = method_id
+        self.params = params
+        self.handler = handler
+        
+        resource = method_id.split(".")[1]
+        self.uri = f"{API_ROOT}/{resource}?{urlencode(sorted((k, str(v)) for k, v in params.items()))}"
+    
+    def execute(self, http: Any = None, num_retries: int = 0) -> Dict[str, Any]:
+        return self.api._execute(self)
+
+class _Resource:
+    def __init__(self, api: "OfflineYouTube", method_id: str, handler):
+        self.api = api
+        self.method_id = method_id
+        self.handler = handler
+    
+    def list(self, **params) -> OfflineRequest:
+        params = {key: value for key, value in params.items() if value is not None}
+        return OfflineRequest(self.api, self.method_id, params, self.handler)
+
+class OfflineYouTube:
+    """
+    Offline stand-in for the YouTube Data API client, serving recorded or
+    synthetic fixtures. Install it with youtube_api.set_youtube().
+    
+    Supports search.list (channel searches with paging), channels.list,
+    videos.list (by ID or chart=mostPopular) and playlistItems.list, with
+    configurable latency and injected quota errors. Round trips and quota
+    units are counted per method.
+    
+    Fixtures are a dictionary with:
+        channels: channel resources by channel ID
+        videos: video resources by video ID
+        searches: channel IDs returned by each search query, in result order
+        playlists: playlistItems resources by playlist ID
+        charts: video IDs of the mostPopular chart by videoCategoryId ("" for all)
+    """
+    
+    def __init__(
+        self,
+        fixtures: Dict[str, Any],
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        quota_limit: Optional[int] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the stand-in.
+        
+        Args:
+            fixtures: Fixtures to serve (see the class docstring)
+            latency: Seconds every call takes
+            jitter: Maximum random seconds added to the latency
+            error_rate: Share of calls failing with a 403 rateLimitExceeded error
+            quota_limit: Units after which every call fails with a 403 quotaExceeded error
+            seed: Random seed of the jitter and the injected errors
+        """
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.quota_limit = quota_limit
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.round_trips = Counter()
+        self.units = Counter()
+        self.errors = Counter()
+    
+    @classmethod
+    def from_file(cls, path: str, **options) -> "OfflineYouTube":
+        """
+        Create a stand-in serving the fixtures stored in a JSON file.
+        
+        Args:
+            path: Path of the fixture file
+            **options: Options passed to the constructor
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f), **options)
+    
+    def save_fixtures(self, path: str):
+        """
+        Save the served fixtures to a JSON file.
+        
+        Args:
+            path: Path of the fixture file
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.fixtures, f, ensure_ascii=False)
+    
+    # Resources, mirroring the API client
+    
+    def search(self) -> _Resource:
+        return _Resource(self, "youtube.search.list", self._search_list)
+    
+    def channels(self) -> _Resource:
+        return _Resource(self, "youtube.channels.list", self._channels_list)
+    
+    def videos(self) -> _Resource:
+        return _Resource(self, "youtube.videos.list", self._videos_list)
+    
+    def playlistItems(self) -> _Resource:
+        return _Resource(self, "youtube.playlistItems.list", self._playlist_items_list)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the round trips, quota units and injected errors per method.
+        """
+        with self.lock:
+            return {
+                "roundTrips": sum(self.round_trips.values()),
+                "units": sum(self.units.values()),
+                "roundTripsByMethod": dict(self.round_trips),
+                "unitsByMethod": dict(self.units),
+                "errorsByMethod": dict(self.errors)
+            }
+    
+    def reset_stats(self):
+        """
+        Reset the counters.
+        """
+        with self.lock:
+            self.round_trips.clear()
+            self.units.clear()
+            self.errors.clear()
+    
+    def _error(self, method_id: str, status: int, reason: str, message: str) -> googleapiclient.errors.HttpError:
+        with self.lock:
+            self.errors[method_id] += 1
+        content = json.dumps({"error": {"code": status, "message": message, "errors": [{"reason": reason}]}})
+        return googleapiclient.errors.HttpError(httplib2.Response({"status": status}), content.encode("utf-8"))
+    
+    def _execute(self, request: OfflineRequest) -> Dict[str, Any]:
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        
+        method_id = request.methodId
+        with self.lock:
+            self.round_trips[method_id] += 1
+            over_quota = self.quota_limit is not None and sum(self.units.values()) >= self.quota_limit
+            rate_limited = self.error_rate > 0 and self.random.random() < self.error_rate
+            if not over_quota and not rate_limited:
+                self.units[method_id] += QUOTA_COSTS.get(method_id, 1)
+        
+        if over_quota:
+            raise self._error(method_id, 403, "quotaExceeded", "The request cannot be completed because you have exceeded your quota.")
+        if rate_limited:
+            raise self._error(method_id, 403, "rateLimitExceeded", "The request rate is too high.")
+        
+        return request.handler(request.params)
+    
+    @staticmethod
+    def _page(items: List[Any], params: Dict[str, Any], default_size: int = 5) -> Dict[str, Any]:
+        size = min(int(params.get("maxResults", default_size)), MAX_PAGE_SIZE)
+        start = int(params.get("pageToken", 0))
+        page = {
+            "items": items[start:start + size],
+            "pageInfo": {"totalResults": len(items), "resultsPerPage": size}
+        }
+        if start + size < len(items):
+            page["nextPageToken"] = str(start + size)
+        return page
+    
+    def _search_list(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        channel_ids = self.fixtures["searches"].get(params.get("q", ""), [])
+        items = []
+        for channel_id in channel_ids:
+            snippet = self.fixtures["channels"][channel_id]["snippet"]
+            items.append({
+                "kind": "youtube#searchResult",
+                "id": {"kind": "youtube#channel", "channelId": channel_id},
+                "snippet": {
+                    "channelId": channel_id,
+                    "title": snippet["title"],
+                    "description": snippet["description"][:160],
+                    "thumbnails": snippet["thumbnails"]
+                }
+            })
+        return self._page(items, params)
+    
+    def _channels_list(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        channels = self.fixtures["channels"]
+        ids = params.get("id", "").split(",")
+        return {"items": [channels[channel_id] for channel_id in ids if channel_id in channels]}
+    
+    def _videos_list(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        videos = self.fixtures["videos"]
+        if params.get("chart") == "mostPopular":
+            video_ids = self.fixtures["charts"].get(str(params.get("videoCategoryId", "")), [])
+            return self._page([videos[video_id] for video_id in video_ids], params)
+        
+        ids = params.get("id", "").split(",")
+        return {"items": [videos[video_id] for video_id in ids if video_id in videos]}
+    
+    def _playlist_items_list(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return self._page(self.fixtures["playlists"].get(params.get("playlistId", ""), []), params)
+
+def _random_id(rng: random.Random, length: int) -> str:
+    return "".join(rng.choices(string.ascii_letters + string.digits + "-_", k=length))
+
+def synthetic_fixtures(
+    queries: List[str],
+    channels_per_query: int = 100,
+    videos_per_channel: int = 15,
+    shared_share: float = 0.1,
+    tamil_share: float = 0.9,
+    chart_size: int = 50,
+    seed: int = 42
+) -> Dict[str, Any]:
+    """
+    Build synthetic fixtures for OfflineYouTube.
+    
+    Args:
+        queries: Search queries to serve (e.g. the collector's categories)
+        channels_per_query: Number of channels returned by each search
+        videos_per_channel: Number of uploads per channel
+        shared_share: Share of each search's channels that also appear in other searches
+        tamil_share: Share of channels with Tamil titles and descriptions
+        chart_size: Number of videos in each mostPopular chart
+        seed: Random seed
+    
+    Returns:
+        Fixtures dictionary
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    fixtures = {"channels": {}, "videos": {}, "searches": {}, "playlists": {}, "charts": {}}
+    
+    def iso(moment: datetime) -> str:
+        return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+    
+    def make_video(channel_id: str, channel_title: str, category_id: str) -> Dict[str, Any]:
+        video_id = _random_id(rng, 11)
+        views = int(rng.lognormvariate(9, 2))
+        video = {
+            "kind": "youtube#video",
+            "etag": _random_id(rng, 27),
+            "id": video_id,
+            "snippet": {
+                "publishedAt": iso(now - timedelta(hours=rng.randint(1, 24 * 180))),
+                "channelId": channel_id,
+                "channelTitle": channel_title,
+                "title": " ".join(rng.choices(SYNTHETIC_WORDS, k=6)),
+                "description": " ".join(rng.choices(SYNTHETIC_WORDS, k=30)),
+                "tags": rng.sample(SYNTHETIC_WORDS, 4),
+                "categoryId": category_id,
+                "thumbnails": {"high": {"url": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"}}
+            },
+            "contentDetails": {"duration": f"PT{rng.randint(1, 30)}M{rng.randint(0, 59)}S"},
+            "statistics": {
+                "viewCount": str(views),
+                "likeCount": str(int(views * rng.uniform(0.01, 0.08))),
+                "commentCount": str(int(views * rng.uniform(0.001, 0.01)))
+            }
+        }
+        fixtures["videos"][video_id] = video
+        return video
+    
+    def make_channel() -> str:
+        channel_id = "UC" + _random_id(rng, 22)
+        tamil = rng.random() < tamil_share
+        words = SYNTHETIC_WORDS if tamil else [word for word in SYNTHETIC_WORDS if word.isascii() and word != "tamil"]
+        title = " ".join(rng.choices(words, k=2)).title()
+        description = " ".join(rng.choices(words, k=rng.randint(20, 120)))
+        if rng.random() < 0.4:
+            description += f"\nFor business: {channel_id[2:10].lower()}@gmail.com"
+        if rng.random() < 0.3:
+            description += f"\nhttps://www.instagram.com/{channel_id[2:12].lower()}"
+        
+        subscribers = int(rng.lognormvariate(10, 1.8))
+        fixtures["channels"][channel_id] = {
+            "kind": "youtube#channel",
+            "etag": _random_id(rng, 27),
+            "id": channel_id,
+            "snippet": {
+                "title": title,
+                "description": description,
+                "publishedAt": iso(now - timedelta(days=rng.randint(30, 3650))),
+                "thumbnails": {"high": {"url": f"https://yt3.ggpht.com/{channel_id}"}}
+            },
+            "contentDetails": {"relatedPlaylists": {"uploads": "UU" + channel_id[2:]}},
+            "statistics": {
+                "subscriberCount": str(subscribers),
+                "videoCount": str(videos_per_channel),
+                "viewCount": str(subscribers * rng.randint(20, 200)),
+                "hiddenSubscriberCount": False
+            },
+            "brandingSettings": {"channel": {"country": "IN" if tamil or rng.random() < 0.5 else "US"}}
+        }
+        
+        uploads = sorted(
+            (make_video(channel_id, title, rng.choice(["10", "22", "24", "26"])) for _ in range(videos_per_channel)),
+            key=lambda video: video["snippet"]["publishedAt"],
+            reverse=True
+        )
+        fixtures["playlists"]["UU" + channel_id[2:]] = [
+            {
+                "kind": "youtube#playlistItem",
+                "snippet": {"title": video["snippet"]["title"], "publishedAt": video["snippet"]["publishedAt"]},
+                "contentDetails": {"videoId": video["id"], "videoPublishedAt": video["snippet"]["publishedAt"]}
+            }
+            for video in uploads
+        ]
+        return channel_id
+    
+    shared_pool = [make_channel() for _ in range(max(1, int(channels_per_query * shared_share)))]
+    for query in queries:
+        results = rng.sample(shared_pool, min(len(shared_pool), int(channels_per_query * shared_share)))
+        results += [make_channel() for _ in range(channels_per_query - len(results))]
+        rng.shuffle(results)
+        fixtures["searches"][query] = results
+    
+    all_videos = list(fixtures["videos"].values())
+    for category_id in ["", "10"]:
+        candidates = [video for video in all_videos if not category_id or video["snippet"]["categoryId"] == category_id]
+        chart = sorted(candidates, key=lambda video: int(video["statistics"]["viewCount"]), reverse=True)[:chart_size]
+        fixtures["charts"][category_id] = [video["id"] for video in chart]
+    
+    return fixtures
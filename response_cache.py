@@ -0,0 +1,194 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+
+class ResponseCache:
+    """
+    Persistent key/value cache for API responses, stored in SQLite.
+    
+    Entries expire after a per-entry TTL and the least recently used entries
+    are evicted once the cache grows past its size cap. The file can be
+    shared by several threads and processes.
+    
+    The total size of the entries is kept up to date by triggers, so a write
+    only scans entries by last access when the cache is over its cap.
+    """
+    
+    def __init__(self, path: str, max_bytes: int = 200 * 1024 * 1024, default_ttl: int = 3600):
+        """
+        Initialize the cache.
+        
+        Args:
+            path: Path of the SQLite file
+            max_bytes: Maximum total size of the stored values in bytes
+            default_ttl: TTL in seconds used when set() is not given one
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self._thread_local = threading.local()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        with self._connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries (last_access)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_expires_at ON entries (expires_at)")
+            
+            # Running total of the entry sizes (a single row, seeded from caches created without it)
+            conn.execute("CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO totals (id, bytes) SELECT 0, COALESCE(SUM(size), 0) FROM entries")
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries
+                BEGIN UPDATE totals SET bytes = bytes + NEW.size WHERE id = 0; END
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries
+                BEGIN UPDATE totals SET bytes = bytes - OLD.size WHERE id = 0; END
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries
+                BEGIN UPDATE totals SET bytes = bytes - OLD.size + NEW.size WHERE id = 0; END
+            """)
+    
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections can't be shared between threads, so each thread opens its own
+        conn = getattr(self._thread_local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._thread_local.conn = conn
+        return conn
+    
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Build a cache key from JSON-serializable parts.
+        
+        Args:
+            *parts: Parts identifying the cached value (e.g. endpoint and parameters)
+        
+        Returns:
+            Hex digest of the parts
+        """
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            The cached value or None if it is missing or expired
+        """
+        now = time.time()
+        
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT value FROM entries WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row:
+                conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+        
+        with self.lock:
+            if row:
+                self.hits += 1
+            else:
+                self.misses += 1
+        
+        if not row:
+            return None
+        
+        return json.loads(zlib.decompress(row[0]).decode("utf-8"))
+    
+    def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        """
+        Store a value.
+        
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            ttl: Time to live in seconds (default: default_ttl)
+        """
+        now = time.time()
+        blob = zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        
+        with self._connection() as conn:
+            # An upsert rather than INSERT OR REPLACE, whose implicit delete would not fire the size trigger
+            conn.execute(
+                """
+                INSERT INTO entries (key, value, size, expires_at, last_access) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    value = excluded.value, size = excluded.size,
+                    expires_at = excluded.expires_at, last_access = excluded.last_access
+                """,
+                (key, blob, len(blob), now + (ttl if ttl is not None else self.default_ttl), now)
+            )
+        
+        self._evict()
+    
+    def _evict(self):
+        """
+        Drop expired entries, then least recently used ones until the cache
+        is back under 90% of its size cap. Both deletes walk an index, and
+        the second only runs when the running total is over the cap.
+        """
+        with self._connection() as conn:
+            conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+            total_bytes = conn.execute("SELECT bytes FROM totals WHERE id = 0").fetchone()[0]
+            if total_bytes <= self.max_bytes:
+                return
+            
+            excess = total_bytes - int(self.max_bytes * 0.9)
+            freed = 0
+            evicted = []
+            for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_access"):
+                evicted.append((key,))
+                freed += size
+                if freed >= excess:
+                    break
+            conn.executemany("DELETE FROM entries WHERE key = ?", evicted)
+    
+    def clear(self):
+        """
+        Remove every entry.
+        """
+        with self._connection() as conn:
+            conn.execute("DELETE FROM entries")
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss counters of this process and the size of the cache.
+        """
+        with self._connection() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            total_bytes = conn.execute("SELECT bytes FROM totals WHERE id = 0").fetchone()[0]
+        
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+            "bytes": total_bytes
+        }
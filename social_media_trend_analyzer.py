@@ -12,9 +12,10 @@ from collections import Counter
 from wordcloud import WordCloud
 import requests
 from dotenv import load_dotenv
-import googleapiclient.discovery
 import googleapiclient.errors
 
+from youtube_api import execute_request, get_youtube
+
 # Load environment variables
 load_dotenv()
 
@@ -22,11 +23,6 @@ load_dotenv()
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 INSTAGRAM_ACCESS_TOKEN = os.getenv("INSTAGRAM_ACCESS_TOKEN")
 
-# Initialize YouTube API client if key is available
-youtube = None
-if YOUTUBE_API_KEY:
-    youtube = googleapiclient.discovery.build("youtube", "v3", developerKey=YOUTUBE_API_KEY)
-
 class SocialMediaTrendAnalyzer:
     """
     A class to analyze trends across different social media platforms.
@@ -60,7 +56,7 @@ class SocialMediaTrendAnalyzer:
         Returns:
             List of trending videos
         """
-        if not youtube:
+        if not YOUTUBE_API_KEY:
             print("YouTube API key not found. Skipping YouTube trend analysis.")
             return []
         
@@ -77,8 +73,8 @@ class SocialMediaTrendAnalyzer:
             if category_id:
                 request_params["videoCategoryId"] = category_id
             
-            request = youtube.videos().list(**request_params)
-            response = request.execute()
+            request = get_youtube().videos().list(**request_params)
+            response = execute_request(request)
             
             # Process and return the results
             videos = []
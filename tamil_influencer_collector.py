@@ -1,15 +1,34 @@
 import os
 import json
-import time
-import re
-from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
+import gzip
+import math
+import bisect
+import heapq
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from datetime import datetime, timedelta, timezone
+from itertools import groupby
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 
-import googleapiclient.discovery
 import googleapiclient.errors
 from dotenv import load_dotenv
 import pymongo
-from pymongo import MongoClient
+from pymongo import MongoClient, ReplaceOne, UpdateOne
+
+from contact_extractor import CONTACT_INFO_FIELDS, extract_contacts, extract_contacts_batch
+from language_scoring import TAMIL_SCORE_THRESHOLD, combine_tamil_score, score_tamil_channels, score_tamil_texts
+from video_metrics import channel_video_metrics
+from youtube_api import (
+    QUOTA_COSTS,
+    Backoff,
+    QuotaBudgetExceeded,
+    describe_http_error,
+    execute_request,
+    get_quota_budget,
+    get_response_cache,
+    get_youtube,
+    is_retryable
+)
 
 # Add this class to handle datetime serialization
 class DateTimeEncoder(json.JSONEncoder):
@@ -21,24 +40,14 @@ class DateTimeEncoder(json.JSONEncoder):
 # Load environment variables from .env file
 load_dotenv()
 
-# Get API key from environment variable
-API_KEY = os.getenv("YOUTUBE_API_KEY")
-if not API_KEY:
-    raise ValueError("YouTube API key not found. Please add it to your .env file as YOUTUBE_API_KEY=your_key_here")
-
-# Initialize YouTube API client
-youtube = googleapiclient.discovery.build("youtube", "v3", developerKey=API_KEY)
-
-# Initialize MongoDB client
+# MongoDB connection settings; the client is created on first use
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/")
-client = MongoClient(MONGO_URI)
-db = client["tamil_influencers"]
-influencers_collection = db["influencers"]
+MONGO_DATABASE = os.getenv("MONGO_DATABASE", "tamil_influencers")
 
-# Create indexes for faster queries
-influencers_collection.create_index([("channelId", pymongo.ASCENDING)], unique=True)
-influencers_collection.create_index([("categories", pymongo.ASCENDING)])
-influencers_collection.create_index([("subscriberCount", pymongo.DESCENDING)])
+_influencers_collection = None
+_history_collection = None
+_videos_collection = None
+_mongo_lock = threading.Lock()
 
 # Tamil categories to search for
 CATEGORIES = [
@@ -59,472 +68,2286 @@ CATEGORIES = [
     "Tamil motivation"
 ]
 
-def search_channels(category: str, max_results: int = 10) -> List[Dict[str, Any]]:
+# Maximum number of IDs accepted by a single channels.list call
+CHANNELS_PER_REQUEST = 50
+
+# Maximum number of IDs accepted by a single videos.list call, and the number
+# of recent videos used to calculate engagement
+VIDEOS_PER_REQUEST = 50
+RECENT_VIDEOS = 10
+
+# Cost model used to plan collection runs: channels returned per search page
+# (the API maximum, a page costs the same whatever its size), default search
+# pages per category, and units needed for one channel's engagement
+CHANNELS_PER_SEARCH_PAGE = 50
+SEARCH_PAGES_PER_CATEGORY = 1
+ENGAGEMENT_UNITS_PER_CHANNEL = (
+    QUOTA_COSTS["youtube.playlistItems.list"]
+    + QUOTA_COSTS["youtube.videos.list"] * RECENT_VIDEOS / VIDEOS_PER_REQUEST
+)
+
+# Number of buffered writes sent per bulk_write call, and number of
+# documents fetched per cursor batch when exporting
+BULK_WRITE_BATCH_SIZE = 500
+EXPORT_BATCH_SIZE = 1000
+
+# Number of descriptions extracted at a time by --reextract-contacts
+CONTACT_REEXTRACT_BATCH_SIZE = 20000
+# Number of influencers scored at a time by --rescore-tamil
+TAMIL_RESCORE_BATCH_SIZE = 20000
+# Number of stored videos read at a time by --recompute-metrics
+VIDEO_METRICS_BATCH_SIZE = 50000
+
+# Checkpoint of the running collection, used by --resume
+CHECKPOINT_FILE = os.getenv("COLLECTOR_CHECKPOINT_FILE", "collection_checkpoint.json")
+
+# Number of worker threads used by the collection pipeline
+MAX_WORKERS = int(os.getenv("COLLECTOR_MAX_WORKERS", "8"))
+
+# Each pipeline stage backs off on its own, so a quota error only pauses that stage
+SEARCH_BACKOFF = Backoff("search")
+DETAILS_BACKOFF = Backoff("details")
+ENGAGEMENT_BACKOFF = Backoff("engagement")
+REFRESH_BACKOFF = Backoff("refresh")
+
+# Records older than this are refreshed by --refresh, and the statistics
+# fields a refresh re-fetches
+REFRESH_MAX_AGE_DAYS = 7
+REFRESH_FIELDS = ("subscriberCount", "videoCount", "viewCount")
+
+# Time-series collection holding a statistics point per channel per refresh,
+# how long points are kept, and the windows growth rates are computed over
+HISTORY_COLLECTION = "influencer_history"
+HISTORY_FIELDS = ("subscriberCount", "viewCount", "videoCount", "avgViewsPerVideo")
+HISTORY_RETENTION_DAYS = 400
+GROWTH_WINDOWS_DAYS = (7, 30)
+GROWTH_FIELDS = {"subscriberCount": "subscriberGrowth", "viewCount": "viewGrowth"}
+
+# How far back the baseline of a growth window may lie, in windows (older
+# points are too stale to stand for the start of the window)
+GROWTH_BASELINE_MAX_WINDOWS = 3
+
+# Collection holding the statistics of each channel's recent videos, keyed
+# by video ID, from which the engagement metrics can be recomputed offline
+VIDEOS_COLLECTION = "influencer_videos"
+
+# Fields influencers can be ranked by
+SORT_FIELDS = ["subscriberCount"] + [
+    f"{prefix}{days}d" for days in GROWTH_WINDOWS_DAYS for prefix in GROWTH_FIELDS.values()
+]
+
+# Subscriber buckets reported by the stats (keyed by lower bound) and the
+# contact fields whose availability is counted
+SUBSCRIBER_BUCKET_BOUNDARIES = [0, 10000, 50000, 100000, 500000, 1000000]
+SUBSCRIBER_BUCKET_LABELS = {
+    0: "<10K",
+    10000: "10K-50K",
+    50000: "50K-100K",
+    100000: "100K-500K",
+    500000: "500K-1M",
+    1000000: "1M+"
+}
+CONTACT_FIELDS = {
+    "email": "contactEmail",
+    "businessEmail": "businessEmail",
+    "phone": "contactPhone",
+    "instagram": "socialLinks.instagram"
+}
+
+def get_influencers_collection():
+    """
+    Get the MongoDB influencers collection, connecting on first use.
+    
+    Returns:
+        The influencers collection
+    """
+    global _influencers_collection
+    
+    if _influencers_collection is None:
+        with _mongo_lock:
+            if _influencers_collection is None:
+                client = MongoClient(MONGO_URI)
+                _influencers_collection = client[MONGO_DATABASE]["influencers"]
+    
+    return _influencers_collection
+
+def get_history_collection():
+    """
+    Get the MongoDB influencer history collection, connecting on first use.
+    
+    Returns:
+        The history collection
+    """
+    global _history_collection
+    
+    if _history_collection is None:
+        database = get_influencers_collection().database
+        with _mongo_lock:
+            if _history_collection is None:
+                _history_collection = database[HISTORY_COLLECTION]
+    
+    return _history_collection
+
+def get_videos_collection():
+    """
+    Get the MongoDB influencer videos collection, connecting on first use.
+    
+    Returns:
+        The videos collection
+    """
+    global _videos_collection
+    
+    if _videos_collection is None:
+        database = get_influencers_collection().database
+        with _mongo_lock:
+            if _videos_collection is None:
+                _videos_collection = database[VIDEOS_COLLECTION]
+    
+    return _videos_collection
+
+def ensure_history_collection():
+    """
+    Create the history collection as a time-series collection (MongoDB 5.0+),
+    falling back to a regular collection on servers without time-series support.
+    """
+    database = get_influencers_collection().database
+    if HISTORY_COLLECTION in database.list_collection_names():
+        return
+    
+    try:
+        database.create_collection(
+            HISTORY_COLLECTION,
+            timeseries={"timeField": "timestamp", "metaField": "channelId", "granularity": "hours"},
+            expireAfterSeconds=HISTORY_RETENTION_DAYS * 24 * 3600
+        )
+    except pymongo.errors.CollectionInvalid:
+        pass
+    except pymongo.errors.OperationFailure as e:
+        print(f"Time-series collections not supported ({e}), using a regular collection for history")
+        database.create_collection(HISTORY_COLLECTION)
+
+def ensure_indexes():
+    """
+    Create the indexes used by the collector and the queries.
+    Run once before collecting (the CLI does this for --collect and --refresh).
+    """
+    influencers_collection = get_influencers_collection()
+    
+    # Create indexes for faster queries
+    influencers_collection.create_index([("channelId", pymongo.ASCENDING)], unique=True)
+    influencers_collection.create_index([("categories", pymongo.ASCENDING)])
+    influencers_collection.create_index([("subscriberCount", pymongo.DESCENDING)])
+    for field in SORT_FIELDS[1:]:
+        influencers_collection.create_index([(field, pymongo.DESCENDING)])
+    
+    ensure_history_collection()
+    get_history_collection().create_index([("channelId", pymongo.ASCENDING), ("timestamp", pymongo.DESCENDING)])
+    get_videos_collection().create_index([("channelId", pymongo.ASCENDING), ("publishedAt", pymongo.DESCENDING)])
+
+def search_channel_page(
+    category: str,
+    max_results: int = CHANNELS_PER_SEARCH_PAGE,
+    page_token: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Fetch one page of channel search results for a category.
+    Errors are raised to the caller.
+    
+    Args:
+        category: The category to search for
+        max_results: Maximum number of results on the page
+        page_token: Token of the page to fetch (default: the first page)
+    
+    Returns:
+        Search response, including the nextPageToken if there are more pages
+    """
+    print(f"Searching for channels in category: {category}")
+    request = get_youtube().search().list(
+        part="snippet",
+        q=category,
+        type="channel",
+        relevanceLanguage="ta",  # Tamil language code
+        maxResults=max_results,
+        order="viewCount",  # Order by view count to get popular channels first
+        pageToken=page_token
+    )
+    response = execute_request(request, backoff=SEARCH_BACKOFF)
+    
+    print(f"Found {len(response.get('items', []))} channels for category: {category}")
+    return response
+
+def search_channels(category: str, max_results: int = 10) -> List[Dict[str, Any]]:
+    """
+    Search for YouTube channels based on a category.
+    
+    Args:
+        category: The category to search for
+        max_results: Maximum number of results to return (default: 10 to limit API usage)
+    
+    Returns:
+        List of channel items
+    """
+    try:
+        return search_channel_page(category, max_results=max_results).get("items", [])
+    
+    except googleapiclient.errors.HttpError as e:
+        print(f"YouTube API error: {describe_http_error(e)}")
+        return []
+    
+    except Exception as e:
+        print(f"Error searching channels for {category}: {str(e)}")
+        return []
+
+def get_channel_details(channel_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get detailed information about a YouTube channel.
+    
+    Args:
+        channel_id: The ID of the channel
+    
+    Returns:
+        Channel details or None if not found
+    """
+    return get_channel_details_batch([channel_id]).get(channel_id)
+
+def _fetch_channel_batch(
+    channel_ids: List[str],
+    part: str = "snippet,statistics,contentDetails,brandingSettings",
+    backoff: Backoff = DETAILS_BACKOFF,
+    use_cache: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Fetch up to CHANNELS_PER_REQUEST channels with a single channels.list call.
+    
+    Args:
+        channel_ids: The IDs of the channels (at most CHANNELS_PER_REQUEST)
+        part: Resource parts to fetch
+        backoff: Backoff of the calling stage
+        use_cache: Whether a cached response may be used
+    
+    Returns:
+        List of channel items returned by the API
+    
+    Raises:
+        QuotaBudgetExceeded: If the quota budget does not cover the request
+        googleapiclient.errors.HttpError: If the request kept failing with a
+            transient error after all retries (the channels can be fetched later)
+    """
+    try:
+        request = get_youtube().channels().list(
+            part=part,
+            id=",".join(channel_ids),
+            maxResults=CHANNELS_PER_REQUEST
+        )
+        response = execute_request(request, backoff=backoff, use_cache=use_cache)
+        
+        return response.get("items", [])
+    
+    except QuotaBudgetExceeded:
+        raise
+    
+    except googleapiclient.errors.HttpError as e:
+        if is_retryable(e):
+            raise
+        print(f"YouTube API error: {describe_http_error(e)}")
+        return []
+    
+    except Exception as e:
+        print(f"Error getting channel details for {len(channel_ids)} channels: {str(e)}")
+        return []
+
+def get_channel_details_batch(channel_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Get detailed information about many YouTube channels.
+    
+    The IDs are sent CHANNELS_PER_REQUEST at a time, so each chunk costs one
+    round trip and one quota unit instead of one per channel.
+    
+    Args:
+        channel_ids: The IDs of the channels (duplicates are ignored)
+    
+    Returns:
+        Dictionary mapping channel ID to channel details. Channels the API
+        did not return are missing from the dictionary.
+    
+    Raises:
+        QuotaBudgetExceeded: If the quota budget does not cover the requests
+        googleapiclient.errors.HttpError: If a request kept failing with a transient error
+    """
+    unique_ids = list(dict.fromkeys(channel_ids))
+    details = {}
+    
+    for start in range(0, len(unique_ids), CHANNELS_PER_REQUEST):
+        batch = unique_ids[start:start + CHANNELS_PER_REQUEST]
+        for item in _fetch_channel_batch(batch):
+            details[item["id"]] = item
+    
+    return details
+
+def get_uploads_playlist_id(channel_details: Dict[str, Any]) -> str:
+    """
+    Get the ID of the playlist holding all uploads of a channel.
+    
+    Args:
+        channel_details: Channel details from YouTube API (only "id" is required)
+    
+    Returns:
+        Uploads playlist ID
+    """
+    uploads = channel_details.get("contentDetails", {}).get("relatedPlaylists", {}).get("uploads")
+    if uploads:
+        return uploads
+    
+    # The uploads playlist of channel "UCxyz" is always "UUxyz"
+    return "UU" + channel_details["id"][2:]
+
+def parse_api_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a YouTube API timestamp (e.g. "2024-01-31T18:30:00Z").
+    
+    Args:
+        value: ISO 8601 timestamp
+    
+    Returns:
+        Naive UTC datetime (as MongoDB returns them), or None if missing
+    """
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).astimezone(timezone.utc).replace(tzinfo=None)
+
+def get_recent_videos(playlist_id: str, max_results: int = RECENT_VIDEOS) -> List[Dict[str, Any]]:
+    """
+    Get the most recent videos in a playlist with their publish times.
+    Costs 1 quota unit, compared to 100 for a search.list call.
+    
+    Args:
+        playlist_id: The ID of the playlist (usually a channel's uploads playlist)
+        max_results: Maximum number of videos to return
+    
+    Returns:
+        List of dictionaries with the videoId and publishedAt, newest first
+    
+    Raises:
+        QuotaBudgetExceeded: If the quota budget does not cover the request
+    """
+    try:
+        request = get_youtube().playlistItems().list(
+            part="contentDetails",
+            playlistId=playlist_id,
+            maxResults=max_results
+        )
+        response = execute_request(request, backoff=ENGAGEMENT_BACKOFF)
+        
+        return [
+            {
+                "videoId": item["contentDetails"]["videoId"],
+                "publishedAt": parse_api_timestamp(item["contentDetails"].get("videoPublishedAt"))
+            }
+            for item in response.get("items", [])
+        ]
+    
+    except googleapiclient.errors.HttpError as e:
+        # Channels without uploads have no uploads playlist (404)
+        if e.resp.status != 404:
+            print(f"YouTube API error: {describe_http_error(e)}")
+        return []
+
+def get_recent_video_ids(playlist_id: str, max_results: int = RECENT_VIDEOS) -> List[str]:
+    """
+    Get the IDs of the most recent videos in a playlist.
+    
+    Args:
+        playlist_id: The ID of the playlist (usually a channel's uploads playlist)
+        max_results: Maximum number of video IDs to return
+    
+    Returns:
+        List of video IDs, newest first
+    
+    Raises:
+        QuotaBudgetExceeded: If the quota budget does not cover the request
+    """
+    return [video["videoId"] for video in get_recent_videos(playlist_id, max_results)]
+
+def get_video_statistics_batch(video_ids: List[str], executor: Optional[ThreadPoolExecutor] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Get statistics for many videos with one videos.list call per 50 IDs.
+    
+    Args:
+        video_ids: The IDs of the videos
+        executor: Thread pool to send the batches concurrently (optional)
+    
+    Returns:
+        Dictionary mapping video ID to its statistics
+    
+    Raises:
+        QuotaBudgetExceeded: If the quota budget does not cover the requests
+    """
+    def fetch_batch(batch: List[str]) -> List[Dict[str, Any]]:
+        try:
+            request = get_youtube().videos().list(
+                part="statistics",
+                id=",".join(batch),
+                maxResults=VIDEOS_PER_REQUEST
+            )
+            return execute_request(request, backoff=ENGAGEMENT_BACKOFF).get("items", [])
+        except googleapiclient.errors.HttpError as e:
+            print(f"YouTube API error: {describe_http_error(e)}")
+            return []
+    
+    unique_ids = list(dict.fromkeys(video_ids))
+    batches = [unique_ids[start:start + VIDEOS_PER_REQUEST] for start in range(0, len(unique_ids), VIDEOS_PER_REQUEST)]
+    results = executor.map(fetch_batch, batches) if executor else map(fetch_batch, batches)
+    
+    return {
+        video["id"]: video.get("statistics", {})
+        for items in results
+        for video in items
+    }
+
+def fetch_recent_videos(
+    channel_details_by_id: Dict[str, Dict[str, Any]],
+    executor: Optional[ThreadPoolExecutor] = None,
+    recent_videos: Optional[Dict[str, List[Dict[str, Any]]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fetch the statistics of the recent videos of many channels.
+    
+    Recent videos are read from each channel's uploads playlist (1 unit per
+    channel) and the statistics of all channels' videos are fetched together
+    in shared 50-ID videos.list batches.
+    
+    Args:
+        channel_details_by_id: Channel details from YouTube API keyed by channel ID
+        executor: Thread pool to send the requests concurrently (optional)
+        recent_videos: Recent videos (see get_recent_videos) already read,
+            keyed by channel ID. Uploads playlists read here are added to
+            it, so the caller keeps them if the quota budget runs out midway
+    
+    Returns:
+        Video documents (see video_document); videos whose statistics were
+        not returned are left out
+    
+    Raises:
+        QuotaBudgetExceeded: If the quota budget does not cover the requests
+    """
+    recent_videos = {} if recent_videos is None else recent_videos
+    unread_channel_ids = [channel_id for channel_id in channel_details_by_id if channel_id not in recent_videos]
+    
+    def read_uploads(channel_id: str):
+        recent_videos[channel_id] = get_recent_videos(get_uploads_playlist_id(channel_details_by_id[channel_id]))
+    
+    if executor:
+        futures = [executor.submit(read_uploads, channel_id) for channel_id in unread_channel_ids]
+        # Let every read finish before a refusal is raised, so none of the paid ones is lost
+        wait(futures)
+        for future in futures:
+            future.result()
+    else:
+        for channel_id in unread_channel_ids:
+            read_uploads(channel_id)
+    
+    channel_videos = [(channel_id, recent_videos[channel_id]) for channel_id in channel_details_by_id]
+    video_statistics = get_video_statistics_batch(
+        [video["videoId"] for _, videos in channel_videos for video in videos],
+        executor=executor
+    )
+    
+    fetched_at = datetime.now()
+    return [
+        video_document(channel_id, video, video_statistics[video["videoId"]], fetched_at)
+        for channel_id, videos in channel_videos
+        for video in videos
+        if video["videoId"] in video_statistics
+    ]
+
+def video_document(
+    channel_id: str,
+    video: Dict[str, Any],
+    statistics: Dict[str, Any],
+    fetched_at: datetime
+) -> Dict[str, Any]:
+    """
+    Build the compact video document stored in the videos collection.
+    
+    Args:
+        channel_id: The ID of the channel that uploaded the video
+        video: The video's videoId and publishedAt (see get_recent_videos)
+        statistics: The video's statistics from the YouTube API
+        fetched_at: Time the statistics were fetched
+    
+    Returns:
+        Video document keyed by video ID
+    """
+    return {
+        "_id": video["videoId"],
+        "channelId": channel_id,
+        "publishedAt": video["publishedAt"],
+        "views": int(statistics.get("viewCount", 0)),
+        "likes": int(statistics.get("likeCount", 0)),
+        "comments": int(statistics.get("commentCount", 0)),
+        "fetchedAt": fetched_at
+    }
+
+def store_videos(videos: List[Dict[str, Any]]):
+    """
+    Upsert video documents into the videos collection in one bulk write.
+    
+    Args:
+        videos: Video documents (see video_document)
+    """
+    if videos:
+        get_videos_collection().bulk_write(
+            [ReplaceOne({"_id": video["_id"]}, video, upsert=True) for video in videos],
+            ordered=False
+        )
+
+def calculate_engagement_rates(
+    channel_details_by_id: Dict[str, Dict[str, Any]],
+    executor: Optional[ThreadPoolExecutor] = None
+) -> Dict[str, Tuple[float, int]]:
+    """
+    Calculate engagement rate and average views per video for many channels.
+    
+    Args:
+        channel_details_by_id: Channel details from YouTube API keyed by channel ID
+        executor: Thread pool to send the requests concurrently (optional)
+    
+    Returns:
+        Dictionary mapping channel ID to (engagement_rate, avg_views_per_video)
+    
+    Raises:
+        QuotaBudgetExceeded: If the quota budget does not cover the calculation
+    """
+    metrics = channel_video_metrics(fetch_recent_videos(channel_details_by_id, executor), channel_details_by_id)
+    
+    return {
+        channel_id: (fields["engagementRate"], fields["avgViewsPerVideo"])
+        for channel_id, fields in metrics.items()
+    }
+
+def calculate_engagement_rate(channel_id: str) -> Tuple[float, int]:
+    """
+    Calculate engagement rate and average views per video for a channel.
+    
+    Args:
+        channel_id: The ID of the channel
+    
+    Returns:
+        Tuple of (engagement_rate, avg_views_per_video)
+    
+    Raises:
+        QuotaBudgetExceeded: If the quota budget does not cover the calculation
+    """
+    try:
+        return calculate_engagement_rates({channel_id: {"id": channel_id}})[channel_id]
+    
+    except QuotaBudgetExceeded:
+        raise
+    
+    except Exception as e:
+        print(f"Error calculating engagement for {channel_id}: {str(e)}")
+        return 0.0, 0
+
+def extract_contact_info(description: str) -> Dict[str, Optional[str]]:
+    """
+    Extract contact information from channel description.
+    Patterns are precompiled and prefiltered (see contact_extractor).
+    
+    Args:
+        description: Channel description text
+    
+    Returns:
+        Dictionary with contact information
+    """
+    return extract_contacts(description)
+
+def contact_fields(contact_info: Dict[str, Optional[str]]) -> Dict[str, Any]:
+    """
+    Map extracted contact information to the fields of an influencer document.
+    
+    Args:
+        contact_info: Contact information from extract_contact_info
+    
+    Returns:
+        Dictionary with the contact fields of the influencer document
+    """
+    return {
+        "contactEmail": contact_info["email"],
+        "businessEmail": contact_info["business_email"],
+        "contactPhone": contact_info["phone"],
+        "socialLinks": {
+            "instagram": contact_info["instagram"],
+            "twitter": contact_info["twitter"],
+            "facebook": contact_info["facebook"]
+        }
+    }
+
+def is_tamil_content(channel_details: Dict[str, Any]) -> bool:
+    """
+    Check if a channel contains Tamil content.
+    Use score_tamil_channels to classify many channels at once.
+    
+    Args:
+        channel_details: Channel details from YouTube API
+    
+    Returns:
+        True if the channel's Tamil score reaches TAMIL_SCORE_THRESHOLD
+    """
+    return bool(score_tamil_channels([channel_details])["score"][0] >= TAMIL_SCORE_THRESHOLD)
+
+def tamil_score_fields(tamil_scores: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map a channel's Tamil scores to the fields of an influencer document.
+    
+    Args:
+        tamil_scores: The channel's scriptShare, keywordHits and score
+    
+    Returns:
+        Dictionary with the Tamil score fields of the influencer document
+    """
+    return {
+        "tamilScore": round(float(tamil_scores["score"]), 4),
+        "tamilScriptShare": round(float(tamil_scores["scriptShare"]), 4),
+        "tamilKeywordHits": int(tamil_scores["keywordHits"])
+    }
+
+def build_influencer_record(
+    channel_id: str,
+    channel_details: Dict[str, Any],
+    categories: List[str],
+    engagement_rate: float,
+    avg_views: int,
+    tamil_scores: Optional[Dict[str, Any]] = None,
+    video_metrics: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Build the influencer document stored in MongoDB.
+    
+    Args:
+        channel_id: The ID of the channel
+        channel_details: Channel details from YouTube API
+        categories: Categories the channel was found in
+        engagement_rate: Engagement rate of the channel's recent videos
+        avg_views: Average views per recent video
+        tamil_scores: The channel's scriptShare, keywordHits and score
+            (see score_tamil_channels; computed here if not given)
+        video_metrics: Further metrics of the channel's recent videos
+            (see video_metrics.channel_video_metrics)
+    
+    Returns:
+        Influencer document
+    """
+    snippet = channel_details["snippet"]
+    statistics = channel_details["statistics"]
+    
+    # Extract contact information from description
+    description = snippet["description"]
+    contact_info = extract_contact_info(description)
+    
+    if tamil_scores is None:
+        tamil_scores = {field: values[0] for field, values in score_tamil_channels([channel_details]).items()}
+    
+    return {
+        "channelId": channel_id,
+        "channelTitle": snippet["title"],
+        "description": description,
+        "thumbnailUrl": snippet["thumbnails"]["high"]["url"],
+        "subscriberCount": int(statistics.get("subscriberCount", 0)),
+        "videoCount": int(statistics.get("videoCount", 0)),
+        "viewCount": int(statistics.get("viewCount", 0)),
+        "categories": list(categories),
+        **contact_fields(contact_info),
+        "language": "Tamil",
+        **tamil_score_fields(tamil_scores),
+        **(video_metrics or {}),
+        "engagementRate": engagement_rate,
+        "avgViewsPerVideo": avg_views,
+        "createdAt": datetime.now(),
+        "lastUpdated": datetime.now()
+    }
+
+class InfluencerWriter:
+    """
+    Buffers influencer writes and flushes them as unordered bulk upserts.
+    
+    New records are upserted by channelId: categories are merged with
+    $addToSet, stats and profile fields are overwritten with $set and
+    createdAt is only written on insert.
+    """
+    
+    def __init__(self, collection=None, batch_size: int = BULK_WRITE_BATCH_SIZE):
+        """
+        Initialize the writer.
+        
+        Args:
+            collection: MongoDB collection to write to (default: the influencers collection)
+            batch_size: Number of buffered writes that triggers a flush
+        """
+        self.collection = collection if collection is not None else get_influencers_collection()
+        self.batch_size = batch_size
+        self.operations = []
+        self.totals = {"inserted": 0, "updated": 0, "duplicates": 0}
+        self.lock = threading.Lock()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+    
+    def _add(self, operation: UpdateOne):
+        with self.lock:
+            self.operations.append(operation)
+            should_flush = len(self.operations) >= self.batch_size
+        
+        if should_flush:
+            self.flush()
+    
+    def add(self, influencer: Dict[str, Any]):
+        """
+        Buffer an upsert of a full influencer record.
+        
+        Args:
+            influencer: Influencer document (see build_influencer_record)
+        """
+        fields = {
+            key: value for key, value in influencer.items()
+            if key not in ("channelId", "categories", "createdAt")
+        }
+        fields["lastUpdated"] = datetime.now()
+        
+        self._add(UpdateOne(
+            {"channelId": influencer["channelId"]},
+            {"$set": fields,
+             "$setOnInsert": {"createdAt": influencer.get("createdAt", datetime.now())},
+             "$addToSet": {"categories": {"$each": influencer.get("categories", [])}}},
+            upsert=True
+        ))
+    
+    def add_categories(self, channel_id: str, categories: List[str]):
+        """
+        Buffer adding categories to an existing influencer.
+        
+        Args:
+            channel_id: The ID of the channel
+            categories: Categories to add
+        """
+        self._add(UpdateOne(
+            {"channelId": channel_id},
+            {"$addToSet": {"categories": {"$each": categories}},
+             "$set": {"lastUpdated": datetime.now()}}
+        ))
+    
+    def update_fields(self, channel_id: str, fields: Dict[str, Any]):
+        """
+        Buffer setting fields of an existing influencer.
+        
+        Args:
+            channel_id: The ID of the channel
+            fields: Fields to set
+        """
+        self._add(UpdateOne({"channelId": channel_id}, {"$set": fields}))
+    
+    def flush(self) -> Dict[str, int]:
+        """
+        Write all buffered operations with one unordered bulk_write.
+        
+        Returns:
+            Dictionary with the inserted, updated and duplicate counts of this flush
+        """
+        with self.lock:
+            operations, self.operations = self.operations, []
+        
+        counts = {"inserted": 0, "updated": 0, "duplicates": 0}
+        if not operations:
+            return counts
+        
+        try:
+            result = self.collection.bulk_write(operations, ordered=False)
+            counts["inserted"] = result.upserted_count
+            counts["updated"] = result.modified_count
+        except pymongo.errors.BulkWriteError as e:
+            # Concurrent upserts of the same channelId can race on the unique index
+            details = e.details
+            counts["inserted"] = details.get("nUpserted", 0)
+            counts["updated"] = details.get("nModified", 0)
+            counts["duplicates"] = sum(1 for error in details.get("writeErrors", []) if error.get("code") == 11000)
+            
+            other_errors = [error for error in details.get("writeErrors", []) if error.get("code") != 11000]
+            for error in other_errors:
+                print(f"Write error: {error.get('errmsg')}")
+        
+        with self.lock:
+            for key, value in counts.items():
+                self.totals[key] += value
+        
+        print(f"Flushed {len(operations)} writes: {counts['inserted']} inserted, "
+              f"{counts['updated']} updated, {counts['duplicates']} duplicates")
+        return counts
+
+class CollectionCheckpoint:
+    """
+    Persists the progress of a collection run to a local JSON file, so an
+    interrupted run can be continued with --resume without paying for the
+    same API calls again.
+    
+    The checkpoint holds the run's plan, the number of search pages read
+    and the next page token of every category, the channels discovered but
+    not written yet (with their title and categories), and the channels
+    already processed. Pending and processed channels are how discovery
+    dedupes channels found on several pages or in several categories: a
+    processed channel is never fetched again, and if it was saved, a newly
+    found category is queued as a category update instead.
+    
+    The processed channels only grow during a run, so they are appended to
+    a log next to the checkpoint (one JSON line per change) instead of
+    being rewritten with the rest of the state on every save.
+    """
+    
+    def __init__(self, path: str = CHECKPOINT_FILE):
+        """
+        Initialize the checkpoint.
+        
+        Args:
+            path: JSON file the checkpoint is persisted to
+        """
+        self.path = path
+        self.processed_path = f"{path}.processed"
+        self.lock = threading.Lock()
+        self.state = None
+        # Channel ID -> saved categories, or None if the channel was not saved
+        self.processed: Dict[str, Optional[List[str]]] = {}
+    
+    def load(self) -> bool:
+        """
+        Load the checkpoint of an unfinished run.
+        
+        Returns:
+            True if there was a checkpoint to load
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+        
+        # Checkpoints written before processed channels were logged kept them in the state
+        self.processed = self.state.pop("processedChannels", {})
+        self.state.setdefault("pendingCategories", {})
+        if self.processed:
+            self._log_processed(self.processed.items())
+        
+        try:
+            with open(self.processed_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        channel_id, categories = json.loads(line)
+                    except ValueError:
+                        # A line cut short by a crash; its batch is still pending
+                        continue
+                    self.processed[channel_id] = categories
+        except FileNotFoundError:
+            pass
+        
+        # Channels logged as processed just before a crash may still be pending in the state
+        for channel_id in self.processed:
+            self.state["pendingChannels"].pop(channel_id, None)
+        return True
+    
+    def start(self, plan: Dict[str, Any]):
+        """
+        Start a new checkpoint, replacing any previous one.
+        
+        Args:
+            plan: Plan of the run (see plan_collection)
+        """
+        self.state = {
+            "startedAt": datetime.now().isoformat(),
+            "plan": plan,
+            "searches": {},
+            "pendingChannels": {},
+            "pendingCategories": {}
+        }
+        self.processed = {}
+        with open(self.processed_path, "w", encoding="utf-8"):
+            pass
+        self.save()
+    
+    def save(self):
+        """
+        Write the checkpoint atomically.
+        """
+        with self.lock:
+            self.state["updatedAt"] = datetime.now().isoformat()
+            tmp_file = f"{self.path}.tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(self.state, f, separators=(",", ":"), ensure_ascii=False)
+            os.replace(tmp_file, self.path)
+    
+    def _log_processed(self, entries: Iterable[Tuple[str, Optional[List[str]]]]):
+        # Append (channel ID, saved categories) entries; the last entry of a channel wins on load
+        with open(self.processed_path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps([channel_id, categories], ensure_ascii=False) + "\n" for channel_id, categories in entries)
+    
+    def clear(self):
+        """
+        Remove the checkpoint once the run is complete.
+        """
+        self.state = None
+        self.processed = {}
+        for path in (self.path, self.processed_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+    
+    @property
+    def plan(self) -> Dict[str, Any]:
+        return self.state["plan"]
+    
+    def search_cursor(self, category: str) -> Tuple[int, Optional[str]]:
+        """
+        Get where the search of a category stands.
+        
+        Args:
+            category: The category
+        
+        Returns:
+            Tuple of (pages read, token of the next page)
+        """
+        search = self.state["searches"].get(category, {})
+        return search.get("pages", 0), search.get("nextPageToken")
+    
+    def record_page(self, category: str, response: Dict[str, Any]) -> List[str]:
+        """
+        Record a page of search results and save the checkpoint.
+        
+        Channels seen for the first time are added to the pending channels.
+        For pending channels only the category is added. For processed
+        channels that were saved, a new category is queued as a category
+        update (see category_updates); other processed channels are skipped.
+        
+        Args:
+            category: The category that was searched
+            response: Search response of the page
+        
+        Returns:
+            IDs of the channels that were added to the pending channels
+        """
+        new_channel_ids = []
+        with self.lock:
+            search = self.state["searches"].setdefault(category, {"pages": 0})
+            search["pages"] += 1
+            search["nextPageToken"] = response.get("nextPageToken")
+            
+            pending = self.state["pendingChannels"]
+            processed = self.processed
+            recategorized = []
+            for item in response.get("items", []):
+                channel_id = item["id"]["channelId"]
+                channel = pending.get(channel_id)
+                if channel is not None:
+                    if category not in channel["categories"]:
+                        channel["categories"].append(category)
+                elif channel_id in processed:
+                    # Saved categories, or None if the channel was not saved
+                    saved_categories = processed[channel_id]
+                    if saved_categories is not None and category not in saved_categories:
+                        saved_categories.append(category)
+                        self.state["pendingCategories"].setdefault(channel_id, []).append(category)
+                        recategorized.append((channel_id, saved_categories))
+                else:
+                    pending[channel_id] = {"title": item["snippet"]["title"], "categories": [category]}
+                    new_channel_ids.append(channel_id)
+            
+            if recategorized:
+                self._log_processed(recategorized)
+        
+        self.save()
+        return new_channel_ids
+    
+    def pending_channel_ids(self) -> List[str]:
+        """
+        Get the channels that were discovered but not written yet.
+        """
+        with self.lock:
+            return list(self.state["pendingChannels"])
+    
+    def pending_channel(self, channel_id: str) -> Dict[str, Any]:
+        """
+        Get the title and categories of a pending channel.
+        
+        Args:
+            channel_id: The ID of the channel
+        """
+        with self.lock:
+            channel = self.state["pendingChannels"][channel_id]
+            return {"title": channel["title"], "categories": list(channel["categories"])}
+    
+    def keep_fetched(
+        self,
+        channel_details_by_id: Dict[str, Dict[str, Any]],
+        recent_videos: Dict[str, List[Dict[str, Any]]]
+    ):
+        """
+        Keep the details and recent videos already fetched for pending
+        channels whose batch was deferred, so resuming does not pay for
+        them again, and save the checkpoint.
+        
+        Args:
+            channel_details_by_id: Channel details from YouTube API keyed by channel ID
+            recent_videos: Recent videos (see get_recent_videos) read so far, keyed by channel ID
+        """
+        with self.lock:
+            for channel_id, channel_details in channel_details_by_id.items():
+                channel = self.state["pendingChannels"][channel_id]
+                channel["details"] = channel_details
+                if channel_id in recent_videos:
+                    channel["recentVideos"] = [
+                        {
+                            "videoId": video["videoId"],
+                            "publishedAt": video["publishedAt"].isoformat() if video["publishedAt"] else None
+                        }
+                        for video in recent_videos[channel_id]
+                    ]
+        self.save()
+    
+    def fetched_details(self, channel_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the details kept for pending channels (see keep_fetched).
+        
+        Args:
+            channel_ids: IDs of pending channels
+        
+        Returns:
+            Channel details keyed by channel ID, for the channels that have them
+        """
+        with self.lock:
+            pending = self.state["pendingChannels"]
+            return {
+                channel_id: pending[channel_id]["details"]
+                for channel_id in channel_ids if "details" in pending.get(channel_id, {})
+            }
+    
+    def fetched_recent_videos(self, channel_ids: Iterable[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get the recent videos kept for pending channels (see keep_fetched).
+        
+        Args:
+            channel_ids: IDs of pending channels
+        
+        Returns:
+            Recent videos keyed by channel ID, for the channels that have them
+        """
+        with self.lock:
+            pending = self.state["pendingChannels"]
+            return {
+                channel_id: [
+                    {
+                        "videoId": video["videoId"],
+                        "publishedAt": datetime.fromisoformat(video["publishedAt"]) if video["publishedAt"] else None
+                    }
+                    for video in pending[channel_id]["recentVideos"]
+                ]
+                for channel_id in channel_ids if "recentVideos" in pending.get(channel_id, {})
+            }
+    
+    def complete(self, channel_ids: List[str], saved_channel_ids: Optional[Iterable[str]] = None):
+        """
+        Mark channels as processed and save the checkpoint. Their records
+        must already be flushed to MongoDB.
+        
+        Args:
+            channel_ids: IDs of the processed channels
+            saved_channel_ids: Those of the channels that are in MongoDB
+                (default: all of them); the others were skipped or not found
+        """
+        saved = set(channel_ids if saved_channel_ids is None else saved_channel_ids)
+        with self.lock:
+            completed = []
+            for channel_id in channel_ids:
+                channel = self.state["pendingChannels"].pop(channel_id, None)
+                if channel is not None:
+                    self.processed[channel_id] = channel["categories"] if channel_id in saved else None
+                    completed.append((channel_id, self.processed[channel_id]))
+            # Logged before the state is saved, so a crash in between leaves them processed
+            if completed:
+                self._log_processed(completed)
+        self.save()
+    
+    def category_updates(self) -> Dict[str, List[str]]:
+        """
+        Get the categories found for saved channels after they were processed.
+        
+        Returns:
+            Dictionary mapping channel ID to the categories to add
+        """
+        with self.lock:
+            return {channel_id: list(categories) for channel_id, categories in self.state["pendingCategories"].items()}
+    
+    def categories_applied(self, channel_ids: Iterable[str]):
+        """
+        Remove category updates once they are flushed to MongoDB and save the checkpoint.
+        
+        Args:
+            channel_ids: IDs of the channels whose updates were applied
+        """
+        with self.lock:
+            for channel_id in channel_ids:
+                self.state["pendingCategories"].pop(channel_id, None)
+        self.save()
+    
+    def is_finished(self) -> bool:
+        """
+        Check whether every planned search page was read (or the results ran
+        out) and every discovered channel was processed.
+        """
+        for category in self.plan["categories"]:
+            pages, next_page_token = self.search_cursor(category)
+            if pages < self.plan["pagesPerCategory"] and (pages == 0 or next_page_token):
+                return False
+        return not self.state["pendingChannels"] and not self.state["pendingCategories"]
+
+def _search_and_record(category: str, page_token: Optional[str], checkpoint: CollectionCheckpoint) -> List[str]:
+    # Runs in the search worker: the page is checkpointed the moment the paid search returns
+    response = search_channel_page(category, max_results=CHANNELS_PER_SEARCH_PAGE, page_token=page_token)
+    return checkpoint.record_page(category, response)
+
+def discover_channels(
+    executor: ThreadPoolExecutor,
+    categories: List[str],
+    max_pages: int,
+    checkpoint: CollectionCheckpoint
+) -> Iterator[str]:
+    """
+    Lazily discover channels by paging through the search results of the
+    given categories, up to max_pages pages per category.
+    
+    Pages are read round by round: the next page of every category is
+    fetched concurrently, then its channels are yielded before the next
+    round is requested, so only one round of pages is held at a time.
+    Each page is recorded in the checkpoint by the search worker as soon as
+    it returns, so a paid search is never lost, and the checkpoint
+    continues a category from its next page token on resume. Channels
+    already pending or processed (found on an earlier page or in another
+    category) are not yielded again.
+    
+    Args:
+        executor: Thread pool running the pipeline
+        categories: Categories to search
+        max_pages: Maximum number of search pages per category
+        checkpoint: Checkpoint of the run
+    
+    Yields:
+        IDs of newly discovered channels
+    """
+    for depth in range(max_pages):
+        round_futures = []
+        for category in categories:
+            pages, next_page_token = checkpoint.search_cursor(category)
+            # Search categories that reached this depth and still have results
+            if pages == depth and (depth == 0 or next_page_token):
+                round_futures.append((category, executor.submit(
+                    _search_and_record, category, next_page_token, checkpoint
+                )))
+        
+        # On resume, categories can already be past this depth
+        for category, future in round_futures:
+            try:
+                new_channel_ids = future.result()
+            except QuotaBudgetExceeded as e:
+                print(f"Stopping the search of {category}: {str(e)}")
+                continue
+            except googleapiclient.errors.HttpError as e:
+                print(f"YouTube API error: {describe_http_error(e)}")
+                continue
+            except Exception as e:
+                print(f"Error searching channels for {category}: {str(e)}")
+                continue
+            
+            yield from new_channel_ids
+
+def _split_existing_channels(
+    channel_ids: List[str],
+    checkpoint: CollectionCheckpoint,
+    writer: InfluencerWriter
+) -> List[str]:
+    """
+    Add newly found categories to the channels that are already in the
+    database and mark them as processed.
+    
+    Args:
+        channel_ids: IDs of pending channels
+        checkpoint: Checkpoint of the run holding the channels' categories
+        writer: Writer buffering the category updates
+    
+    Returns:
+        IDs of the channels that are not in the database yet
+    """
+    influencers_collection = get_influencers_collection()
+    
+    existing_channels = {
+        doc["channelId"]: doc
+        for doc in influencers_collection.find(
+            {"channelId": {"$in": channel_ids}},
+            {"_id": 0, "channelId": 1, "categories": 1}
+        )
+    }
+    
+    new_channel_ids = []
+    for channel_id in channel_ids:
+        existing_channel = existing_channels.get(channel_id)
+        
+        if not existing_channel:
+            new_channel_ids.append(channel_id)
+            continue
+        
+        channel = checkpoint.pending_channel(channel_id)
+        print(f"Channel {channel['title']} already exists, updating categories...")
+        
+        missing_categories = [
+            category for category in channel["categories"]
+            if category not in existing_channel.get("categories", [])
+        ]
+        if missing_categories:
+            writer.add_categories(channel_id, missing_categories)
+    
+    if len(new_channel_ids) < len(channel_ids):
+        writer.flush()
+        checkpoint.complete([channel_id for channel_id in channel_ids if channel_id in existing_channels])
+    
+    return new_channel_ids
+
+def estimate_collection_units(num_categories: int, pages_per_category: int) -> int:
+    """
+    Estimate the quota units a collection run will spend.
+    This is an upper bound: it assumes every channel found is new and Tamil.
+    
+    Args:
+        num_categories: Number of categories to search
+        pages_per_category: Number of search pages per category
+    
+    Returns:
+        Estimated quota units
+    """
+    searches = num_categories * pages_per_category
+    channels = searches * CHANNELS_PER_SEARCH_PAGE
+    
+    return (
+        searches * QUOTA_COSTS["youtube.search.list"]
+        + math.ceil(channels / CHANNELS_PER_REQUEST) * QUOTA_COSTS["youtube.channels.list"]
+        + math.ceil(channels * ENGAGEMENT_UNITS_PER_CHANNEL)
+    )
+
+def plan_collection(budget_units: int, max_pages: int = SEARCH_PAGES_PER_CATEGORY) -> Dict[str, Any]:
+    """
+    Pick how many categories and search pages a collection run can afford.
+    
+    Every category gets searched before any category gets extra pages.
+    Categories deferred by the previous run are scheduled first, so a
+    small budget works through the whole catalogue over several days.
+    
+    Args:
+        budget_units: Quota units available to the run
+        max_pages: Maximum number of search pages per category
+    
+    Returns:
+        Dictionary with the planned and deferred categories, pages per
+        category and the estimated cost
+    """
+    last_run = get_quota_budget().last_run("collect")
+    previously_deferred = last_run.get("plan", {}).get("deferredCategories", []) if last_run else []
+    categories = [c for c in previously_deferred if c in CATEGORIES]
+    categories += [c for c in CATEGORIES if c not in categories]
+    
+    num_categories, pages = 0, 0
+    for pages_per_category in range(max_pages, 0, -1):
+        if estimate_collection_units(len(categories), pages_per_category) <= budget_units:
+            num_categories, pages = len(categories), pages_per_category
+            break
+    else:
+        # Not even one page for every category: run as many categories as fit
+        while num_categories < len(categories) and \
+                estimate_collection_units(num_categories + 1, 1) <= budget_units:
+            num_categories += 1
+        pages = 1 if num_categories else 0
+    
+    return {
+        "budgetUnits": budget_units,
+        "categories": categories[:num_categories],
+        "deferredCategories": categories[num_categories:],
+        "pagesPerCategory": pages,
+        "estimatedUnits": estimate_collection_units(num_categories, pages)
+    }
+
+def plan_refresh(budget_units: int, num_stale: int) -> Dict[str, Any]:
+    """
+    Pick how many stale channels a refresh run can afford.
+    Statistics are fetched CHANNELS_PER_REQUEST channels per unit.
+    
+    Args:
+        budget_units: Quota units available to the run
+        num_stale: Number of channels due for a refresh
+    
+    Returns:
+        Dictionary with the number of planned and deferred channels and the estimated cost
+    """
+    affordable = (budget_units // QUOTA_COSTS["youtube.channels.list"]) * CHANNELS_PER_REQUEST
+    channels = min(num_stale, affordable)
+    
+    return {
+        "budgetUnits": budget_units,
+        "channels": channels,
+        "deferredChannels": num_stale - channels,
+        "estimatedUnits": math.ceil(channels / CHANNELS_PER_REQUEST) * QUOTA_COSTS["youtube.channels.list"]
+    }
+
+def collect_influencer_data(
+    max_workers: int = MAX_WORKERS,
+    budget: Optional[int] = None,
+    resume: bool = False,
+    max_pages: int = SEARCH_PAGES_PER_CATEGORY
+):
+    """
+    Main function to collect Tamil YouTube influencer data.
+    
+    Runs as a streaming pipeline on a thread pool: channels discovered by
+    discover_channels are grouped into channels.list batches as they
+    arrive, and each detail batch flows into the batched engagement stage
+    as soon as it returns. Records are saved through an InfluencerWriter
+    with bulk upserts. Requests are paced by the shared rate limiter in
+    youtube_api instead of fixed sleeps.
+    
+    The run is planned against the remaining quota budget; categories that
+    do not fit are deferred to the next run.
+    
+    Progress is checkpointed to CHECKPOINT_FILE after every search page and
+    every saved detail batch. With resume, the run continues from the
+    checkpoint of an unfinished run instead of planning a new one.
+    
+    Args:
+        max_workers: Number of worker threads
+        budget: Maximum quota units the run may spend (default: the rest of today's quota)
+        resume: Whether to continue the unfinished run recorded in the checkpoint
+        max_pages: Maximum number of search pages per category
+    """
+    print(f"Starting Tamil YouTube influencer data collection "
+          f"(up to {max_pages * CHANNELS_PER_SEARCH_PAGE} channels per category)...")
+    
+    budget_units = get_quota_budget().remaining()
+    if budget is not None:
+        budget_units = min(budget, budget_units)
+    
+    checkpoint = CollectionCheckpoint()
+    if resume and checkpoint.load():
+        plan = checkpoint.plan
+        print(f"Resuming the run started at {checkpoint.state['startedAt']}: "
+              f"{len(checkpoint.state['searches'])} of {len(plan['categories'])} categories searched, "
+              f"{len(checkpoint.pending_channel_ids())} channels pending")
+    else:
+        if resume:
+            print("No checkpoint to resume from, starting a new run")
+        elif os.path.exists(checkpoint.path):
+            print("Discarding the checkpoint of an unfinished run (use --resume to continue it)")
+        
+        plan = plan_collection(budget_units, max_pages=max_pages)
+        if not plan["categories"]:
+            print(f"Not enough quota for a collection run ({budget_units} units available). "
+                  f"Deferring all categories to the next run.")
+            return
+        
+        print(f"Planned {len(plan['categories'])} categories with {plan['pagesPerCategory']} search pages each "
+              f"for an estimated {plan['estimatedUnits']} of {budget_units} available quota units")
+        if plan["deferredCategories"]:
+            print(f"Deferring to the next run: {', '.join(plan['deferredCategories'])}")
+        
+        checkpoint.start(plan)
+    
+    get_quota_budget().start_run(run_limit=budget_units)
+    
+    discovered = 0
+    new_channels = 0
+    missing_channels = 0
+    deferred_channels = 0
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor, InfluencerWriter() as writer:
+        detail_futures = {}
+        
+        def fetch_details(channel_ids):
+            # Details kept from a batch deferred by an earlier run are not paid for again
+            kept = checkpoint.fetched_details(channel_ids)
+            unfetched_ids = [channel_id for channel_id in channel_ids if channel_id not in kept]
+            return list(kept.values()) + (_fetch_channel_batch(unfetched_ids) if unfetched_ids else [])
+        
+        def submit_batch(channel_ids):
+            nonlocal new_channels
+            new_channel_ids = _split_existing_channels(channel_ids, checkpoint, writer)
+            if new_channel_ids:
+                new_channels += len(new_channel_ids)
+                detail_futures[executor.submit(fetch_details, new_channel_ids)] = new_channel_ids
+        
+        def process_batch(future):
+            # Fetch the recent videos of the batch's Tamil channels with shared
+            # videos.list batches and save their records and video statistics
+            nonlocal missing_channels, deferred_channels
+            channel_ids = detail_futures.pop(future)
+            try:
+                batch = future.result()
+            except (QuotaBudgetExceeded, googleapiclient.errors.HttpError) as e:
+                # Refused by the budget or still failing after all retries:
+                # the batch stays pending in the checkpoint for the next --resume
+                print(f"Deferring details of {len(channel_ids)} channels: {e}")
+                deferred_channels += len(channel_ids)
+                return
+            
+            # Score the whole batch for Tamil content in one vectorized call
+            scores = score_tamil_channels(batch)
+            
+            tamil_channels = {}
+            tamil_scores = {}
+            for index, channel_details in enumerate(batch):
+                channel_id = channel_details["id"]
+                
+                if scores["score"][index] < TAMIL_SCORE_THRESHOLD:
+                    print(f"Skipping non-Tamil channel: {channel_details['snippet']['title']}")
+                    continue
+                
+                tamil_channels[channel_id] = channel_details
+                tamil_scores[channel_id] = {field: values[index] for field, values in scores.items()}
+            
+            found_channel_ids = {channel_details["id"] for channel_details in batch}
+            for channel_id in channel_ids:
+                if channel_id not in found_channel_ids:
+                    missing_channels += 1
+                    print(f"Could not get details for channel {checkpoint.pending_channel(channel_id)['title']}")
+            
+            recent_videos = checkpoint.fetched_recent_videos(tamil_channels)
+            try:
+                videos = fetch_recent_videos(tamil_channels, executor=executor, recent_videos=recent_videos)
+            except QuotaBudgetExceeded:
+                # The Tamil channels stay pending for the next --resume with what
+                # was already paid for; the others need nothing more
+                checkpoint.keep_fetched(tamil_channels, recent_videos)
+                checkpoint.complete(
+                    [channel_id for channel_id in channel_ids if channel_id not in tamil_channels],
+                    saved_channel_ids=()
+                )
+                deferred_channels += len(tamil_channels)
+                return
+            
+            # All metrics of the batch come from one vectorized pass over its videos
+            metrics = channel_video_metrics(videos, tamil_channels)
+            
+            points = []
+            for channel_id, channel_details in tamil_channels.items():
+                record = build_influencer_record(
+                    channel_id,
+                    channel_details,
+                    checkpoint.pending_channel(channel_id)["categories"],
+                    metrics[channel_id]["engagementRate"],
+                    metrics[channel_id]["avgViewsPerVideo"],
+                    tamil_scores[channel_id],
+                    metrics[channel_id]
+                )
+                writer.add(record)
+                points.append(history_point(channel_id, record, record["lastUpdated"]))
+            
+            # Only mark the batch done once its records are in MongoDB
+            writer.flush()
+            store_videos(videos)
+            append_history(points)
+            checkpoint.complete(channel_ids, saved_channel_ids=tamil_channels)
+        
+        # Channels left pending by an interrupted run go first
+        pending_batch = checkpoint.pending_channel_ids()
+        if pending_batch:
+            print(f"\nProcessing {len(pending_batch)} channels pending from the previous run")
+        
+        for channel_id in discover_channels(executor, plan["categories"], plan["pagesPerCategory"], checkpoint):
+            discovered += 1
+            pending_batch.append(channel_id)
+            
+            while len(pending_batch) >= CHANNELS_PER_REQUEST:
+                submit_batch(pending_batch[:CHANNELS_PER_REQUEST])
+                pending_batch = pending_batch[CHANNELS_PER_REQUEST:]
+            
+            # Save the batches that already came back while discovery goes on
+            for future in [future for future in detail_futures if future.done()]:
+                process_batch(future)
+        
+        for start in range(0, len(pending_batch), CHANNELS_PER_REQUEST):
+            submit_batch(pending_batch[start:start + CHANNELS_PER_REQUEST])
+        
+        for future in as_completed(list(detail_futures)):
+            process_batch(future)
+        
+        # Categories found for channels saved earlier in the run
+        category_updates = checkpoint.category_updates()
+        if category_updates:
+            for channel_id, categories in category_updates.items():
+                writer.add_categories(channel_id, categories)
+            writer.flush()
+            checkpoint.categories_applied(category_updates)
+            print(f"Added newly found categories to {len(category_updates)} influencers saved earlier in the run")
+    
+    print(f"\nDiscovered {discovered} channels across {len(plan['categories'])} categories; "
+          f"fetched details for {new_channels} channels not in the database yet")
+    if missing_channels:
+        print(f"Could not get details for {missing_channels} channels")
+    if deferred_channels:
+        print(f"\nQuota budget exhausted: deferred {deferred_channels} channels to the next run")
+    
+    if checkpoint.is_finished():
+        checkpoint.clear()
+    else:
+        print(f"\nRun incomplete: progress saved to {checkpoint.path}, continue it with --resume")
+    
+    run = get_quota_budget().finish_run("collect", plan=plan, writes=writer.totals)
+    print(f"\nData collection complete! Saved {writer.totals['inserted']} new and "
+          f"updated {writer.totals['updated']} influencers.")
+    print(f"Spent {run['units']} quota units (estimated {plan['estimatedUnits']}).")
+    response_cache = get_response_cache()
+    if response_cache is not None:
+        cache_stats = response_cache.stats()
+        print(f"API response cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+
+def history_point(channel_id: str, fields: Dict[str, Any], timestamp: datetime) -> Dict[str, Any]:
     """
-    Search for YouTube channels based on a category.
+    Build a history point from an influencer's statistics.
     
     Args:
-        category: The category to search for
-        max_results: Maximum number of results to return (default: 10 to limit API usage)
-        
+        channel_id: The ID of the channel
+        fields: Influencer fields holding the statistics (missing ones are left out)
+        timestamp: Time of the point
+    
     Returns:
-        List of channel items
+        History document
     """
-    try:
-        print(f"Searching for channels in category: {category}")
-        request = youtube.search().list(
-            part="snippet",
-            q=category,
-            type="channel",
-            relevanceLanguage="ta",  # Tamil language code
-            maxResults=max_results,
-            order="viewCount"  # Order by view count to get popular channels first
-        )
-        response = request.execute()
-        
-        print(f"Found {len(response.get('items', []))} channels for category: {category}")
-        return response.get("items", [])
-    
-    except googleapiclient.errors.HttpError as e:
-        error_details = json.loads(e.content)
-        print(f"YouTube API error: {error_details.get('error', {}).get('message', 'Unknown error')}")
-        
-        if "quota" in str(e).lower():
-            print("API quota exceeded. Waiting for 1 hour before retrying...")
-            time.sleep(3600)  # Wait for 1 hour
-            return search_channels(category, max_results)
-        
-        return []
+    point = {"channelId": channel_id, "timestamp": timestamp}
+    point.update({field: fields[field] for field in HISTORY_FIELDS if fields.get(field) is not None})
+    return point
+
+def append_history(points: List[Dict[str, Any]]):
+    """
+    Append statistics points to the history collection in one bulk insert.
     
-    except Exception as e:
-        print(f"Error searching channels for {category}: {str(e)}")
-        return []
+    Args:
+        points: History documents (see history_point)
+    """
+    if points:
+        get_history_collection().insert_many(points, ordered=False)
 
-def get_channel_details(channel_id: str) -> Optional[Dict[str, Any]]:
+def window_growth(points: List[Dict[str, Any]], field: str, days: int, now: datetime) -> Optional[float]:
     """
-    Get detailed information about a YouTube channel.
+    Compute the growth of a statistics field over a window from a channel's history.
+    
+    The newest point is compared with a baseline: the newest point at least
+    `days` older than it (and at most GROWTH_BASELINE_MAX_WINDOWS windows
+    older). The relative change is divided by the real time between the two
+    points and scaled to the window, so channels refreshed at different
+    intervals get comparable values.
     
     Args:
-        channel_id: The ID of the channel
-        
+        points: History points of the channel, oldest first
+        field: Statistics field (e.g. "subscriberCount")
+        days: Window length in days
+        now: Current time; the newest point must lie inside the window before it
+    
     Returns:
-        Channel details or None if not found
+        Relative change per `days` days, or None if the newest point is
+        older than the window or there is no baseline
     """
-    try:
-        request = youtube.channels().list(
-            part="snippet,statistics,contentDetails,brandingSettings",
-            id=channel_id
-        )
-        response = request.execute()
-        
-        if not response.get("items"):
-            return None
-        
-        return response["items"][0]
+    values = [(point["timestamp"], point[field]) for point in points if point.get(field) is not None]
+    if len(values) < 2:
+        return None
     
-    except googleapiclient.errors.HttpError as e:
-        error_details = json.loads(e.content)
-        print(f"YouTube API error: {error_details.get('error', {}).get('message', 'Unknown error')}")
-        
-        if "quota" in str(e).lower():
-            print("API quota exceeded. Waiting for 1 hour before retrying...")
-            time.sleep(3600)  # Wait for 1 hour
-            return get_channel_details(channel_id)
-        
+    end_at, end_value = values[-1]
+    if now - end_at > timedelta(days=days):
         return None
     
-    except Exception as e:
-        print(f"Error getting channel details for {channel_id}: {str(e)}")
+    baseline = None
+    for timestamp, value in values[:-1]:
+        elapsed = end_at - timestamp
+        if elapsed > timedelta(days=days * GROWTH_BASELINE_MAX_WINDOWS):
+            continue
+        if elapsed < timedelta(days=days):
+            break
+        baseline = (timestamp, value)
+    
+    if baseline is None or not baseline[1]:
         return None
+    
+    elapsed_days = (end_at - baseline[0]).total_seconds() / 86400
+    return round((end_value - baseline[1]) / baseline[1] * days / elapsed_days, 4)
 
-def calculate_engagement_rate(channel_id: str) -> Tuple[float, int]:
+def update_growth_rates(channel_ids: Optional[List[str]] = None):
     """
-    Calculate engagement rate and average views per video for a channel.
+    Precompute subscriber and view growth rates from the history and store
+    them on the influencer documents, so they can be ranked by growth
+    without reading the history.
+    
+    See window_growth for how a window's growth is computed. Points are
+    spaced by the refresh interval, so a window only gets a value once the
+    history holds points at least a window apart.
     
     Args:
-        channel_id: The ID of the channel
-        
-    Returns:
-        Tuple of (engagement_rate, avg_views_per_video)
+        channel_ids: Channels to update (default: every channel with history)
     """
-    try:
-        # Get channel's recent videos
-        videos_request = youtube.search().list(
-            part="id",
-            channelId=channel_id,
-            order="date",
-            type="video",
-            maxResults=10
-        )
-        videos_response = videos_request.execute()
-        
-        if not videos_response.get("items"):
-            return 0.0, 0
-        
-        video_ids = [item["id"]["videoId"] for item in videos_response["items"]]
-        
-        # Get video statistics
-        video_stats_request = youtube.videos().list(
-            part="statistics",
-            id=",".join(video_ids)
-        )
-        video_stats_response = video_stats_request.execute()
-        
-        # Calculate average engagement
-        total_likes = 0
-        total_comments = 0
-        total_views = 0
-        
-        for video in video_stats_response.get("items", []):
-            stats = video.get("statistics", {})
-            total_likes += int(stats.get("likeCount", 0))
-            total_comments += int(stats.get("commentCount", 0))
-            total_views += int(stats.get("viewCount", 0))
-        
-        video_count = len(video_stats_response.get("items", []))
-        
-        if video_count == 0 or total_views == 0:
-            return 0.0, 0
-        
-        avg_views = total_views / video_count
-        
-        # Engagement rate = (likes + comments) / views * 100
-        engagement_rate = ((total_likes + total_comments) / total_views) * 100
-        
-        return round(engagement_rate, 2), round(avg_views)
+    history_collection = get_history_collection()
+    now = datetime.now()
     
-    except googleapiclient.errors.HttpError as e:
-        error_details = json.loads(e.content)
-        print(f"YouTube API error: {error_details.get('error', {}).get('message', 'Unknown error')}")
-        
-        if "quota" in str(e).lower():
-            print("API quota exceeded. Waiting for 1 hour before retrying...")  # Wait for 1 hour
-            return calculate_engagement_rate(channel_id)
-        
-        return 0.0, 0
+    match = {"timestamp": {"$gte": now - timedelta(days=max(GROWTH_WINDOWS_DAYS) * (GROWTH_BASELINE_MAX_WINDOWS + 1))}}
+    if channel_ids is not None:
+        match["channelId"] = {"$in": channel_ids}
+    projection = {"_id": 0, "channelId": 1, "timestamp": 1, **{field: 1 for field in GROWTH_FIELDS}}
+    cursor = history_collection.find(match, projection).sort(
+        [("channelId", pymongo.ASCENDING), ("timestamp", pymongo.ASCENDING)]
+    )
     
-    except Exception as e:
-        print(f"Error calculating engagement for {channel_id}: {str(e)}")
-        return 0.0, 0
+    growth: Dict[str, Dict[str, Any]] = {channel_id: {} for channel_id in channel_ids or ()}
+    for channel_id, points in groupby(cursor, key=lambda point: point["channelId"]):
+        points = list(points)
+        growth[channel_id] = {
+            f"{prefix}{days}d": window_growth(points, field, days, now)
+            for days in GROWTH_WINDOWS_DAYS
+            for field, prefix in GROWTH_FIELDS.items()
+        }
+    
+    with InfluencerWriter() as writer:
+        for channel_id, rates in growth.items():
+            fields = {field: rates.get(field) for field in SORT_FIELDS[1:]}
+            writer.update_fields(channel_id, {**fields, "growthUpdatedAt": now})
+    
+    print(f"Updated growth rates of {len(growth)} influencers")
 
-def extract_contact_info(description: str) -> Dict[str, Optional[str]]:
+def refresh_influencer_stats(
+    max_age_days: int = REFRESH_MAX_AGE_DAYS,
+    max_workers: int = MAX_WORKERS,
+    budget: Optional[int] = None
+):
     """
-    Extract contact information from channel description.
+    Refresh the statistics of influencers that have not been updated recently.
+    
+    Only the statistics part is re-fetched (bypassing the response cache),
+    50 channels per unit. Each item's
+    ETag is stored, so channels whose ETag did not change are only marked as
+    checked, and for the others only the fields that changed are written back.
     
     Args:
-        description: Channel description text
-        
-    Returns:
-        Dictionary with contact information
+        max_age_days: Refresh records whose lastUpdated is older than this
+        max_workers: Number of worker threads
+        budget: Maximum quota units the run may spend (default: the rest of today's quota)
     """
-    contact_info = {
-        "email": None,
-        "phone": None,
-        "instagram": None,
-        "twitter": None,
-        "facebook": None,
-        "business_email": None
+    influencers_collection = get_influencers_collection()
+    
+    cutoff = datetime.now() - timedelta(days=max_age_days)
+    stale_query = {"lastUpdated": {"$lt": cutoff}}
+    
+    budget_units = get_quota_budget().remaining()
+    if budget is not None:
+        budget_units = min(budget, budget_units)
+    
+    plan = plan_refresh(budget_units, influencers_collection.count_documents(stale_query))
+    print(f"Refreshing {plan['channels']} influencers not updated since {cutoff:%Y-%m-%d} "
+          f"(estimated {plan['estimatedUnits']} quota units)")
+    if plan["deferredChannels"]:
+        print(f"Deferring {plan['deferredChannels']} stale influencers to the next run")
+    if not plan["channels"]:
+        return
+    
+    # Oldest records first, so deferred channels are picked up by the next run
+    stale_records = {
+        doc["channelId"]: doc
+        for doc in influencers_collection.find(
+            stale_query,
+            {"_id": 0, "channelId": 1, "statisticsEtag": 1, **{field: 1 for field in HISTORY_FIELDS}}
+        )
+        .sort("lastUpdated", pymongo.ASCENDING)
+        .limit(plan["channels"])
     }
+    channel_ids = list(stale_records)
+    batches = [channel_ids[start:start + CHANNELS_PER_REQUEST] for start in range(0, len(channel_ids), CHANNELS_PER_REQUEST)]
     
-    # Extract email addresses
-    email_regex = r'[\w.-]+@[\w.-]+\.\w+'
-    emails = re.findall(email_regex, description)
+    get_quota_budget().start_run(run_limit=budget_units)
+    unchanged, changed, missing, deferred = 0, 0, 0, 0
     
-    if emails:
-        contact_info["email"] = emails[0]
-        
-        # Check for business email specifically
-        business_email_patterns = [
-            r'business\s*email\s*[:-]?\s*([\w.-]+@[\w.-]+\.\w+)',
-            r'for\s*business\s*[:-]?\s*([\w.-]+@[\w.-]+\.\w+)',
-            r'business\s*inquiries\s*[:-]?\s*([\w.-]+@[\w.-]+\.\w+)'
+    with ThreadPoolExecutor(max_workers=max_workers) as executor, InfluencerWriter() as writer:
+        futures = [
+            executor.submit(_fetch_channel_batch, batch, part="statistics", backoff=REFRESH_BACKOFF, use_cache=False)
+            for batch in batches
         ]
         
-        for pattern in business_email_patterns:
-            business_match = re.search(pattern, description, re.IGNORECASE)
-            if business_match:
-                contact_info["business_email"] = business_match.group(1)
-                break
+        for batch, future in zip(batches, futures):
+            try:
+                items = future.result()
+            except (QuotaBudgetExceeded, googleapiclient.errors.HttpError) as e:
+                # Still stale, so the next refresh picks the batch up again
+                print(f"Deferring the refresh of {len(batch)} channels: {e}")
+                deferred += len(batch)
+                continue
+            
+            returned_ids = set()
+            points = []
+            for item in items:
+                channel_id = item["id"]
+                returned_ids.add(channel_id)
+                record = stale_records[channel_id]
+                now = datetime.now()
+                
+                if item.get("etag") and item["etag"] == record.get("statisticsEtag"):
+                    unchanged += 1
+                    writer.update_fields(channel_id, {"lastUpdated": now})
+                    # Unchanged statistics still count as a point in the history
+                    points.append(history_point(channel_id, record, now))
+                    continue
+                
+                statistics = item.get("statistics", {})
+                updates = {
+                    field: int(statistics.get(field, 0))
+                    for field in REFRESH_FIELDS
+                    if int(statistics.get(field, 0)) != record.get(field)
+                }
+                if updates:
+                    changed += 1
+                else:
+                    unchanged += 1
+                
+                writer.update_fields(channel_id, {**updates, "statisticsEtag": item.get("etag"), "lastUpdated": now})
+                points.append(history_point(channel_id, {**record, **updates}, now))
+            
+            append_history(points)
+            missing += len(set(batch) - returned_ids)
+    
+    run = get_quota_budget().finish_run("refresh", plan=plan, writes=writer.totals)
+    print(f"\nRefresh complete! {changed} changed, {unchanged} unchanged, "
+          f"{missing} not returned by the API. Spent {run['units']} quota units.")
+    if deferred:
+        print(f"Quota budget exhausted or API unavailable: deferred {deferred} channels to the next run")
+    
+    update_growth_rates(channel_ids)
+
+def reextract_contacts(processes: int = 1, batch_size: int = CONTACT_REEXTRACT_BATCH_SIZE):
+    """
+    Re-extract contact information from every stored description, e.g. after
+    a pattern fix. Descriptions are streamed from MongoDB in batches, and only
+    influencers whose contact fields changed are written back.
+    
+    Args:
+        processes: Number of worker processes used for extraction
+        batch_size: Number of descriptions extracted at a time
+    """
+    influencers_collection = get_influencers_collection()
     
-    # Extract phone numbers (basic pattern)
-    phone_regex = r'(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-    phones = re.findall(phone_regex, description)
-    if phones:
-        contact_info["phone"] = phones[0]
+    projection = {"_id": 0, "channelId": 1, "description": 1, "contactEmail": 1,
+                  "businessEmail": 1, "contactPhone": 1, "socialLinks": 1}
+    cursor = influencers_collection.find({}, projection).batch_size(EXPORT_BATCH_SIZE)
     
-    # Extract social media handles
-    instagram_regex = r'instagram\.com/([A-Za-z0-9_.-]+)'
-    instagram_match = re.search(instagram_regex, description, re.IGNORECASE)
-    if instagram_match:
-        contact_info["instagram"] = instagram_match.group(1)
+    scanned, changed = 0, 0
     
-    twitter_regex = r'twitter\.com/([A-Za-z0-9_.-]+)'
-    twitter_match = re.search(twitter_regex, description, re.IGNORECASE)
-    if twitter_match:
-        contact_info["twitter"] = twitter_match.group(1)
+    def process(batch):
+        columns = extract_contacts_batch([doc.get("description", "") for doc in batch], processes=processes)
+        updates = 0
+        for index, doc in enumerate(batch):
+            fields = contact_fields({field: columns[field][index] for field in CONTACT_INFO_FIELDS})
+            current = {field: doc.get(field) for field in fields}
+            if fields != current:
+                writer.update_fields(doc["channelId"], fields)
+                updates += 1
+        return updates
     
-    facebook_regex = r'facebook\.com/([A-Za-z0-9_.-]+)'
-    facebook_match = re.search(facebook_regex, description, re.IGNORECASE)
-    if facebook_match:
-        contact_info["facebook"] = facebook_match.group(1)
+    with InfluencerWriter() as writer:
+        batch = []
+        for doc in cursor:
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                scanned += len(batch)
+                changed += process(batch)
+                batch = []
+        if batch:
+            scanned += len(batch)
+            changed += process(batch)
     
-    return contact_info
+    print(f"Re-extracted contacts for {scanned} influencers, {changed} changed")
 
-def is_tamil_content(channel_details: Dict[str, Any]) -> bool:
+def rescore_tamil_content(batch_size: int = TAMIL_RESCORE_BATCH_SIZE):
     """
-    Check if a channel contains Tamil content.
+    Recompute the Tamil score of every stored influencer, e.g. after tuning
+    the weights in language_scoring. Influencers that already have their
+    score components stored are rescored from them without reading the
+    text; the others are scored from their title and description in batches.
+    Only influencers whose score fields changed are written back.
     
     Args:
-        channel_details: Channel details from YouTube API
-        
-    Returns:
-        True if the channel likely contains Tamil content
+        batch_size: Number of influencers scored at a time
     """
-    snippet = channel_details.get("snippet", {})
-    title = snippet.get("title", "").lower()
-    description = snippet.get("description", "").lower()
+    influencers_collection = get_influencers_collection()
     
-    # Check for Tamil keywords
-    tamil_keywords = ["tamil", "தமிழ்", "தமிழ"]
+    scanned, changed = 0, 0
     
-    for keyword in tamil_keywords:
-        if keyword in title or keyword in description:
-            return True
+    def write_changes(docs, scores, writer):
+        updates = 0
+        for index, doc in enumerate(docs):
+            fields = tamil_score_fields({field: values[index] for field, values in scores.items()})
+            if any(doc.get(field) != value for field, value in fields.items()):
+                writer.update_fields(doc["channelId"], fields)
+                updates += 1
+        return updates
     
-    # Check for Tamil Unicode characters
-    tamil_unicode_pattern = r'[\u0B80-\u0BFF]'
-    if re.search(tamil_unicode_pattern, title) or re.search(tamil_unicode_pattern, description):
-        return True
+    def rescore_components(docs, writer):
+        script_share = [doc["tamilScriptShare"] for doc in docs]
+        keyword_hits = [doc["tamilKeywordHits"] for doc in docs]
+        scores = {"scriptShare": script_share, "keywordHits": keyword_hits,
+                  "score": combine_tamil_score(script_share, keyword_hits)}
+        return write_changes(docs, scores, writer)
     
-    # Check country
-    if channel_details.get("brandingSettings", {}).get("channel", {}).get("country") == "IN":
-        # If from India, check for more Tamil indicators
-        if "chennai" in description or "tamil nadu" in description:
-            return True
+    def rescore_texts(docs, writer):
+        # Stored documents don't keep the channel country, so regional keywords are not counted
+        texts = [f"{doc.get('channelTitle', '')}\n{doc.get('description', '')}" for doc in docs]
+        return write_changes(docs, score_tamil_texts(texts), writer)
     
-    return False
+    score_projection = {"_id": 0, "channelId": 1, "tamilScore": 1, "tamilScriptShare": 1, "tamilKeywordHits": 1}
+    stages = [
+        ({"tamilScriptShare": {"$exists": True}, "tamilKeywordHits": {"$exists": True}},
+         score_projection, rescore_components),
+        ({"$or": [{"tamilScriptShare": {"$exists": False}}, {"tamilKeywordHits": {"$exists": False}}]},
+         {**score_projection, "channelTitle": 1, "description": 1}, rescore_texts)
+    ]
+    
+    with InfluencerWriter() as writer:
+        for query, projection, rescore in stages:
+            batch = []
+            for doc in influencers_collection.find(query, projection).batch_size(EXPORT_BATCH_SIZE):
+                batch.append(doc)
+                if len(batch) >= batch_size:
+                    scanned += len(batch)
+                    changed += rescore(batch, writer)
+                    batch = []
+            if batch:
+                scanned += len(batch)
+                changed += rescore(batch, writer)
+    
+    print(f"Rescored {scanned} influencers, {changed} changed")
 
-def collect_influencer_data():
+def recompute_video_metrics(batch_size: int = VIDEO_METRICS_BATCH_SIZE, max_videos: int = RECENT_VIDEOS):
     """
-    Main function to collect Tamil YouTube influencer data.
-    Limited to top 10 influencers per category to manage API quota.
+    Recompute the video metrics of every influencer from the stored video
+    statistics, e.g. after adding or changing a metric in video_metrics.
+    Makes no API calls.
+    
+    Videos are streamed from MongoDB in channel order and each batch is
+    computed in one vectorized pass; a batch only ends at a channel
+    boundary, so every channel is computed from all of its videos.
+    
+    Args:
+        batch_size: Minimum number of videos computed at a time
+        max_videos: Number of each channel's newest videos the metrics use
     """
-    print("Starting Tamil YouTube influencer data collection (top 10 per category)...")
+    videos_collection = get_videos_collection()
+    now = datetime.now()
+    channels = 0
     
-    for category in CATEGORIES:
-        print(f"\nProcessing category: {category}")
-        
-        # Search for top 10 channels in this category
-        channels = search_channels(category, max_results=10)
-        
-        for channel in channels:
-            channel_id = channel["id"]["channelId"]
-            
-            # Check if we already have this channel
-            existing_channel = influencers_collection.find_one({"channelId": channel_id})
-            
-            if existing_channel:
-                print(f"Channel {channel['snippet']['title']} already exists, updating categories...")
-                
-                # Update existing channel with new category if needed
-                if category not in existing_channel.get("categories", []):
-                    influencers_collection.update_one(
-                        {"channelId": channel_id},
-                        {"$addToSet": {"categories": category},
-                         "$set": {"lastUpdated": datetime.now()}}
-                    )
-                continue
-            
-            # Get detailed channel information
-            channel_details = get_channel_details(channel_id)
-            
-            if not channel_details:
-                print(f"Could not get details for channel {channel['snippet']['title']}")
-                continue
-            
-            # Check if the channel contains Tamil content
-            if not is_tamil_content(channel_details):
-                print(f"Skipping non-Tamil channel: {channel_details['snippet']['title']}")
-                continue
-            
-            # Calculate engagement metrics
-            engagement_rate, avg_views = calculate_engagement_rate(channel_id)
-            
-            # Extract contact information from description
-            description = channel_details["snippet"]["description"]
-            contact_info = extract_contact_info(description)
-            
-            # Create new influencer record
-            influencer = {
-                "channelId": channel_id,
-                "channelTitle": channel_details["snippet"]["title"],
-                "description": description,
-                "thumbnailUrl": channel_details["snippet"]["thumbnails"]["high"]["url"],
-                "subscriberCount": int(channel_details["statistics"].get("subscriberCount", 0)),
-                "videoCount": int(channel_details["statistics"].get("videoCount", 0)),
-                "viewCount": int(channel_details["statistics"].get("viewCount", 0)),
-                "categories": [category],
-                "contactEmail": contact_info["email"],
-                "businessEmail": contact_info["business_email"],
-                "contactPhone": contact_info["phone"],
-                "socialLinks": {
-                    "instagram": contact_info["instagram"],
-                    "twitter": contact_info["twitter"],
-                    "facebook": contact_info["facebook"]
-                },
-                "language": "Tamil",
-                "engagementRate": engagement_rate,
-                "avgViewsPerVideo": avg_views,
-                "createdAt": datetime.now(),
-                "lastUpdated": datetime.now()
-            }
-            
-            # Save to database
-            try:
-                influencers_collection.insert_one(influencer)
-                print(f"Saved influencer: {channel_details['snippet']['title']}")
-            except pymongo.errors.DuplicateKeyError:
-                print(f"Duplicate channel ID: {channel_id}")
-            
-            # Respect YouTube API quota limits with a delay
-            time.sleep(1)
+    def write_metrics(videos, writer):
+        metrics = channel_video_metrics(videos, max_videos_per_channel=max_videos)
+        for channel_id, fields in metrics.items():
+            writer.update_fields(channel_id, {**fields, "metricsUpdatedAt": now})
+        return len(metrics)
     
-    print("\nData collection complete!")
+    projection = {"_id": 0, "channelId": 1, "publishedAt": 1, "views": 1, "likes": 1, "comments": 1}
+    cursor = videos_collection.find({}, projection).sort("channelId", pymongo.ASCENDING).batch_size(EXPORT_BATCH_SIZE)
+    
+    with InfluencerWriter() as writer:
+        batch = []
+        for video in cursor:
+            if len(batch) >= batch_size and video["channelId"] != batch[-1]["channelId"]:
+                channels += write_metrics(batch, writer)
+                batch = []
+            batch.append(video)
+        if batch:
+            channels += write_metrics(batch, writer)
+    
+    print(f"Recomputed the video metrics of {channels} influencers")
 
-def get_influencers_by_category(categories=None, min_subscribers=0, limit=100):
+def find_influencers(categories=None, min_subscribers=0, since=None, limit=0, sort_by="subscriberCount"):
     """
-    Get influencers filtered by categories and minimum subscribers.
+    Get a cursor over influencers filtered by categories, minimum subscribers
+    and last update time, sorted by subscriber count or a growth rate.
     
     Args:
         categories: List of categories to filter by
         min_subscribers: Minimum number of subscribers
-        limit: Maximum number of results to return
-        
+        since: Only include influencers updated at or after this datetime
+        limit: Maximum number of results to return (0 for no limit)
+        sort_by: Field to sort by in descending order (one of SORT_FIELDS)
+    
     Returns:
-        List of influencer documents
+        MongoDB cursor over influencer documents
     """
+    influencers_collection = get_influencers_collection()
+    
     query = {"subscriberCount": {"$gte": min_subscribers}}
     
     if categories:
         query["categories"] = {"$in": categories if isinstance(categories, list) else [categories]}
     
-    influencers = list(
+    if since:
+        query["lastUpdated"] = {"$gte": since}
+    
+    return (
         influencers_collection.find(
             query,
             {"_id": 0}  # Exclude MongoDB _id field
         )
-        .sort("subscriberCount", pymongo.DESCENDING)
+        .sort(sort_by, pymongo.DESCENDING)
         .limit(limit)
+        .batch_size(EXPORT_BATCH_SIZE)
     )
+
+def get_influencers_by_category(categories=None, min_subscribers=0, limit=100, sort_by="subscriberCount"):
+    """
+    Get influencers filtered by categories and minimum subscribers.
+    
+    Args:
+        categories: List of categories to filter by
+        min_subscribers: Minimum number of subscribers
+        limit: Maximum number of results to return
+        sort_by: Field to sort by in descending order (one of SORT_FIELDS)
+    
+    Returns:
+        List of influencer documents
+    """
+    return list(find_influencers(categories=categories, min_subscribers=min_subscribers, limit=limit, sort_by=sort_by))
+
+def _open_export_file(filename, compress=False):
+    """
+    Open an export file for writing text, gzip-compressed if requested.
+    """
+    if compress:
+        return gzip.open(filename, "wt", encoding="utf-8")
+    return open(filename, "w", encoding="utf-8")
+
+def _dump_compact(document):
+    return json.dumps(document, ensure_ascii=False, separators=(",", ":"), cls=DateTimeEncoder)
+
+def stream_export(documents, filename, output_format="json", compress=False):
+    """
+    Write documents to a file one at a time, so memory use stays constant.
+    
+    Args:
+        documents: Iterable of documents (e.g. a MongoDB cursor)
+        filename: Name of the output file
+        output_format: "json" for a JSON array or "ndjson" for one document per line
+        compress: Whether to gzip the output
+    
+    Returns:
+        Number of documents written
+    """
+    count = 0
+    
+    with _open_export_file(filename, compress) as f:
+        if output_format == "ndjson":
+            for document in documents:
+                f.write(_dump_compact(document))
+                f.write("\n")
+                count += 1
+        else:
+            f.write("[")
+            for document in documents:
+                f.write(",\n" if count else "\n")
+                f.write(_dump_compact(document))
+                count += 1
+            f.write("\n]\n")
     
-    return influencers
+    return count
+
+def export_filename(base, output_format="json", compress=False):
+    """
+    Build the name of an export file from its base name and format.
+    """
+    return f"{base}.{output_format}" + (".gz" if compress else "")
 
-def export_to_json(filename="tamil_influencers.json"):
+def export_to_json(filename="tamil_influencers.json", output_format="json", compress=False, since=None):
     """
     Export all influencers to a JSON file.
     
     Args:
         filename: Name of the output file
+        output_format: "json" or "ndjson"
+        compress: Whether to gzip the output
+        since: Only export influencers updated at or after this datetime (delta export)
+    """
+    count = stream_export(find_influencers(since=since), filename, output_format, compress)
+    
+    print(f"Exported {count} influencers to {filename}")
+
+def load_influencers_from_json(filename="tamil_influencers.json"):
     """
-    influencers = list(influencers_collection.find({}, {"_id": 0}))
+    Load influencers from a JSON export (the JSON backend used by the app).
+    NDJSON (.ndjson) and gzip-compressed (.gz) exports are supported too.
     
-    # Convert datetime objects to strings
-    for influencer in influencers:
-        if "createdAt" in influencer:
-            influencer["createdAt"] = influencer["createdAt"].isoformat()
-        if "lastUpdated" in influencer:
-            influencer["lastUpdated"] = influencer["lastUpdated"].isoformat()
+    Args:
+        filename: Name of the JSON file
     
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(influencers, f, ensure_ascii=False, indent=2, cls=DateTimeEncoder)
+    Returns:
+        List of influencer documents
+    """
+    opener = gzip.open if filename.endswith(".gz") else open
     
-    print(f"Exported {len(influencers)} influencers to {filename}")
+    with opener(filename, "rt", encoding="utf-8") as f:
+        if filename.endswith((".ndjson", ".ndjson.gz")):
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
 
-def get_top_influencers_by_category(limit=10):
+def _get_field(document, path):
     """
-    Get the top influencers for each category.
+    Get a possibly nested field (e.g. "socialLinks.instagram") from a document.
+    """
+    value = document
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+def _convert_dates(influencer):
+    """
+    Convert datetime fields of an influencer document to ISO strings.
+    """
+    for field in ("createdAt", "lastUpdated"):
+        if isinstance(influencer.get(field), datetime):
+            influencer[field] = influencer[field].isoformat()
+    return influencer
+
+def _top_influencers_pipeline(limit):
+    """
+    Aggregation pipeline returning the top influencers of every category
+    by subscriber count ($topN needs MongoDB 5.2+).
+    """
+    return [
+        {"$match": {"categories": {"$in": CATEGORIES}}},
+        {"$project": {"_id": 0}},
+        {"$addFields": {"_category": "$categories"}},
+        {"$unwind": "$_category"},
+        {"$match": {"_category": {"$in": CATEGORIES}}},
+        {"$group": {
+            "_id": "$_category",
+            "influencers": {"$topN": {
+                "n": limit,
+                "sortBy": {"subscriberCount": -1},
+                "output": "$$ROOT"
+            }}
+        }}
+    ]
+
+def iter_top_influencers_by_category(limit=10, influencers=None):
+    """
+    Yield the top influencers of each category, one category at a time.
     
     Args:
         limit: Maximum number of influencers per category
+        influencers: Influencer documents to use instead of MongoDB (optional)
+    
+    Yields:
+        Tuples of (category, list of influencers)
+    """
+    if influencers is not None:
+        # Keep a bounded min-heap per category in a single pass over the records
+        heaps = {category: [] for category in CATEGORIES}
+        for position, influencer in enumerate(influencers):
+            entry = (influencer.get("subscriberCount", 0), -position, influencer)
+            for category in set(influencer.get("categories", [])):
+                heap = heaps.get(category)
+                if heap is None:
+                    continue
+                if len(heap) < limit:
+                    heapq.heappush(heap, entry)
+                elif entry[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, entry)
         
-    Returns:
-        Dictionary with categories as keys and lists of influencers as values
+        for category, heap in heaps.items():
+            yield category, [
+                _convert_dates(dict(influencer))
+                for _, _, influencer in sorted(heap, key=lambda entry: entry[:2], reverse=True)
+            ]
+        return
+    
+    influencers_collection = get_influencers_collection()
+    
+    # One round trip for all categories
+    for group in influencers_collection.aggregate(_top_influencers_pipeline(limit)):
+        top = []
+        for influencer in group["influencers"]:
+            influencer.pop("_category", None)
+            top.append(_convert_dates(influencer))
+        yield group["_id"], top
+
+def get_top_influencers_by_category(limit=10, influencers=None):
     """
-    result = {}
+    Get the top influencers for each category.
     
-    for category in CATEGORIES:
-        influencers = list(
-            influencers_collection.find(
-                {"categories": category},
-                {"_id": 0}
-            )
-            .sort("subscriberCount", pymongo.DESCENDING)
-            .limit(limit)
-        )
-        
-        # Convert datetime objects to strings
-        for influencer in influencers:
-            if "createdAt" in influencer:
-                influencer["createdAt"] = influencer["createdAt"].isoformat()
-            if "lastUpdated" in influencer:
-                influencer["lastUpdated"] = influencer["lastUpdated"].isoformat()
-        
-        result[category] = influencers
+    Args:
+        limit: Maximum number of influencers per category
+        influencers: Influencer documents to use instead of MongoDB (optional)
     
+    Returns:
+        Dictionary with categories as keys and lists of influencers as values
+    """
+    result = {category: [] for category in CATEGORIES}
+    result.update(iter_top_influencers_by_category(limit=limit, influencers=influencers))
     return result
 
-def export_top_influencers(filename="top_tamil_influencers.json", limit=10):
+def export_top_influencers(filename="top_tamil_influencers.json", limit=10, influencers=None,
+                           output_format="json", compress=False):
     """
     Export top influencers from each category to a JSON file.
+    Categories are written as they come off the aggregation cursor.
     
     Args:
         filename: Name of the output file
         limit: Maximum number of influencers per category
+        influencers: Influencer documents to use instead of MongoDB (optional)
+        output_format: "json" for an object keyed by category, or "ndjson"
+            for one influencer per line with a "category" field
+        compress: Whether to gzip the output
     """
-    top_influencers = get_top_influencers_by_category(limit=limit)
+    total_count = 0
     
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(top_influencers, f, ensure_ascii=False, indent=2, cls=DateTimeEncoder)
+    with _open_export_file(filename, compress) as f:
+        if output_format != "ndjson":
+            f.write("{")
+        
+        for index, (category, top) in enumerate(iter_top_influencers_by_category(limit=limit, influencers=influencers)):
+            total_count += len(top)
+            
+            if output_format == "ndjson":
+                for influencer in top:
+                    f.write(_dump_compact({"category": category, **influencer}))
+                    f.write("\n")
+            else:
+                f.write(",\n" if index else "\n")
+                f.write(f"{json.dumps(category, ensure_ascii=False)}:{_dump_compact(top)}")
+        
+        if output_format != "ndjson":
+            f.write("\n}\n")
     
-    total_count = sum(len(influencers) for influencers in top_influencers.values())
     print(f"Exported top {limit} influencers from each category (total: {total_count}) to {filename}")
 
-def print_stats():
+def _stats_pipeline():
+    """
+    Aggregation pipeline computing all database statistics in one round trip.
+    """
+    has_value = lambda field: {"$cond": [{"$ne": [{"$ifNull": [f"${field}", None]}, None]}, 1, 0]}
+    
+    return [
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "byCategory": [
+                {"$unwind": "$categories"},
+                {"$match": {"categories": {"$in": CATEGORIES}}},
+                {"$group": {"_id": "$categories", "count": {"$sum": 1}}}
+            ],
+            "bySubscribers": [
+                {"$match": {"subscriberCount": {"$type": "number"}}},
+                {"$bucket": {
+                    "groupBy": "$subscriberCount",
+                    "boundaries": SUBSCRIBER_BUCKET_BOUNDARIES + [float("inf")],
+                    "default": "other",
+                    "output": {"count": {"$sum": 1}}
+                }}
+            ],
+            "contacts": [
+                {"$group": {
+                    "_id": None,
+                    **{name: {"$sum": has_value(field)} for name, field in CONTACT_FIELDS.items()}
+                }}
+            ]
+        }}
+    ]
+
+def get_stats(influencers=None):
+    """
+    Get statistics about the collected data.
+    
+    Args:
+        influencers: Influencer documents to use instead of MongoDB (optional)
+    
+    Returns:
+        Dictionary with the total count and the counts by category,
+        subscriber bucket and available contact information
+    """
+    stats = {
+        "total": 0,
+        "byCategory": {category: 0 for category in CATEGORIES},
+        "bySubscribers": {label: 0 for label in SUBSCRIBER_BUCKET_LABELS.values()},
+        "contacts": {name: 0 for name in CONTACT_FIELDS}
+    }
+    
+    if influencers is not None:
+        # Same statistics in a single pass over the records
+        for influencer in influencers:
+            stats["total"] += 1
+            
+            for category in set(influencer.get("categories", [])):
+                if category in stats["byCategory"]:
+                    stats["byCategory"][category] += 1
+            
+            subscribers = influencer.get("subscriberCount")
+            if isinstance(subscribers, (int, float)) and subscribers >= 0:
+                lower_bound = SUBSCRIBER_BUCKET_BOUNDARIES[bisect.bisect_right(SUBSCRIBER_BUCKET_BOUNDARIES, subscribers) - 1]
+                stats["bySubscribers"][SUBSCRIBER_BUCKET_LABELS[lower_bound]] += 1
+            
+            for name, field in CONTACT_FIELDS.items():
+                if _get_field(influencer, field) is not None:
+                    stats["contacts"][name] += 1
+        
+        return stats
+    
+    influencers_collection = get_influencers_collection()
+    
+    facets = next(influencers_collection.aggregate(_stats_pipeline()))
+    
+    if facets["total"]:
+        stats["total"] = facets["total"][0]["count"]
+    for group in facets["byCategory"]:
+        stats["byCategory"][group["_id"]] = group["count"]
+    for bucket in facets["bySubscribers"]:
+        if bucket["_id"] in SUBSCRIBER_BUCKET_LABELS:
+            stats["bySubscribers"][SUBSCRIBER_BUCKET_LABELS[bucket["_id"]]] = bucket["count"]
+    if facets["contacts"]:
+        for name in CONTACT_FIELDS:
+            stats["contacts"][name] = facets["contacts"][0][name]
+    
+    return stats
+
+def print_stats(influencers=None):
     """
     Print statistics about the collected data.
+    
+    Args:
+        influencers: Influencer documents to use instead of MongoDB (optional)
     """
-    total_influencers = influencers_collection.count_documents({})
+    stats = get_stats(influencers=influencers)
+    total_influencers = stats["total"]
     
     print(f"\n=== Tamil YouTube Influencer Database Stats ===")
     print(f"Total influencers: {total_influencers}")
     
     # Stats by category
     print("\nInfluencers by category:")
-    for category in CATEGORIES:
-        count = influencers_collection.count_documents({"categories": category})
+    for category, count in stats["byCategory"].items():
         print(f"  {category}: {count}")
     
-    # Stats by subscriber count
+    # Stats by subscriber count (largest first)
     print("\nInfluencers by subscriber count:")
-    print(f"  1M+: {influencers_collection.count_documents({'subscriberCount': {'$gte': 1000000}})}")
-    print(f"  500K-1M: {influencers_collection.count_documents({'subscriberCount': {'$gte': 500000, '$lt': 1000000}})}")
-    print(f"  100K-500K: {influencers_collection.count_documents({'subscriberCount': {'$gte': 100000, '$lt': 500000}})}")
-    print(f"  50K-100K: {influencers_collection.count_documents({'subscriberCount': {'$gte': 50000, '$lt': 100000}})}")
-    print(f"  10K-50K: {influencers_collection.count_documents({'subscriberCount': {'$gte': 10000, '$lt': 50000}})}")
-    print(f"  <10K: {influencers_collection.count_documents({'subscriberCount': {'$lt': 10000}})}")
+    for label in reversed(list(stats["bySubscribers"])):
+        print(f"  {label}: {stats['bySubscribers'][label]}")
     
     # Contact information stats
-    with_email = influencers_collection.count_documents({"contactEmail": {"$ne": None}})
-    with_business_email = influencers_collection.count_documents({"businessEmail": {"$ne": None}})
-    with_phone = influencers_collection.count_documents({"contactPhone": {"$ne": None}})
-    with_instagram = influencers_collection.count_documents({"socialLinks.instagram": {"$ne": None}})
-    
     print("\nContact information availability:")
     if total_influencers > 0:
-        print(f"  With email: {with_email} ({round(with_email/total_influencers*100, 1)}%)")
-        print(f"  With business email: {with_business_email} ({round(with_business_email/total_influencers*100, 1)}%)")
-        print(f"  With phone: {with_phone} ({round(with_phone/total_influencers*100, 1)}%)")
-        print(f"  With Instagram: {with_instagram} ({round(with_instagram/total_influencers*100, 1)}%)")
+        for name, label in (("email", "email"), ("businessEmail", "business email"),
+                            ("phone", "phone"), ("instagram", "Instagram")):
+            count = stats["contacts"][name]
+            print(f"  With {label}: {count} ({round(count/total_influencers*100, 1)}%)")
     else:
         print("  No influencers in database yet. Run the collection process first.")
 
@@ -533,42 +2356,106 @@ if __name__ == "__main__":
     
     parser = argparse.ArgumentParser(description="Tamil YouTube Influencer Data Collection Tool")
     parser.add_argument("--collect", action="store_true", help="Collect new influencer data")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue the interrupted collection run from its checkpoint")
+    parser.add_argument("--pages", type=int, default=SEARCH_PAGES_PER_CATEGORY,
+                        help=f"Maximum search pages of {CHANNELS_PER_SEARCH_PAGE} channels per category when collecting")
+    parser.add_argument("--refresh", action="store_true", help="Refresh statistics of stale influencers")
+    parser.add_argument("--update-growth", action="store_true",
+                        help="Recompute the growth rates of all influencers from their history")
+    parser.add_argument("--max-age-days", type=int, default=REFRESH_MAX_AGE_DAYS,
+                        help="Refresh influencers not updated for this many days")
     parser.add_argument("--export", action="store_true", help="Export data to JSON file")
     parser.add_argument("--export-top", action="store_true", help="Export top influencers from each category")
     parser.add_argument("--stats", action="store_true", help="Print database statistics")
     parser.add_argument("--category", help="Filter by specific category when exporting")
     parser.add_argument("--min-subscribers", type=int, default=0, help="Minimum subscriber count when exporting")
+    parser.add_argument("--sort-by", choices=SORT_FIELDS, default="subscriberCount",
+                        help="Field to rank influencers by when exporting")
     parser.add_argument("--limit", type=int, default=10, help="Limit number of results per category")
+    parser.add_argument("--format", choices=["json", "ndjson"], default="json", help="Output format when exporting")
+    parser.add_argument("--gzip", action="store_true", help="Gzip-compress exported files")
+    parser.add_argument("--since", type=datetime.fromisoformat,
+                        help="Only export influencers updated since this date (YYYY-MM-DD)")
+    parser.add_argument("--budget", type=int, help="Maximum YouTube API quota units to spend when collecting or refreshing")
+    parser.add_argument("--quota", action="store_true", help="Print today's YouTube API quota usage")
+    parser.add_argument("--create-indexes", action="store_true", help="Create the MongoDB indexes")
+    parser.add_argument("--reextract-contacts", action="store_true",
+                        help="Re-extract contact information from all stored descriptions")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes for --reextract-contacts")
+    parser.add_argument("--rescore-tamil", action="store_true",
+                        help="Recompute the Tamil score of all stored influencers")
+    parser.add_argument("--recompute-metrics", action="store_true",
+                        help="Recompute the engagement metrics of all influencers from their stored videos")
+    parser.add_argument("--from-json", metavar="FILE",
+                        help="Use a JSON export instead of MongoDB for --stats and --export-top")
     
     args = parser.parse_args()
     
-    if args.collect:
-        collect_influencer_data()
+    if args.create_indexes or args.collect or args.resume or args.refresh:
+        ensure_indexes()
+    
+    if args.quota:
+        print(json.dumps(get_quota_budget().summary(), indent=2))
+        response_cache = get_response_cache()
+        if response_cache is not None:
+            print(f"API response cache: {json.dumps(response_cache.stats())}")
+    
+    if args.collect or args.resume:
+        collect_influencer_data(budget=args.budget, resume=args.resume, max_pages=args.pages)
+    
+    if args.refresh:
+        refresh_influencer_stats(max_age_days=args.max_age_days, budget=args.budget)
+    
+    if args.update_growth:
+        update_growth_rates()
+    
+    if args.reextract_contacts:
+        reextract_contacts(processes=args.processes)
+    
+    if args.rescore_tamil:
+        rescore_tamil_content()
+    
+    if args.recompute_metrics:
+        recompute_video_metrics()
     
     if args.export:
         categories = [args.category] if args.category else None
-        influencers = get_influencers_by_category(
-            categories=categories,
-            min_subscribers=args.min_subscribers,
-            limit=10000  # High limit to get all matching influencers
-        )
         
         filename = f"tamil_influencers"
         if args.category:
             filename += f"_{args.category.replace(' ', '_').lower()}"
         if args.min_subscribers > 0:
             filename += f"_min{args.min_subscribers}"
-        filename += ".json"
+        if args.since:
+            filename += f"_since{args.since:%Y%m%d}"
+        if args.sort_by != "subscriberCount":
+            filename += f"_by_{args.sort_by}"
+        filename = export_filename(filename, args.format, args.gzip)
         
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(influencers, f, ensure_ascii=False, indent=2,cls=DateTimeEncoder)
+        # Stream straight from the cursor instead of loading everything first
+        count = stream_export(
+            find_influencers(categories=categories, min_subscribers=args.min_subscribers, since=args.since,
+                             sort_by=args.sort_by),
+            filename,
+            output_format=args.format,
+            compress=args.gzip
+        )
         
-        print(f"Exported {len(influencers)} influencers to {filename}")
+        print(f"Exported {count} influencers to {filename}")
+    
+    influencers = load_influencers_from_json(args.from_json) if args.from_json else None
     
     if args.export_top:
-        export_top_influencers(limit=args.limit)
+        export_top_influencers(
+            filename=export_filename("top_tamil_influencers", args.format, args.gzip),
+            limit=args.limit,
+            influencers=influencers,
+            output_format=args.format,
+            compress=args.gzip
+        )
     
     if args.stats:
-        print_stats()
+        print_stats(influencers=influencers)
     
-    # If no arguments provided, show help
\ No newline at end of file
+    # If no arguments provided, show help
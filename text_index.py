@@ -0,0 +1,265 @@
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from language_scoring import TAMIL_BLOCK_END, TAMIL_BLOCK_START
+
+# Words: runs of word characters, plus Tamil vowel signs and virama, which
+# are combining marks that \w does not match
+TOKEN_REGEX = re.compile(rf"[\w{chr(TAMIL_BLOCK_START)}-{chr(TAMIL_BLOCK_END)}]+")
+
+# Common words that carry no topic, dropped from documents and queries
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have i in is it its of on or our that the this to was we
+will with you your my me all any can do if into more most not so than their them these they
+us very what when which who why how also just about over out up new like get
+""".split())
+
+# BM25 parameters, and how many times the channel title counts relative
+# to the description
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 2
+
+# Persisted index of the app's JSON export
+TEXT_INDEX_FILE = os.getenv("TEXT_INDEX_FILE", "text_index.npz")
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase word tokens, dropping stopwords and single characters.
+    
+    Args:
+        text: Text to tokenize
+    
+    Returns:
+        List of tokens
+    """
+    return [
+        token for token in TOKEN_REGEX.findall(text.lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+class TextIndex:
+    """
+    BM25 full-text index over the channel titles and descriptions.
+    
+    The document-term matrix is stored term-major (CSC layout): for every
+    term, the rows of the documents containing it and their precomputed
+    BM25 weights. Scoring a query is then one sparse matrix-vector product:
+    the posting ranges of the query terms are gathered and summed per
+    document with np.bincount.
+    """
+    
+    def __init__(
+        self,
+        channel_ids: np.ndarray,
+        vocabulary: Dict[str, int],
+        term_starts: np.ndarray,
+        rows: np.ndarray,
+        weights: np.ndarray,
+        source: str = ""
+    ):
+        """
+        Initialize the index from its arrays (use build or load to create one).
+        
+        Args:
+            channel_ids: Channel ID of each row
+            vocabulary: Column number of each term
+            term_starts: Start of each term's postings (one entry per term, plus the end)
+            rows: Row of each posting
+            weights: BM25 weight of each posting
+            source: Description of the data the index was built from
+        """
+        self.channel_ids = channel_ids
+        self.vocabulary = vocabulary
+        self.term_starts = term_starts
+        self.rows = rows
+        self.weights = weights
+        self.source = source
+    
+    def __len__(self) -> int:
+        return len(self.channel_ids)
+    
+    @classmethod
+    def build(cls, influencers: Sequence[Mapping[str, Any]], source: str = "") -> "TextIndex":
+        """
+        Build the index from influencer documents.
+        
+        Args:
+            influencers: Influencer documents with channelId, channelTitle and description
+            source: Description of the data, stored to decide whether a saved index is current
+        
+        Returns:
+            The index
+        """
+        vocabulary: Dict[str, int] = {}
+        term_ids, row_ids, frequencies = [], [], []
+        lengths = np.zeros(len(influencers))
+        
+        for row, influencer in enumerate(influencers):
+            tokens = tokenize(influencer.get("channelTitle") or "") * TITLE_WEIGHT
+            tokens += tokenize(influencer.get("description") or "")
+            lengths[row] = len(tokens)
+            for token, count in Counter(tokens).items():
+                term_ids.append(vocabulary.setdefault(token, len(vocabulary)))
+                row_ids.append(row)
+                frequencies.append(count)
+        
+        term_ids = np.array(term_ids, dtype=np.int64)
+        row_ids = np.array(row_ids, dtype=np.int32)
+        frequencies = np.array(frequencies, dtype=np.float64)
+        
+        # Group the postings by term
+        order = np.argsort(term_ids, kind="stable")
+        term_ids, row_ids, frequencies = term_ids[order], row_ids[order], frequencies[order]
+        document_frequencies = np.bincount(term_ids, minlength=len(vocabulary))
+        term_starts = np.concatenate(([0], np.cumsum(document_frequencies))).astype(np.int64)
+        
+        num_documents = len(influencers)
+        idf = np.log(1 + (num_documents - document_frequencies + 0.5) / (document_frequencies + 0.5))
+        average_length = lengths.mean() if num_documents and lengths.mean() > 0 else 1.0
+        normalization = BM25_K1 * (1 - BM25_B + BM25_B * lengths[row_ids] / average_length)
+        weights = idf[term_ids] * frequencies * (BM25_K1 + 1) / (frequencies + normalization)
+        
+        channel_ids = np.array([influencer["channelId"] for influencer in influencers], dtype=str)
+        return cls(channel_ids, vocabulary, term_starts, row_ids, weights.astype(np.float32), source)
+    
+    def query_vector(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert query text to a sparse term vector.
+        
+        Args:
+            text: Query text
+        
+        Returns:
+            Tuple of (term columns, term weights); a term repeated in the
+            query weighs 1 + log of its count
+        """
+        counts = Counter(token for token in tokenize(text) if token in self.vocabulary)
+        terms = np.array([self.vocabulary[token] for token in counts], dtype=np.int64)
+        weights = 1 + np.log(np.array(list(counts.values()), dtype=np.float64))
+        return terms, weights
+    
+    def scores(self, text: str) -> np.ndarray:
+        """
+        Score every document against a query in one sparse matrix-vector product.
+        
+        Args:
+            text: Query text (e.g. a website analysis)
+        
+        Returns:
+            Array of BM25 scores aligned with channel_ids
+        """
+        terms, term_weights = self.query_vector(text)
+        if len(terms) == 0:
+            return np.zeros(len(self.channel_ids))
+        
+        starts = self.term_starts[terms]
+        lengths = self.term_starts[terms + 1] - starts
+        # Positions of all postings of the query terms, concatenated
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        postings = np.repeat(starts, lengths) + offsets
+        
+        return np.bincount(
+            self.rows[postings],
+            weights=self.weights[postings] * np.repeat(term_weights, lengths),
+            minlength=len(self.channel_ids)
+        )
+    
+    def search(self, text: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """
+        Find the channels most relevant to a query.
+        
+        Args:
+            text: Query text
+            limit: Maximum number of results
+        
+        Returns:
+            List of (channel_id, score), best first; channels without any
+            query term are left out
+        """
+        scores = self.scores(text)
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.lexsort((candidates, -scores[candidates]))]
+        return [(str(self.channel_ids[row]), float(scores[row])) for row in candidates]
+    
+    def save(self, path: str = TEXT_INDEX_FILE):
+        """
+        Save the index to a NumPy archive.
+        
+        Args:
+            path: File to write (written to a temporary file first, then renamed)
+        """
+        terms = np.empty(len(self.vocabulary), dtype=object)
+        for term, column in self.vocabulary.items():
+            terms[column] = term
+        
+        temporary_path = f"{path}.tmp.npz"
+        np.savez(
+            temporary_path,
+            channel_ids=self.channel_ids,
+            terms=terms.astype(str),
+            term_starts=self.term_starts,
+            rows=self.rows,
+            weights=self.weights,
+            source=np.array(self.source)
+        )
+        os.replace(temporary_path, path)
+    
+    @classmethod
+    def load(cls, path: str = TEXT_INDEX_FILE) -> "TextIndex":
+        """
+        Load an index saved with save.
+        
+        Args:
+            path: File to read
+        
+        Returns:
+            The index
+        """
+        with np.load(path, allow_pickle=False) as archive:
+            return cls(
+                archive["channel_ids"],
+                {str(term): column for column, term in enumerate(archive["terms"])},
+                archive["term_starts"],
+                archive["rows"],
+                archive["weights"],
+                str(archive["source"])
+            )
+    
+    @classmethod
+    def load_or_build(
+        cls,
+        influencers: Sequence[Mapping[str, Any]],
+        source: str,
+        path: Optional[str] = TEXT_INDEX_FILE
+    ) -> "TextIndex":
+        """
+        Load the saved index if it was built from the same data, otherwise
+        build it and save it.
+        
+        Args:
+            influencers: Influencer documents
+            source: Description of the data (e.g. file name, modification time and size)
+            path: Saved index (None to always build and not save)
+        
+        Returns:
+            The index
+        """
+        if path and os.path.exists(path):
+            try:
+                index = cls.load(path)
+                if index.source == source:
+                    return index
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Could not load the text index from {path}: {e}")
+        
+        index = cls.build(influencers, source)
+        if path:
+            index.save(path)
+        return index
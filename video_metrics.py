@@ -0,0 +1,172 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Half-life of a video's weight in the recency-weighted engagement rate
+RECENCY_HALF_LIFE_DAYS = 30
+
+# Per-channel metrics computed from stored video statistics, and the number
+# of decimals each one is rounded to when stored (None keeps integers)
+METRIC_FIELDS = {
+    "engagementRate": 2,
+    "avgViewsPerVideo": None,
+    "medianViews": None,
+    "weightedEngagementRate": 2,
+    "commentRate": 3,
+    "commentLikeRatio": 3,
+    "sampledVideos": None
+}
+
+def video_columns(videos: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Convert video statistics documents to columns.
+    
+    Args:
+        videos: Video documents with channelId, publishedAt, views, likes
+            and comments (see tamil_influencer_collector.video_document)
+    
+    Returns:
+        Dictionary with the channelId, publishedAt, views, likes and comments arrays
+    """
+    return {
+        "channelId": np.array([video["channelId"] for video in videos], dtype=object),
+        "publishedAt": np.array([video.get("publishedAt") for video in videos], dtype="datetime64[s]"),
+        "views": np.array([video.get("views", 0) for video in videos], dtype=np.float64),
+        "likes": np.array([video.get("likes", 0) for video in videos], dtype=np.float64),
+        "comments": np.array([video.get("comments", 0) for video in videos], dtype=np.float64)
+    }
+
+def compute_channel_metrics(
+    columns: Dict[str, np.ndarray],
+    now: Optional[datetime] = None,
+    max_videos_per_channel: Optional[int] = None,
+    half_life_days: float = RECENCY_HALF_LIFE_DAYS
+) -> Dict[str, np.ndarray]:
+    """
+    Compute the video metrics of every channel in one vectorized pass.
+    
+    The videos are sorted once by channel and newest first. Per-channel sums
+    come from np.add.reduceat over the channel groups, and medians from a
+    second sort by views inside each group, so no Python loop runs per
+    channel or per video.
+    
+    Metrics:
+        engagementRate: (likes + comments) / views * 100
+        avgViewsPerVideo: Mean views per video
+        medianViews: Median views per video
+        weightedEngagementRate: Engagement rate with each video weighted by
+            0.5 ** (age / half_life_days); videos without a date get full weight
+        commentRate: Comments / views * 100
+        commentLikeRatio: Comments / likes
+        sampledVideos: Number of videos the metrics were computed from
+    
+    Args:
+        columns: Video statistics columns (see video_columns)
+        now: Time the video ages are measured at (default: now, in UTC)
+        max_videos_per_channel: Only use each channel's newest videos (default: all)
+        half_life_days: Half-life of the recency weight
+    
+    Returns:
+        Dictionary with the channelId array (sorted) and an array per metric,
+        aligned with it. Rates of channels without views are 0.
+    """
+    channel_ids = columns["channelId"]
+    if len(channel_ids) == 0:
+        return {"channelId": np.zeros(0, dtype=object), **{field: np.zeros(0) for field in METRIC_FIELDS}}
+    
+    published_at = columns["publishedAt"]
+    
+    # Sort by channel, newest first inside each channel (videos without a date last)
+    newest_first = np.where(np.isnat(published_at), np.iinfo(np.int64).max, -published_at.astype(np.int64))
+    order = np.lexsort((newest_first, channel_ids.astype(str)))
+    channel_ids = channel_ids[order]
+    published_at = published_at[order]
+    views = columns["views"][order]
+    likes = columns["likes"][order]
+    comments = columns["comments"][order]
+    
+    unique_ids, starts = np.unique(channel_ids.astype(str), return_index=True)
+    group = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(channel_ids))))
+    
+    if max_videos_per_channel is not None:
+        keep = np.arange(len(channel_ids)) - starts[group] < max_videos_per_channel
+        group, published_at, views, likes, comments = (
+            group[keep], published_at[keep], views[keep], likes[keep], comments[keep]
+        )
+        starts = np.flatnonzero(np.diff(np.concatenate(([-1], group))))
+    
+    counts = np.diff(np.append(starts, len(group)))
+    
+    def group_sum(values: np.ndarray) -> np.ndarray:
+        return np.add.reduceat(values, starts)
+    
+    def rate(numerator: np.ndarray, denominator: np.ndarray, scale: float = 1.0) -> np.ndarray:
+        return np.divide(numerator * scale, denominator, out=np.zeros(len(starts)), where=denominator > 0)
+    
+    total_views = group_sum(views)
+    total_likes = group_sum(likes)
+    total_comments = group_sum(comments)
+    
+    # Median: sort views inside each group and average the middle pair
+    sorted_views = views[np.lexsort((views, group))]
+    lower = starts + (counts - 1) // 2
+    upper = starts + counts // 2
+    median_views = (sorted_views[lower] + sorted_views[upper]) / 2
+    
+    now = np.datetime64(now or datetime.now(timezone.utc).replace(tzinfo=None), "s")
+    age_days = (now - published_at).astype("timedelta64[s]").astype(np.float64) / 86400
+    weights = np.where(np.isnat(published_at), 1.0, 0.5 ** (np.maximum(age_days, 0) / half_life_days))
+    
+    return {
+        "channelId": unique_ids.astype(object),
+        "engagementRate": rate(total_likes + total_comments, total_views, 100),
+        "avgViewsPerVideo": total_views / counts,
+        "medianViews": median_views,
+        "weightedEngagementRate": rate(group_sum(weights * (likes + comments)), group_sum(weights * views), 100),
+        "commentRate": rate(total_comments, total_views, 100),
+        "commentLikeRatio": rate(total_comments, total_likes),
+        "sampledVideos": counts
+    }
+
+def metric_records(metrics: Dict[str, np.ndarray]) -> Dict[str, Dict[str, Any]]:
+    """
+    Convert metric arrays to rounded per-channel fields.
+    
+    Args:
+        metrics: Metric arrays (see compute_channel_metrics)
+    
+    Returns:
+        Dictionary mapping channel ID to its metric fields
+    """
+    rounded = {
+        field: (np.round(metrics[field], digits) if digits is not None else np.round(metrics[field]).astype(np.int64)).tolist()
+        for field, digits in METRIC_FIELDS.items()
+    }
+    
+    return {
+        channel_id: {field: values[index] for field, values in rounded.items()}
+        for index, channel_id in enumerate(metrics["channelId"])
+    }
+
+def channel_video_metrics(
+    videos: List[Dict[str, Any]],
+    channel_ids: Sequence[str] = (),
+    **options: Any
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Compute the rounded metric fields of channels from their video documents.
+    
+    Args:
+        videos: Video documents (see video_columns)
+        channel_ids: Channels to include even if they have no videos (their
+            metrics are all 0)
+        **options: Options passed to compute_channel_metrics
+    
+    Returns:
+        Dictionary mapping channel ID to its metric fields
+    """
+    empty = {field: 0 if digits is None else 0.0 for field, digits in METRIC_FIELDS.items()}
+    records = {channel_id: dict(empty) for channel_id in channel_ids}
+    records.update(metric_records(compute_channel_metrics(video_columns(videos), **options)))
+    return records
@@ -0,0 +1,580 @@
+import os
+import json
+import time
+import random
+import sqlite3
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+from zoneinfo import ZoneInfo
+
+import httplib2
+import googleapiclient.discovery
+import googleapiclient.errors
+from dotenv import load_dotenv
+
+from response_cache import ResponseCache
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Get API key from environment variable
+YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
+
+# Request pacing shared by every module that talks to the YouTube Data API
+REQUESTS_PER_SECOND = float(os.getenv("YOUTUBE_REQUESTS_PER_SECOND", "10"))
+REQUEST_BURST = int(os.getenv("YOUTUBE_REQUEST_BURST", "10"))
+HTTP_TIMEOUT = 30
+
+# Quota units charged by the YouTube Data API per call
+# (https://developers.google.com/youtube/v3/determine_quota_cost)
+QUOTA_COSTS = {
+    "youtube.search.list": 100,
+    "youtube.channels.list": 1,
+    "youtube.videos.list": 1,
+    "youtube.playlistItems.list": 1
+}
+DAILY_QUOTA = int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000"))
+QUOTA_USAGE_FILE = os.getenv("YOUTUBE_QUOTA_USAGE_FILE", "quota_usage.sqlite")
+MAX_RECORDED_RUNS = 100
+
+# Persistent response cache: TTL per endpoint (mostPopular charts change fastest)
+CACHE_FILE = os.getenv("YOUTUBE_CACHE_FILE", os.path.join(".cache", "youtube_responses.sqlite"))
+CACHE_MAX_BYTES = int(os.getenv("YOUTUBE_CACHE_MAX_MB", "200")) * 1024 * 1024
+CACHE_TTLS = {
+    "youtube.search.list": 24 * 3600,
+    "youtube.channels.list": 6 * 3600,
+    "youtube.playlistItems.list": 3600,
+    "youtube.videos.list": 3600,
+    "youtube.videos.list:mostPopular": 30 * 60
+}
+
+# Query parameters that don't change the response
+IGNORED_CACHE_PARAMS = {"key", "alt"}
+
+# The daily quota resets at midnight Pacific Time
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+# HTTP statuses worth retrying (403 only when it is a quota/rate limit error)
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+RATE_LIMIT_REASONS = ("quotaexceeded", "ratelimitexceeded", "userratelimitexceeded", "quota")
+
+class RateLimiter:
+    """
+    Thread-safe token bucket limiting how fast requests are sent.
+    """
+    
+    def __init__(self, rate: float, capacity: int):
+        """
+        Initialize the rate limiter.
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens in the bucket (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """
+        Block until a token is available and take it.
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                wait = (1 - self.tokens) / self.rate
+            
+            time.sleep(wait)
+
+class Backoff:
+    """
+    Exponential backoff shared by all workers of one pipeline stage.
+    
+    When any worker hits a rate limit or quota error, every worker using the
+    same Backoff waits until the stage resumes, while other stages keep going.
+    """
+    
+    def __init__(self, name: str, base_delay: float = 1.0, max_delay: float = 300.0, max_retries: int = 6):
+        """
+        Initialize the backoff.
+        
+        Args:
+            name: Name of the stage (used in log messages)
+            base_delay: Delay in seconds after the first failure
+            max_delay: Upper bound for a single delay in seconds
+            max_retries: Number of retries before a request is given up
+        """
+        self.name = name
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retries = max_retries
+        self.failures = 0
+        self.resume_at = 0.0
+        self.lock = threading.Lock()
+    
+    def wait(self):
+        """
+        Sleep until the stage is allowed to send requests again.
+        """
+        delay = self.resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+    
+    def failure(self) -> float:
+        """
+        Record a failed request and pause the stage.
+        
+        Returns:
+            Number of seconds the stage is paused for
+        """
+        with self.lock:
+            self.failures += 1
+            delay = min(self.max_delay, self.base_delay * 2 ** (self.failures - 1))
+            delay *= random.uniform(0.5, 1.0)  # Jitter so workers don't retry in lockstep
+            self.resume_at = max(self.resume_at, time.monotonic() + delay)
+            return delay
+    
+    def success(self):
+        """
+        Record a successful request.
+        """
+        with self.lock:
+            self.failures = 0
+
+class QuotaBudgetExceeded(Exception):
+    """
+    Raised when a request would overrun the daily quota or the run budget.
+    """
+
+class QuotaBudget:
+    """
+    Tracks the quota units spent on YouTube API calls.
+    
+    Usage is persisted per quota day in SQLite so that separate processes
+    (the collector, the trend analyzer, the Streamlit app) share one daily
+    budget. A charge checks the budget and records the cost in a single
+    write transaction, so concurrent processes never lose each other's
+    usage or overrun the budget together. Every run can also be given its
+    own unit budget.
+    """
+    
+    def __init__(self, daily_limit: int = DAILY_QUOTA, usage_file: str = QUOTA_USAGE_FILE):
+        """
+        Initialize the quota budget.
+        
+        Args:
+            daily_limit: Quota units available per day
+            usage_file: SQLite file the usage is persisted to
+        """
+        self.daily_limit = daily_limit
+        self.usage_file = usage_file
+        self.lock = threading.Lock()
+        self.run_limit = None
+        self.run_started_at = None
+        self.run_usage = Counter()
+        self._thread_local = threading.local()
+        
+        directory = os.path.dirname(usage_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        with self._transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS usage (
+                    day TEXT NOT NULL,
+                    method TEXT NOT NULL,
+                    units INTEGER NOT NULL,
+                    PRIMARY KEY (day, method)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    record TEXT NOT NULL
+                )
+            """)
+    
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections can't be shared between threads, so each thread
+        # opens its own; transactions are managed explicitly
+        conn = getattr(self._thread_local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.usage_file, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._thread_local.conn = conn
+        return conn
+    
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # BEGIN IMMEDIATE takes the write lock up front, so a read-check-write
+        # sequence is atomic across processes
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    
+    def _day_usage(self, conn: sqlite3.Connection, day: str) -> Dict[str, int]:
+        return dict(conn.execute("SELECT method, units FROM usage WHERE day = ?", (day,)).fetchall())
+    
+    @staticmethod
+    def quota_day() -> str:
+        """
+        Get the current quota day (YouTube resets quotas at midnight Pacific Time).
+        """
+        return datetime.now(QUOTA_TIMEZONE).strftime("%Y-%m-%d")
+    
+    def spent_today(self) -> int:
+        """
+        Get the number of units spent today by all processes.
+        """
+        return sum(self._day_usage(self._connection(), self.quota_day()).values())
+    
+    def _remaining(self, spent_today: int) -> int:
+        remaining = self.daily_limit - spent_today
+        if self.run_limit is not None:
+            remaining = min(remaining, self.run_limit - sum(self.run_usage.values()))
+        return max(remaining, 0)
+    
+    def remaining(self) -> int:
+        """
+        Get the number of units that can still be spent by the current run.
+        """
+        return self._remaining(self.spent_today())
+    
+    def last_run(self, kind: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the most recent recorded run of the given kind.
+        
+        Args:
+            kind: Kind of run (e.g. "collect")
+        
+        Returns:
+            Run record or None if there is none
+        """
+        row = self._connection().execute(
+            "SELECT record FROM runs WHERE kind = ? ORDER BY id DESC LIMIT 1", (kind,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def start_run(self, run_limit: Optional[int] = None):
+        """
+        Start recording the units spent by a new run.
+        
+        Args:
+            run_limit: Maximum number of units the run may spend (optional)
+        """
+        with self.lock:
+            self.run_limit = run_limit
+            self.run_started_at = datetime.now().isoformat()
+            self.run_usage = Counter()
+    
+    def charge(self, method_id: str):
+        """
+        Record the cost of an API call, refusing it if it would overrun the budget.
+        
+        Args:
+            method_id: API method of the call (e.g. "youtube.search.list")
+        
+        Raises:
+            QuotaBudgetExceeded: If the call does not fit in the remaining budget
+        """
+        cost = QUOTA_COSTS.get(method_id, 1)
+        day = self.quota_day()
+        
+        with self.lock, self._transaction() as conn:
+            remaining = self._remaining(sum(self._day_usage(conn, day).values()))
+            if cost > remaining:
+                raise QuotaBudgetExceeded(
+                    f"{method_id} costs {cost} units but only {remaining} are left in the budget"
+                )
+            
+            conn.execute(
+                "INSERT INTO usage (day, method, units) VALUES (?, ?, ?) "
+                "ON CONFLICT (day, method) DO UPDATE SET units = units + excluded.units",
+                (day, method_id, cost)
+            )
+            self.run_usage[method_id] += cost
+    
+    def finish_run(self, kind: str, **details) -> Dict[str, Any]:
+        """
+        Record the units spent by the current run.
+        
+        Args:
+            kind: Kind of run (e.g. "collect")
+            **details: Extra information stored with the run (e.g. the plan)
+        
+        Returns:
+            Run record
+        """
+        with self.lock:
+            run = {
+                "kind": kind,
+                "startedAt": self.run_started_at,
+                "finishedAt": datetime.now().isoformat(),
+                "units": sum(self.run_usage.values()),
+                "unitsByMethod": dict(self.run_usage),
+                **details
+            }
+            
+            with self._transaction() as conn:
+                conn.execute("INSERT INTO runs (kind, record) VALUES (?, ?)", (kind, json.dumps(run, default=str)))
+                conn.execute(
+                    "DELETE FROM runs WHERE id <= (SELECT MAX(id) FROM runs) - ?", (MAX_RECORDED_RUNS,)
+                )
+            
+            self.run_limit = None
+            return run
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Get today's usage and the most recent runs.
+        """
+        conn = self._connection()
+        day = self.quota_day()
+        day_usage = self._day_usage(conn, day)
+        recent_runs = [
+            json.loads(record)
+            for record, in conn.execute("SELECT record FROM runs ORDER BY id DESC LIMIT 5").fetchall()
+        ]
+        return {
+            "day": day,
+            "dailyLimit": self.daily_limit,
+            "spent": sum(day_usage.values()),
+            "spentByMethod": day_usage,
+            "recentRuns": recent_runs[::-1]
+        }
+
+# YouTube API client, created on first use by get_youtube()
+_youtube = None
+_youtube_lock = threading.Lock()
+
+def get_youtube() -> Any:
+    """
+    Get the shared YouTube API client, building it on first use.
+    
+    The client is built from the discovery document bundled with
+    google-api-python-client, so no network request is made.
+    
+    Returns:
+        YouTube Data API v3 client
+    
+    Raises:
+        ValueError: If YOUTUBE_API_KEY is not set
+    """
+    global _youtube
+    
+    if _youtube is None:
+        with _youtube_lock:
+            if _youtube is None:
+                if not YOUTUBE_API_KEY:
+                    raise ValueError("YouTube API key not found. Please add it to your .env file as YOUTUBE_API_KEY=your_key_here")
+                
+                _youtube = googleapiclient.discovery.build(
+                    "youtube", "v3",
+                    developerKey=YOUTUBE_API_KEY,
+                    static_discovery=True
+                )
+    
+    return _youtube
+
+def set_youtube(client: Any):
+    """
+    Replace the shared YouTube API client (e.g. with an offline stand-in).
+    
+    Args:
+        client: Object with the same interface as the API client
+    """
+    global _youtube
+    _youtube = client
+
+# Shared quota budget and response cache, opened on first use by
+# get_quota_budget() and get_response_cache(), so importing this module
+# creates no files
+_quota_budget = None
+_response_cache = None
+_response_cache_opened = False
+_storage_lock = threading.Lock()
+
+def get_quota_budget() -> QuotaBudget:
+    """
+    Get the shared quota budget, opening its usage file on first use.
+    
+    Returns:
+        Quota budget persisted to QUOTA_USAGE_FILE
+    """
+    global _quota_budget
+    
+    if _quota_budget is None:
+        with _storage_lock:
+            if _quota_budget is None:
+                _quota_budget = QuotaBudget()
+    
+    return _quota_budget
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Get the shared API response cache, opening its file on first use.
+    
+    Returns:
+        Response cache persisted to CACHE_FILE, or None if caching is disabled
+    """
+    global _response_cache, _response_cache_opened
+    
+    if not _response_cache_opened:
+        with _storage_lock:
+            if not _response_cache_opened:
+                _response_cache = ResponseCache(CACHE_FILE, max_bytes=CACHE_MAX_BYTES) if CACHE_FILE else None
+                _response_cache_opened = True
+    
+    return _response_cache
+
+# Shared rate limiter and per-thread HTTP connections
+rate_limiter = RateLimiter(rate=REQUESTS_PER_SECOND, capacity=REQUEST_BURST)
+_thread_local = threading.local()
+
+def _thread_http() -> httplib2.Http:
+    """
+    Get the HTTP connection of the current thread.
+    httplib2 connections are not thread-safe, so each worker thread gets its own.
+    """
+    if not hasattr(_thread_local, "http"):
+        _thread_local.http = httplib2.Http(timeout=HTTP_TIMEOUT)
+    return _thread_local.http
+
+def describe_http_error(error: googleapiclient.errors.HttpError) -> str:
+    """
+    Get a readable message from a YouTube API error.
+    
+    Args:
+        error: The HttpError raised by the API client
+    
+    Returns:
+        Error message
+    """
+    try:
+        error_details = json.loads(error.content)
+        return error_details.get("error", {}).get("message", "Unknown error")
+    except (TypeError, ValueError):
+        return str(error)
+
+def is_retryable(error: googleapiclient.errors.HttpError) -> bool:
+    """
+    Check if a YouTube API error is a transient or rate limit error.
+    
+    Args:
+        error: The HttpError raised by the API client
+    
+    Returns:
+        True if the request should be retried after a backoff
+    """
+    status = error.resp.status
+    if status in RETRYABLE_STATUSES:
+        return True
+    
+    if status == 403:
+        content = str(error.content).lower()
+        return any(reason in content for reason in RATE_LIMIT_REASONS)
+    
+    return False
+
+def _cache_endpoint_and_params(request: Any) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    Get the cache endpoint name and the normalized parameters of a request.
+    
+    Args:
+        request: Request object built by the API client
+    
+    Returns:
+        Tuple of (endpoint, sorted list of parameters)
+    """
+    params = []
+    for name, value in parse_qsl(urlsplit(request.uri).query):
+        if name in IGNORED_CACHE_PARAMS:
+            continue
+        if name == "id":
+            # Batched ID lists return the same items in any order
+            value = ",".join(sorted(value.split(",")))
+        params.append((name, value))
+    params.sort()
+    
+    endpoint = request.methodId
+    if ("chart", "mostPopular") in params:
+        endpoint += ":mostPopular"
+    
+    return endpoint, params
+
+def execute_request(request: Any, backoff: Optional[Backoff] = None, use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Execute a YouTube API request with rate limiting and exponential backoff.
+    The quota cost of the request is charged to the shared quota budget.
+    
+    Responses are stored in the persistent response cache, and cached
+    responses are returned without spending quota or a round trip.
+    
+    Args:
+        request: Request object built by the API client (e.g. youtube.search().list(...))
+        backoff: Backoff of the calling stage; a private one is used if not given
+        use_cache: Whether a cached response may be returned (the fresh
+            response is stored either way)
+    
+    Returns:
+        The API response
+    
+    Raises:
+        QuotaBudgetExceeded: If the request would overrun the quota budget
+        googleapiclient.errors.HttpError: If the request fails with a
+            non-retryable error or keeps failing after all retries
+    """
+    response_cache = get_response_cache()
+    cache_key, ttl = None, None
+    if response_cache is not None:
+        endpoint, params = _cache_endpoint_and_params(request)
+        ttl = CACHE_TTLS.get(endpoint, response_cache.default_ttl)
+        cache_key = ResponseCache.make_key(endpoint, params)
+        
+        if use_cache:
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+    
+    backoff = backoff or Backoff("request")
+    
+    for attempt in range(backoff.max_retries + 1):
+        backoff.wait()
+        rate_limiter.acquire()
+        # YouTube bills every attempt, retries included
+        get_quota_budget().charge(request.methodId)
+        
+        try:
+            response = request.execute(http=_thread_http())
+        except googleapiclient.errors.HttpError as e:
+            if not is_retryable(e) or attempt == backoff.max_retries:
+                raise
+            
+            delay = backoff.failure()
+            print(f"YouTube API error in {backoff.name} stage: {describe_http_error(e)}. "
+                  f"Pausing the stage for {delay:.1f}s...")
+            continue
+        
+        backoff.success()
+        if cache_key is not None:
+            response_cache.set(cache_key, response, ttl)
+        return response